@@ -53,8 +53,12 @@ export class WarRoomWebSocket {
 
       this.ws.onmessage = (event) => {
         try {
-          const message: WarRoomMessage = JSON.parse(event.data);
-          this.messageHandlers.forEach((handler) => handler(message));
+          const message = JSON.parse(event.data);
+          // History replay arrives as one frame; dispatch its items individually
+          const items: WarRoomMessage[] = message.type === 'history' ? message.items ?? [] : [message];
+          items.forEach((item) => {
+            this.messageHandlers.forEach((handler) => handler(item));
+          });
         } catch (error) {
           console.error('Failed to parse WebSocket message:', error);
         }
@@ -3,7 +3,7 @@
 Goal model for APEX - stores user financial goals and projections.
 """
 from datetime import datetime, date
-from sqlalchemy import Column, String, DateTime, Float, JSON, ForeignKey, Integer, Numeric, Text, Date
+from sqlalchemy import Column, String, DateTime, Float, JSON, ForeignKey, Integer, Numeric, Text, Date, Computed
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -73,7 +73,14 @@ class Goal(Base):
 
     # Progress Tracking
     last_reviewed_at = Column(DateTime)  # When goal was last reviewed by agents
-    progress_percentage = Column(Float, default=0.0)  # Current amount / target amount * 100
+    progress_percentage = Column(
+        Float,
+        Computed(
+            "CASE WHEN status = 'achieved' THEN 100.0 "
+            "ELSE COALESCE(current_amount * 100 / NULLIF(target_amount, 0), 0) END",
+            persisted=True
+        )
+    )  # Current amount / target amount * 100 (generated by Postgres)
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -3,9 +3,9 @@
 User model for APEX - stores user authentication and profile information.
 """
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, JSON, Integer, LargeBinary
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, LargeBinary, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import deferred, relationship
 import uuid
 
 from ..services.postgres_db import Base
@@ -13,6 +13,23 @@ from ..services.postgres_db import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Partial index so active-user counts can use an index-only scan
+        Index("ix_users_active", "id", postgresql_where=text("is_active")),
+        # Trigram index so search_by_username's LIKE '%pattern%' avoids a seq-scan
+        Index(
+            "ix_users_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+        # Covering index so get_auth_record is an index-only scan
+        Index(
+            "ix_users_auth",
+            "username",
+            postgresql_include=["id", "hashed_password", "is_active", "two_factor_enabled"],
+        ),
+    )
 
     # Primary Key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -20,7 +37,7 @@ class User(Base):
     # Authentication
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
-    hashed_password = Column(String(255), nullable=False)
+    hashed_password = deferred(Column(String(255), nullable=False), raiseload=True)
     is_active = Column(Boolean, default=True, nullable=False)
     is_verified = Column(Boolean, default=False, nullable=False)
 
@@ -34,20 +51,21 @@ class User(Base):
     investment_experience = Column(String(20), default="beginner")  # beginner, intermediate, advanced
 
     # Preferences
-    preferences = Column(JSON, default=dict)  # Store UI preferences, notification settings, etc.
+    preferences = Column(JSONB, default=dict)  # Store UI preferences, notification settings, etc.
 
-    # Security
+    # Security (secret columns below are deferred with raiseload: attribute access
+    # raises instead of lazy-loading; read them with explicit column SELECTs)
     two_factor_enabled = Column(Boolean, default=False)
-    two_factor_secret = Column(String(255))
+    two_factor_secret = deferred(Column(String(255)), raiseload=True)
     
     # Encryption Key (per-user Fernet key for encrypting sensitive credentials)
     # Generated on user creation, stored in DB, used to encrypt/decrypt API keys
-    encryption_key = Column(String(255), nullable=True)  # Base64-encoded Fernet key
+    encryption_key = deferred(Column(String(255), nullable=True), raiseload=True)  # Base64-encoded Fernet key
 
     # External Integrations (encrypted)
-    plaid_access_token = Column(LargeBinary, nullable=True)  # Encrypted Plaid access token
-    alpaca_api_key = Column(LargeBinary, nullable=True)  # Encrypted Alpaca API key
-    alpaca_secret_key = Column(LargeBinary, nullable=True)  # Encrypted Alpaca secret
+    plaid_access_token = deferred(Column(LargeBinary, nullable=True), raiseload=True)  # Encrypted Plaid access token
+    alpaca_api_key = deferred(Column(LargeBinary, nullable=True), raiseload=True)  # Encrypted Alpaca API key
+    alpaca_secret_key = deferred(Column(LargeBinary, nullable=True), raiseload=True)  # Encrypted Alpaca secret
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
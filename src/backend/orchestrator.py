@@ -1085,15 +1085,34 @@ class Orchestrator:
     .network, .is_running, .config
     """
 
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    # Agent slots reported by /api/agents, matching AgentOrchestrator's agents
+    AGENT_SLOTS = ("market_agent", "strategy_agent", "risk_agent", "executor_agent", "explainer_agent")
+
+    def __init__(self, redis_url: str = "redis://localhost:6379", agents: Optional[Dict[str, Any]] = None):
         self.network = AgentNetwork()
         self.is_running: bool = False
         self.is_paused: bool = False
         self._state: OrchestratorState = OrchestratorState.IDLE
         self.config: Dict[str, Any] = {}
+        self.agents: Dict[str, Any] = {}
+        # Class names resolved once at registration for status endpoints
+        self.agent_types: Dict[str, Optional[str]] = {}
         self._error_count: int = 0
         self._decision_count: int = 0
 
+        # Every slot is listed; ones without an agent show as not initialized
+        agents = agents or {}
+        for name in self.AGENT_SLOTS:
+            self.register_agent(name, agents.get(name))
+        for name, agent in agents.items():
+            if name not in self.agent_types:
+                self.register_agent(name, agent)
+
+    def register_agent(self, name: str, agent: Any = None):
+        """Register an agent slot; pass None for an agent not yet initialized."""
+        self.agents[name] = agent
+        self.agent_types[name] = type(agent).__name__ if agent else None
+
     async def initialize(self):
         await self.network.initialize()
         self._state = OrchestratorState.INITIALIZING
@@ -4,40 +4,57 @@ Provides REST API and WebSocket endpoints with security hardening
 """
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import logging
 from logging.handlers import RotatingFileHandler
 import io
 import os
+import re
+import heapq
+from operator import attrgetter, itemgetter
+import secrets
 from pathlib import Path
-from fastapi import FastAPI, WebSocket, HTTPException, UploadFile, File, Form, Query, Depends, status, Request, BackgroundTasks
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Form, Query, Depends, status, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel
 from datetime import datetime
 from decimal import Decimal
-import json
+import jwt
+import msgpack
+import orjson
 
 from orchestrator import Orchestrator, OrchestratorState
 from core.agent_network import AgentNetwork
 from services.voice import VoiceService
 from engines.crash_simulator import simulate_crash
 from engines.crash_scenario_engine import CrashScenarioEngine
-from services.news_search import aggregate_news, web_search
+from services.news_search import aggregate_news, web_search, create_http_client
 from services.mock_plaid import mock_plaid_data
 from services.news_aggregator import news_aggregator
+from services.response_cache import response_cache
+from services.redis_cache import redis_cache, GOALS_BY_USER_KEY
+from services.dao.user_dao import user_cache_scope
 from integrations.alpaca_broker import AlpacaBroker
 from war_room_interface import WarRoomInterface
 from services.rag.chroma_service import ChromaService
-from services.rag.query_engine import RAGQueryEngine
+from services.rag.query_engine import RAGQueryEngine, QueryIntent
+from services.rag.query_batcher import ChromaQueryBatcher
+from services.rag.indexer import ChromaBatchIndexer
 from services.finance_adapter import FinanceAdapter
 from services.logging_service import logger as structured_logger, RequestLogger
 from middleware.exception_handler import setup_exception_handlers
-from api.auth import get_current_user, login_user, refresh_access_token, logout_user
+from api.auth import get_current_user, login_user, refresh_access_token, logout_user, jwt_service
 from services.historical_data import HistoricalDataLoader
+from utils.timestamps import now_iso
+from utils.ids import generate_id
+from utils.serialization import wire_default
+from utils.logger import log_error
 
 
 # Configure file logging with rotation
@@ -135,7 +152,8 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse
 )
 
 # Setup global exception handlers
@@ -290,6 +308,63 @@ async def add_api_version_header(request: Request, call_next):
     return response
 
 
+# Per-request user lookup memoization
+@app.middleware("http")
+async def scope_user_cache(request: Request, call_next):
+    """
+    Memoize UserDAO lookups for the lifetime of one request so repeated
+    auth and permission checks hit a dict instead of the database.
+    """
+    with user_cache_scope():
+        return await call_next(request)
+
+
+# Response cache lifetimes (seconds) for read-mostly endpoints
+NEWS_CACHE_TTL = 30
+WAR_ROOM_STATS_CACHE_TTL = 5
+RAG_SEARCH_CACHE_TTL = 60
+GOALS_CACHE_TTL = 60
+
+# Voice command endpoints throttled per user before the request reaches its handler
+RATE_LIMITED_VOICE_PATHS = ("/api/voice/execute-command",)
+
+
+def _token_subject(request: Request) -> Optional[str]:
+    """Return the 'sub' claim of the request's bearer token, or None"""
+    auth_header = request.headers.get("authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return None
+    try:
+        payload = jwt.decode(auth_header[7:], jwt_service.secret_key, algorithms=[jwt_service.algorithm])
+    except jwt.InvalidTokenError:
+        return None
+    return payload.get("sub")
+
+
+# Voice command rate limit middleware
+@app.middleware("http")
+async def limit_voice_command_rate(request: Request, call_next):
+    """
+    Enforce the per-user voice command rate limit (5 commands per minute).
+    Over-limit requests are refused before body parsing, authentication
+    and dependency resolution. Requests without a valid token pass through
+    so the endpoint can reject them with 401.
+    """
+    if request.url.path in RATE_LIMITED_VOICE_PATHS:
+        user_id = _token_subject(request)
+        if user_id:
+            from services.voice_security import voice_command_tracker, VoiceCommandLogger
+
+            is_allowed, error = voice_command_tracker.check_rate_limit(user_id)
+            if not is_allowed:
+                VoiceCommandLogger.log_command(
+                    user_id, request.query_params.get("command_type", "unknown"), "error", error=error
+                )
+                return JSONResponse(status_code=429, content={"error": error})
+
+    return await call_next(request)
+
+
 # Global orchestrator instance
 orchestrator: Optional[Orchestrator] = None
 orchestrator_task: Optional[asyncio.Task] = None
@@ -309,33 +384,57 @@ class ConnectionManager:
 
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self.msgpack_connections: set = set()
         self.message_queue: asyncio.Queue = asyncio.Queue()
 
     async def connect(self, websocket: WebSocket):
-        """Accept new WebSocket connection"""
-        await websocket.accept()
+        """Accept new WebSocket connection, negotiating the msgpack subprotocol if offered"""
+        if "msgpack" in websocket.scope.get("subprotocols", []):
+            await websocket.accept(subprotocol="msgpack")
+            self.msgpack_connections.add(websocket)
+        else:
+            await websocket.accept()
         self.active_connections.append(websocket)
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
 
     def disconnect(self, websocket: WebSocket):
         """Remove WebSocket connection"""
         self.active_connections.remove(websocket)
+        self.msgpack_connections.discard(websocket)
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
     async def broadcast(self, message: Dict[str, Any]):
-        """Broadcast message to all connected clients"""
-        disconnected = []
-
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error sending to WebSocket: {e}")
-                disconnected.append(connection)
+        """
+        Broadcast message to all connected clients concurrently.
+        Clients that negotiated the msgpack subprotocol receive binary msgpack
+        frames; everyone else receives JSON text frames.
+        """
+        if not self.active_connections:
+            return
+
+        # Serialize once per wire format and send the same frame to every client
+        connections = list(self.active_connections)
+        text = orjson.dumps(message, default=wire_default, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        packed = (
+            msgpack.packb(message, default=wire_default, use_single_float=True)
+            if self.msgpack_connections else None
+        )
+        results = await asyncio.gather(
+            *(
+                connection.send_bytes(packed) if connection in self.msgpack_connections
+                else connection.send_text(text)
+                for connection in connections
+            ),
+            return_exceptions=True
+        )
 
         # Remove disconnected clients
-        for conn in disconnected:
-            self.active_connections.remove(conn)
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending to WebSocket: {result}")
+                if connection in self.active_connections:
+                    self.active_connections.remove(connection)
+                self.msgpack_connections.discard(connection)
 
     async def send_personal(self, websocket: WebSocket, message: Dict[str, Any]):
         """Send message to specific client"""
@@ -394,7 +493,19 @@ async def startup_event():
 
     logger.info("🚀 Starting APEX API Server...")
 
+    # Blocking library calls (Chroma, pandas) are offloaded with asyncio.to_thread
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2, thread_name_prefix="apex-worker")
+    )
+
+    # One pooled HTTP client for outbound news fetches
+    app.state.http = create_http_client()
+
     try:
+        # Load JSON collections concurrently so first requests hit warm snapshots
+        from services.json_storage_service import storage
+        await storage.warm()
+
         # Initialize database schema and run migrations
         from services.postgres_db import init_db
         logger.info("📊 Initializing database schema...")
@@ -426,7 +537,9 @@ async def startup_event():
             logger.warning(f"Personal finance service unavailable: {fe}")
             finance_service = None
 
-        await finance_service.ensure_indexes()
+        if finance_service:
+            # First Motor use: the shared client connects here, in this worker's loop
+            await finance_service.ensure_indexes()
         
         alpaca_broker = AlpacaBroker(paper=True)
         await alpaca_broker.initialize()
@@ -455,6 +568,20 @@ async def shutdown_event():
     if orchestrator:
         await orchestrator.stop()
 
+    if rag_indexer:
+        await rag_indexer.flush()
+
+    if getattr(app.state, "http", None):
+        await app.state.http.aclose()
+
+    RAG_QUERY_POOL.shutdown(wait=False)
+
+    await redis_cache.close()
+
+    if finance_service:
+        from services.db import close_client
+        close_client()
+
     # Close database connections
     from services.postgres_db import close_db
     await close_db()
@@ -551,6 +678,16 @@ async def get_status():
     )
 
 
+async def current_user_id(current_user = Depends(get_current_user)):
+    """
+    Resolve the authenticated user's ID.
+
+    FastAPI caches dependency results per request, so the JWT is decoded and
+    the user record loaded once no matter how many dependencies need it.
+    """
+    return current_user.id
+
+
 # ============================================================================
 # Authentication Endpoints
 # ============================================================================
@@ -1006,15 +1143,13 @@ async def submit_user_input(input_data: UserInput):
 
 
 @app.get("/api/portfolio")
-async def get_portfolio(current_user: dict = Depends(get_current_user)):
+async def get_portfolio(user_id = Depends(current_user_id)):
     """
     Get user's portfolio information.
 
     Requires authentication header:
         Authorization: Bearer <access_token>
     """
-    user_id = current_user.id
-    
     if not alpaca_broker:
         raise HTTPException(status_code=503, detail="Alpaca broker not initialized")
     
@@ -1164,15 +1299,13 @@ class TradeRequest(BaseModel):
 
 @app.post("/api/trade")
 @limiter.limit("30/minute")  # Max 30 trades per minute
-async def place_trade(request: Request, trade: TradeRequest, current_user = Depends(get_current_user)):
+async def place_trade(request: Request, trade: TradeRequest, user_id = Depends(current_user_id)):
     """
     Place a buy or sell order.
 
     Requires authentication header:
         Authorization: Bearer <access_token>
     """
-    user_id = current_user.id
-    
     if not alpaca_broker:
         raise HTTPException(status_code=503, detail="Alpaca broker not initialized")
     
@@ -1221,7 +1354,7 @@ async def place_trade(request: Request, trade: TradeRequest, current_user = Depe
 
 
 @app.get("/api/finance/accounts")
-async def get_finance_accounts(current_user = Depends(get_current_user)):
+async def get_finance_accounts(user_id = Depends(current_user_id)):
     """Get user's financial accounts (requires authentication)"""
     RequestLogger.log_request(structured_logger, "get_finance_accounts", user_id=str(user_id))
     
@@ -1233,7 +1366,7 @@ async def get_finance_accounts(current_user = Depends(get_current_user)):
 
 
 @app.get("/api/finance/subscriptions")
-async def get_subscriptions(current_user = Depends(get_current_user)):
+async def get_subscriptions(user_id = Depends(current_user_id)):
     """Get user's subscriptions (requires authentication)"""
     RequestLogger.log_request(structured_logger, "get_subscriptions", user_id=str(user_id))
     
@@ -1252,7 +1385,7 @@ async def get_subscriptions(current_user = Depends(get_current_user)):
 
 
 @app.get("/api/finance/net-worth")
-async def get_net_worth(current_user = Depends(get_current_user)):
+async def get_net_worth(user_id = Depends(current_user_id)):
     """Get user's net worth (requires authentication)"""
     RequestLogger.log_request(structured_logger, "get_net_worth", user_id=str(user_id))
     
@@ -1262,7 +1395,7 @@ async def get_net_worth(current_user = Depends(get_current_user)):
 
 
 @app.get("/api/finance/cash-flow")
-async def get_cash_flow(days: int = 30, current_user = Depends(get_current_user)):
+async def get_cash_flow(days: int = 30, user_id = Depends(current_user_id)):
     """Get user's cash flow (requires authentication)"""
     RequestLogger.log_request(structured_logger, "get_cash_flow", user_id=str(user_id))
     
@@ -1272,7 +1405,7 @@ async def get_cash_flow(days: int = 30, current_user = Depends(get_current_user)
 
 
 @app.get("/api/finance/health-score")
-async def get_health_score(current_user = Depends(get_current_user)):
+async def get_health_score(user_id = Depends(current_user_id)):
     """Get user's financial health score (requires authentication)"""
     RequestLogger.log_request(structured_logger, "get_health_score", user_id=str(user_id))
     
@@ -1297,7 +1430,7 @@ async def get_finance_status():
 async def create_plaid_link_token(
     request: Request,
     redirect_uri: Optional[str] = None,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """
     Create a Plaid Link token for account connection flow.
@@ -1329,7 +1462,7 @@ async def create_plaid_link_token(
 async def exchange_plaid_token(
     request: Request,
     public_token: str,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """
     Exchange Plaid public token for access token and save credentials.
@@ -1380,7 +1513,7 @@ async def exchange_plaid_token(
 @app.get("/api/plaid/accounts")
 async def get_plaid_accounts(
     request: Request,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """
     Retrieve linked bank accounts from Plaid.
@@ -1430,7 +1563,7 @@ async def get_plaid_accounts(
 async def get_plaid_transactions(
     request: Request,
     days: int = 90,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """
     Retrieve transactions from linked bank accounts via Plaid.
@@ -1501,6 +1634,30 @@ async def get_plaid_status(request: Request):
 # Goal Planner Endpoints (CRUD + Risk Assessment)
 # ============================================================================
 
+_goal_summary_fields = attrgetter(
+    "id", "name", "target_amount", "current_amount",
+    "target_date", "category", "priority", "status"
+)
+
+
+def _goal_summary(goal) -> Dict[str, Any]:
+    """Serialize a goal for list responses with a single attribute fetch"""
+    goal_id, name, target, current, target_date, category, priority, goal_status = _goal_summary_fields(goal)
+    target = float(target)
+    current = float(current)
+    return {
+        "id": str(goal_id),
+        "name": name,
+        "target_amount": target,
+        "current_amount": current,
+        "target_date": target_date.isoformat(),
+        "category": category,
+        "priority": priority,
+        "status": goal_status,
+        "progress_pct": current / target * 100 if target > 0 else 0.0
+    }
+
+
 @app.post("/api/goals")
 async def create_goal(
     request: Request,
@@ -1510,7 +1667,7 @@ async def create_goal(
     category: str,
     description: str = None,
     priority: str = "medium",
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """
     Create a new financial goal.
@@ -1576,7 +1733,7 @@ async def create_goal(
 async def get_user_goals(
     request: Request,
     status: str = None,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """
     Get all goals for the user.
@@ -1589,28 +1746,25 @@ async def get_user_goals(
     """
     from services.dao.goal_dao import GoalDAO
     from services.postgres_db import AsyncSessionLocal
-    try:
+
+    async def load_goals() -> List[Dict[str, Any]]:
         async with AsyncSessionLocal() as db:
             if status:
                 goals = await GoalDAO.get_by_user_and_status(db, user_id, status)
             else:
                 goals = await GoalDAO.get_by_user(db, user_id)
-        
+        return [_goal_summary(g) for g in goals]
+
+    try:
+        if status:
+            goals = await load_goals()
+        else:
+            goals = await redis_cache.get_or_set(
+                GOALS_BY_USER_KEY.format(user_id=user_id), GOALS_CACHE_TTL, load_goals
+            )
+
         return {
-            "goals": [
-                {
-                    "id": str(g.id),
-                    "name": g.name,
-                    "target_amount": float(g.target_amount),
-                    "current_amount": float(g.current_amount),
-                    "target_date": g.target_date.isoformat(),
-                    "category": g.category,
-                    "priority": g.priority,
-                    "status": g.status,
-                    "progress_pct": float((g.current_amount / g.target_amount * 100) if g.target_amount > 0 else 0)
-                }
-                for g in goals
-            ],
+            "goals": goals,
             "count": len(goals)
         }
         
@@ -1623,7 +1777,7 @@ async def get_user_goals(
 async def get_goal(
     goal_id: str,
     request: Request,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """Get a specific goal with full details"""
     from services.dao.goal_dao import GoalDAO
@@ -1631,9 +1785,9 @@ async def get_goal(
     from uuid import UUID
     try:
         async with AsyncSessionLocal() as db:
-            goal = await GoalDAO.get_by_id(db, UUID(goal_id))
+            goal = await GoalDAO.get_by_id_for_user(db, UUID(goal_id), user_id)
         
-        if not goal or str(goal.user_id) != str(user_id):
+        if not goal:
             raise HTTPException(status_code=404, detail="Goal not found")
         
         return {
@@ -1670,7 +1824,7 @@ async def update_goal(
     priority: str = None,
     status: str = None,
     description: str = None,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """Update a goal"""
     from services.dao.goal_dao import GoalDAO
@@ -1727,7 +1881,7 @@ async def update_goal(
 async def delete_goal(
     goal_id: str,
     request: Request,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """Delete a goal"""
     from services.dao.goal_dao import GoalDAO
@@ -1761,7 +1915,7 @@ async def update_goal_progress(
     goal_id: str,
     current_amount: float,
     request: Request,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """Update goal progress (current amount saved)"""
     from services.dao.goal_dao import GoalDAO
@@ -1798,8 +1952,11 @@ async def update_goal_progress(
 
 @app.get("/api/news/search")
 async def search_news(q: str):
-    results = news_aggregator.search_news(q)
-    return {"news": results, "count": len(results)}
+    async def build():
+        results = news_aggregator.search_news(q)
+        return {"news": results, "count": len(results)}
+
+    return await response_cache.get_or_set(("news_search", q), NEWS_CACHE_TTL, build)
 
 
 @app.get("/api/history")
@@ -1822,21 +1979,14 @@ async def get_agents():
     if not orchestrator:
         raise HTTPException(status_code=503, detail="Orchestrator not initialized")
 
-    agents_status = {}
-
-    for name, agent in orchestrator.agents.items():
-        if agent:
-            agents_status[name] = {
-                "name": name,
-                "status": "active",
-                "type": agent.__class__.__name__
-            }
-        else:
-            agents_status[name] = {
-                "name": name,
-                "status": "not_initialized",
-                "type": None
-            }
+    agents_status = {
+        name: {
+            "name": name,
+            "status": "active" if agent_type else "not_initialized",
+            "type": agent_type
+        }
+        for name, agent_type in orchestrator.agent_types.items()
+    }
 
     return {
         "count": len(agents_status),
@@ -1872,30 +2022,42 @@ async def warroom_websocket(websocket: WebSocket):
             "from": "system",
             "to": "user",
             "content": "Connected to APEX War Room",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         })
 
-        # Send recent message history
+        # Send recent message history as a single frame
         if orchestrator:
             recent_messages = await orchestrator.network.get_message_history(limit=20)
 
-            for msg in recent_messages:
+            if recent_messages:
+                now = now_iso()
                 await manager.send_personal(websocket, {
-                    "type": msg.get("type", "agent_message"),
-                    "from": msg.get("from", "system"),
-                    "to": msg.get("to", "all"),
-                    "content": msg.get("message", ""),
-                    "timestamp": msg.get("timestamp", datetime.now().isoformat()),
-                    "data": msg.get("data", {})
+                    "type": "history",
+                    "from": "system",
+                    "to": "user",
+                    "timestamp": now,
+                    "items": [
+                        {
+                            "type": msg.get("type", "agent_message"),
+                            "from": msg.get("from", "system"),
+                            "to": msg.get("to", "all"),
+                            "content": msg.get("message", ""),
+                            "timestamp": msg.get("timestamp", now),
+                            "data": msg.get("data", {})
+                        }
+                        for msg in recent_messages
+                    ]
                 })
 
         # Keep connection alive and handle incoming messages
         while True:
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = orjson.loads(data)
 
             # Handle user messages from War Room
             if message.get("type") == "user_message":
+                timestamp = now_iso()
+
                 # Publish to agent network
                 if orchestrator:
                     await orchestrator.network.publish(
@@ -1904,7 +2066,7 @@ async def warroom_websocket(websocket: WebSocket):
                             "type": "user_input",
                             "action": "comment",
                             "message": message.get("content", ""),
-                            "timestamp": datetime.now().isoformat()
+                            "timestamp": timestamp
                         }
                     )
 
@@ -1914,7 +2076,7 @@ async def warroom_websocket(websocket: WebSocket):
                     "from": "user",
                     "to": "all",
                     "content": message.get("content", ""),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": timestamp
                 })
 
     except WebSocketDisconnect:
@@ -1995,10 +2157,10 @@ async def execute_voice_command(
     command_type: str,
     symbol: str,
     quantity: float,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """
-    Execute a voice command (with automatic rate limiting and confirmation).
+    Execute a voice command (rate limited by limit_voice_command_rate, with confirmation).
     
     For high-value trades (>$10k), requires a subsequent /api/voice/confirm call.
     Returns pending_command_id if confirmation needed.
@@ -2007,24 +2169,16 @@ async def execute_voice_command(
         Authorization: Bearer <access_token>
     """
     from services.voice_security import (
-        voice_command_tracker, VoiceCommandValidator, CommandType, VoiceCommandLogger
+        voice_command_tracker, VoiceCommandValidator, CommandType, VoiceCommandLogger, parse_command_type
     )
-    import uuid
     try:
-        # Check rate limit (5 commands per minute)
-        is_allowed, error = voice_command_tracker.check_rate_limit(user_id)
-        if not is_allowed:
-            VoiceCommandLogger.log_command(user_id, command_type, "error", error=error)
-            raise HTTPException(status_code=429, detail=error)
-        
         # Validate command type
-        try:
-            cmd_type = CommandType[command_type.upper()]
-        except KeyError:
+        cmd_type = parse_command_type(command_type)
+        if cmd_type is None:
             raise HTTPException(status_code=400, detail=f"Unknown command type: {command_type}")
         
         # Validate order (for trade commands)
-        if cmd_type in [CommandType.BUY, CommandType.SELL]:
+        if cmd_type is CommandType.BUY or cmd_type is CommandType.SELL:
             is_valid, error = VoiceCommandValidator.validate_order(
                 symbol=symbol,
                 quantity=quantity,
@@ -2039,14 +2193,14 @@ async def execute_voice_command(
                 raise HTTPException(status_code=400, detail=error)
         
         # Create pending command
-        command_id = str(uuid.uuid4())[:8]
+        command_id = secrets.token_hex(6)
         pending_cmd = voice_command_tracker.create_pending_command(
             user_id=user_id,
             command_id=command_id,
             command_type=cmd_type,
             amount=quantity,
             symbol=symbol,
-            metadata={"request_time": datetime.now().isoformat()}
+            metadata={"request_time": now_iso()}
         )
         
         RequestLogger.log_request(
@@ -2076,7 +2230,7 @@ async def confirm_voice_command(
     request: Request,
     command_id: str,
     confirmation_phrase: str,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """
     Confirm a pending voice command with explicit confirmation phrase.
@@ -2133,7 +2287,7 @@ async def confirm_voice_command(
 async def reject_voice_command(
     request: Request,
     command_id: str,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """
     Reject a pending voice command.
@@ -2173,7 +2327,7 @@ async def reject_voice_command(
 @app.get("/api/voice/pending-commands")
 async def get_pending_commands(
     request: Request,
-    current_user = Depends(get_current_user)
+    user_id = Depends(current_user_id)
 ):
     """
     Get all pending voice commands for the user.
@@ -2238,7 +2392,11 @@ async def get_war_room_stats():
     """Get War Room statistics"""
     if not war_room:
         raise HTTPException(status_code=503, detail="War Room not initialized")
-    return {"stats": war_room.get_agent_stats()}
+
+    async def build():
+        return {"stats": war_room.get_agent_stats()}
+
+    return await response_cache.get_or_set(("war_room_stats",), WAR_ROOM_STATS_CACHE_TTL, build)
 
 
 @app.get("/api/war-room/summary")
@@ -2286,11 +2444,14 @@ async def get_active_threads():
 
 @app.post("/api/war-room/export")
 async def export_war_room():
-    """Export War Room conversation to JSON"""
+    """Export War Room conversation to a JSON lines file"""
     if not war_room:
         raise HTTPException(status_code=503, detail="War Room not initialized")
-    filename = war_room.export_conversation()
-    return {"filename": filename, "message": f"Exported {len(war_room.messages)} messages"}
+    # Snapshot on the event loop, which owns the message deques; only the file write runs in a thread
+    header, messages = war_room.snapshot_conversation()
+    filename = await asyncio.to_thread(war_room.write_export, header, messages)
+    count = header["total_messages"]
+    return {"filename": filename, "count": count, "message": f"Exported {count} messages"}
 
 
 # =======================================
@@ -2304,6 +2465,42 @@ class RAGQueryRequest(BaseModel):
     include_sources: bool = True
 
 
+# Chroma queries are blocking HNSW searches; run them off the event loop
+RAG_QUERY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-query")
+
+
+async def _embed_query(query_text: str) -> List[float]:
+    """Embed a query once in the RAG pool so every collection can reuse the vector"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(RAG_QUERY_POOL, chroma_service.embed_query, query_text)
+
+
+# Intent -> (collection, requires a symbol, query text builder); unrouted intents search everything
+INTENT_ROUTES = {
+    QueryIntent.PRICE_MOVEMENT: ("price_movements", True, lambda query, symbol: query),
+    QueryIntent.MARKET_EVENT: ("market_events", False, lambda query, symbol: query),
+    QueryIntent.COMPANY_INFO: ("company_info", True, lambda query, symbol: f"{symbol} company information"),
+    QueryIntent.NEWS_SEARCH: ("news_archive", False, lambda query, symbol: query),
+}
+
+
+@lru_cache(maxsize=4096)
+def _classify_rag_query(query: str):
+    """Classify a RAG query and extract its symbol, memoized for repeat dashboard queries"""
+    return rag_engine.classify_intent(query), rag_engine.extract_symbol(query)
+
+
+rag_query_batcher: Optional[ChromaQueryBatcher] = None
+
+
+async def _query_collection(collection_name: str, embedding: List[float], n_results: int) -> List[Tuple[float, str]]:
+    """Query a Chroma collection through the batcher; returns (distance, document) pairs"""
+    global rag_query_batcher
+    if rag_query_batcher is None:
+        rag_query_batcher = ChromaQueryBatcher(chroma_service.collections, RAG_QUERY_POOL)
+    return await rag_query_batcher.query(collection_name, embedding, n_results)
+
+
 @app.post("/api/rag/search")
 async def rag_search(req: RAGQueryRequest):
     """Semantic search across historical market data"""
@@ -2311,62 +2508,40 @@ async def rag_search(req: RAGQueryRequest):
         raise HTTPException(status_code=503, detail="RAG system not initialized")
     
     try:
-        # Classify intent
-        intent = rag_engine.classify_intent(req.query)
-        
-        # Extract entities
-        symbol = rag_engine.extract_symbol(req.query)
+        # Classify intent and extract entities; relative dates are resolved per request
+        intent, symbol = _classify_rag_query(req.query)
         date_str = rag_engine.extract_date(req.query)
         
-        # Search based on intent
-        results = []
-        
-        if intent.value == "price_movement" and symbol:
-            # Search price movement collection
-            query_results = chroma_service.collections["price_movements"].query(
-                query_texts=[req.query],
-                n_results=req.limit
-            )
-            results = query_results["documents"][0] if query_results["documents"] else []
-            
-        elif intent.value == "market_event":
-            # Search market events
-            query_results = chroma_service.collections["market_events"].query(
-                query_texts=[req.query],
-                n_results=req.limit
-            )
-            results = query_results["documents"][0] if query_results["documents"] else []
-            
-        elif intent.value == "company_info" and symbol:
-            # Search company info
-            query_results = chroma_service.collections["company_info"].query(
-                query_texts=[f"{symbol} company information"],
-                n_results=req.limit
-            )
-            results = query_results["documents"][0] if query_results["documents"] else []
-            
-        elif intent.value == "news_search":
-            # Search news archive
-            query_results = chroma_service.collections["news_archive"].query(
-                query_texts=[req.query],
-                n_results=req.limit
+        async def search():
+            route = INTENT_ROUTES.get(intent)
+            if route and (symbol or not route[1]):
+                collection_name, _, build_query = route
+                matches = await _query_collection(
+                    collection_name, await _embed_query(build_query(req.query, symbol)), req.limit
+                )
+                return [document for _, document in matches]
+
+            # General search across all collections, queried concurrently with one embedding
+            embedding = await _embed_query(req.query)
+            collection_names = chroma_service.collection_names
+            per_collection = max(1, req.limit // 4)
+            responses = await asyncio.gather(
+                *(_query_collection(name, embedding, per_collection) for name in collection_names),
+                return_exceptions=True
             )
-            results = query_results["documents"][0] if query_results["documents"] else []
-            
-        else:
-            # General search across all collections
-            all_results = []
-            for collection_name, collection in chroma_service.collections.items():
-                try:
-                    query_results = collection.query(
-                        query_texts=[req.query],
-                        n_results=max(1, req.limit // 4)
-                    )
-                    if query_results["documents"]:
-                        all_results.extend(query_results["documents"][0])
-                except Exception as e:
-                    logger.warning(f"Error querying {collection_name}: {e}")
-            results = all_results[:req.limit]
+            all_matches = []
+            for collection_name, matches in zip(collection_names, responses):
+                if isinstance(matches, Exception):
+                    logger.warning("Error querying %s: %s", collection_name, matches)
+                    continue
+                all_matches.extend(matches)
+
+            # Keep the nearest documents across collections rather than the first ones returned
+            return [document for _, document in heapq.nsmallest(req.limit, all_matches, key=itemgetter(0))]
+
+        # Search based on intent; repeat queries are served from the response cache
+        cache_key = ("rag_search", intent, symbol, req.query, req.limit)
+        results = await response_cache.get_or_set(cache_key, RAG_SEARCH_CACHE_TTL, search)
         
         return {
             "query": req.query,
@@ -2375,68 +2550,88 @@ async def rag_search(req: RAGQueryRequest):
             "date": date_str,
             "results": results,
             "count": len(results),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         
     except Exception as e:
-        logger.error(f"RAG search error: {e}", exc_info=True)
+        log_error(logger, "RAG search error", e)
         raise HTTPException(status_code=500, detail=f"RAG search failed: {str(e)}")
 
 
-@app.post("/api/rag/index/market-event")
+rag_indexer: Optional[ChromaBatchIndexer] = None
+
+
+def _get_rag_indexer() -> ChromaBatchIndexer:
+    """Return the shared batch indexer, creating it on first use"""
+    global rag_indexer
+    if rag_indexer is None:
+        rag_indexer = ChromaBatchIndexer(chroma_service, RAG_QUERY_POOL)
+    return rag_indexer
+
+
+@app.post("/api/rag/index/market-event", status_code=202)
 async def add_market_event(body: Dict[str, Any]):
-    """Add a market event to the RAG index"""
+    """Queue a market event for the RAG index"""
     if not chroma_service:
         raise HTTPException(status_code=503, detail="RAG system not initialized")
     
     try:
-        success = chroma_service.add_market_event(
-            event_id=body.get("event_id", f"event_{datetime.now().timestamp()}"),
+        document, meta = chroma_service.format_market_event(
             title=body.get("title"),
             description=body.get("description"),
-            date=body.get("date", datetime.now().isoformat()),
+            date=body.get("date", now_iso()),
             event_type=body.get("event_type", "general"),
             affected_symbols=body.get("affected_symbols", []),
             metadata=body.get("metadata")
         )
-        return {"success": success, "message": "Market event indexed"}
+        job_id = await _get_rag_indexer().enqueue(
+            "market_events",
+            body.get("event_id") or generate_id("event"),
+            document,
+            meta
+        )
+        return {"success": True, "job_id": job_id, "message": "Market event queued for indexing"}
     except Exception as e:
-        logger.error(f"Error adding market event: {e}")
+        logger.error("Error adding market event: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to add event: {str(e)}")
 
 
-@app.post("/api/rag/index/news")
+@app.post("/api/rag/index/news", status_code=202)
 async def add_news_article(body: Dict[str, Any]):
-    """Add a news article to the RAG index"""
+    """Queue a news article for the RAG index"""
     if not chroma_service:
         raise HTTPException(status_code=503, detail="RAG system not initialized")
     
     try:
-        success = chroma_service.add_news_article(
-            article_id=body.get("article_id", f"article_{datetime.now().timestamp()}"),
+        document, meta = chroma_service.format_news_article(
             title=body.get("title"),
             content=body.get("content"),
-            published_date=body.get("published_date", datetime.now().isoformat()),
+            published_date=body.get("published_date", now_iso()),
             source=body.get("source", "unknown"),
             symbols=body.get("symbols", []),
             sentiment=body.get("sentiment", "neutral"),
             metadata=body.get("metadata")
         )
-        return {"success": success, "message": "News article indexed"}
+        job_id = await _get_rag_indexer().enqueue(
+            "news_archive",
+            body.get("article_id") or generate_id("article"),
+            document,
+            meta
+        )
+        return {"success": True, "job_id": job_id, "message": "News article queued for indexing"}
     except Exception as e:
-        logger.error(f"Error adding news article: {e}")
+        logger.error("Error adding news article: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to add article: {str(e)}")
 
 
-@app.post("/api/rag/index/company")
+@app.post("/api/rag/index/company", status_code=202)
 async def add_company_info(body: Dict[str, Any]):
-    """Add company information to the RAG index"""
+    """Queue company information for the RAG index"""
     if not chroma_service:
         raise HTTPException(status_code=503, detail="RAG system not initialized")
     
     try:
-        success = chroma_service.add_company_info(
-            info_id=body.get("info_id", f"company_{datetime.now().timestamp()}"),
+        document, meta = chroma_service.format_company_info(
             symbol=body.get("symbol"),
             company_name=body.get("company_name"),
             description=body.get("description"),
@@ -2444,31 +2639,42 @@ async def add_company_info(body: Dict[str, Any]):
             industry=body.get("industry"),
             metadata=body.get("metadata")
         )
-        return {"success": success, "message": "Company info indexed"}
+        job_id = await _get_rag_indexer().enqueue(
+            "company_info",
+            body.get("info_id") or generate_id("company"),
+            document,
+            meta
+        )
+        return {"success": True, "job_id": job_id, "message": "Company info queued for indexing"}
     except Exception as e:
-        logger.error(f"Error adding company info: {e}")
+        logger.error("Error adding company info: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to add company: {str(e)}")
 
 
-@app.post("/api/rag/index/price-movement")
+@app.post("/api/rag/index/price-movement", status_code=202)
 async def add_price_movement(body: Dict[str, Any]):
-    """Add price movement explanation to the RAG index"""
+    """Queue a price movement explanation for the RAG index"""
     if not chroma_service:
         raise HTTPException(status_code=503, detail="RAG system not initialized")
     
     try:
-        success = chroma_service.add_price_movement(
-            movement_id=body.get("movement_id", f"movement_{datetime.now().timestamp()}"),
+        document, meta = chroma_service.format_price_movement(
             symbol=body.get("symbol"),
             date=body.get("date"),
-            price_change_percent=body.get("price_change_percent"),
-            explanation=body.get("explanation"),
-            contributing_factors=body.get("contributing_factors", []),
+            price_change_pct=body.get("price_change_percent"),
+            reason=body.get("explanation"),
+            context=", ".join(body.get("contributing_factors", [])) or None,
             metadata=body.get("metadata")
         )
-        return {"success": success, "message": "Price movement indexed"}
+        job_id = await _get_rag_indexer().enqueue(
+            "price_movements",
+            body.get("movement_id") or generate_id("movement"),
+            document,
+            meta
+        )
+        return {"success": True, "job_id": job_id, "message": "Price movement queued for indexing"}
     except Exception as e:
-        logger.error(f"Error adding price movement: {e}")
+        logger.error("Error adding price movement: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to add movement: {str(e)}")
 
 
@@ -2496,14 +2702,14 @@ async def load_crash_scenario(scenario_name: str):
         raise HTTPException(status_code=503, detail="Crash simulator not initialized")
     
     try:
-        scenario = crash_engine.load_scenario(scenario_name)
+        scenario = await asyncio.to_thread(crash_engine.load_scenario, scenario_name)
         
         await manager.broadcast({
             "type": "system",
             "from": "system",
             "to": "all",
             "content": f"📊 Loaded {scenario['data']['scenario']['name']} - {scenario['total_days']} trading days",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "data": {"scenario": scenario_name}
         })
         
@@ -2532,7 +2738,7 @@ async def start_crash_simulation(req: ScenarioSimRequest):
             "from": "market",
             "to": "all",
             "content": f"📊 Day {data['day']}: APEX ${data['apex_value']:,.0f} ({data['apex_return']:+.1f}%) vs Buy&Hold ${data['buy_hold_value']:,.0f} ({data['buy_hold_return']:+.1f}%)",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "data": data
         })
         
@@ -2542,7 +2748,7 @@ async def start_crash_simulation(req: ScenarioSimRequest):
                 "from": "strategy",
                 "to": "all",
                 "content": f"🧠 Rebalancing: High volatility detected. Shifting to defensive allocation.",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             })
     
     async def run_sim():
@@ -2552,7 +2758,7 @@ async def start_crash_simulation(req: ScenarioSimRequest):
                 "from": "system",
                 "to": "all",
                 "content": f"🚀 Starting crash simulation at {req.speed_multiplier}x speed",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             })
             
             result = await crash_engine.run_simulation(
@@ -2565,11 +2771,11 @@ async def start_crash_simulation(req: ScenarioSimRequest):
                 "from": "system",
                 "to": "all",
                 "content": f"✅ Simulation complete! APEX: {result['apex_return']:+.1f}% | Buy&Hold: {result['buy_hold_return']:+.1f}% | Outperformance: {result['outperformance']:+.1f}%",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "data": result
             })
         except Exception as e:
-            logger.error(f"Simulation error: {e}")
+            logger.error("Simulation error: %s", e)
     
     crash_simulation_task = asyncio.create_task(run_sim())
     
@@ -2588,7 +2794,7 @@ async def stop_crash_simulation():
         "from": "system",
         "to": "all",
         "content": "⏹️ Crash simulation stopped",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     })
     
     return {"message": "Simulation stopped", "status": "stopped"}
@@ -2602,7 +2808,7 @@ async def get_crash_comparison():
     if not crash_engine.current_scenario:
         raise HTTPException(status_code=400, detail="No scenario loaded")
     
-    return crash_engine.get_comparison_data()
+    return await asyncio.to_thread(crash_engine.get_comparison_data)
 
 
 # ===============================
@@ -2721,15 +2927,26 @@ async def finance_cashflow_summary(user_id: str = Query(...), month: Optional[st
 # News & Search Endpoints
 # ===============================
 
+# Ticker symbols in the comma-separated ?symbols= filter (e.g. "AAPL, brk.b")
+_TICKER_RE = re.compile(r"[A-Z][A-Z0-9.\-]{0,6}")
+
+
 @app.get("/api/news")
 async def news_endpoint(
     query: Optional[str] = Query(None, alias="q"),
     symbols_csv: Optional[str] = Query(None, alias="symbols"),
     max_results: int = Query(50)
 ):
-    symbols = [s.strip().upper() for s in symbols_csv.split(",")] if symbols_csv else None
-    articles = await aggregate_news(query=query, symbols=symbols, max_results=max_results)
-    return {"articles": articles, "count": len(articles)}
+    symbols = _TICKER_RE.findall(symbols_csv.upper()) if symbols_csv else None
+
+    async def build():
+        articles = await aggregate_news(
+            query=query, symbols=symbols, max_results=max_results, client=app.state.http
+        )
+        return {"articles": articles, "count": len(articles)}
+
+    cache_key = ("news", query, tuple(symbols) if symbols else None, max_results)
+    return await response_cache.get_or_set(cache_key, NEWS_CACHE_TTL, build)
 
 
 @app.get("/api/search")
@@ -2752,7 +2969,7 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Handle general exceptions"""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    log_error(logger, "Unhandled exception", exc)
     return JSONResponse(
         status_code=500,
         content={"error": "Internal server error"}
@@ -2762,10 +2979,16 @@ async def general_exception_handler(request, exc):
 if __name__ == "__main__":
     import uvicorn
 
+    # uvicorn[standard] installs uvloop and httptools; "auto" picks them up where supported
+    development = os.getenv("ENVIRONMENT") == "development"
     uvicorn.run(
         "server:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        reload=development,
+        workers=1 if development else int(os.getenv("WORKERS", "1")),
+        loop="auto",
+        http="auto",
+        log_level="info",
+        access_log=development
     )
@@ -5,11 +5,14 @@ Handles multi-agent deliberation, consensus voting, and conflict resolution.
 """
 
 from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime
 from enum import Enum
-import json
 import logging
 
+import numpy as np
+import orjson
+
+from utils.timestamps import now_iso
+
 
 class AgentStance(Enum):
     """Possible agent stances on a decision"""
@@ -19,26 +22,90 @@ class AgentStance(Enum):
     ABSTAIN = "abstain"
 
 
+# Row of each stance in the consensus tally; abstentions carry no weight
+STANCE_INDEX = {
+    AgentStance.AGREE: 0,
+    AgentStance.DISAGREE: 1,
+    AgentStance.NEUTRAL: 2,
+    AgentStance.ABSTAIN: 3,
+}
+STANCE_BY_INDEX = tuple(STANCE_INDEX)
+WEIGHTED_STANCES = 3
+
+# Share of confidence-weighted votes needed for consensus
+CONSENSUS_THRESHOLD = 0.66
+
+# Decision for a dominant agree (0) or disagree (1) score
+DECISIONS = ("approve", "reject")
+
+
 class DebateRound:
     """Represents one round of agent debate"""
 
-    def __init__(self, round_number: int, topic: str):
+    __slots__ = (
+        "round_number",
+        "topic",
+        "timestamp",
+        "consensus_reached",
+        "consensus_level",
+        "decision",
+        "agent_names",
+        "stance_idx",
+        "confidences",
+        "reasonings",
+        "position_times",
+        "_name_to_idx",
+        "_consensus_cache",
+    )
+
+    def __init__(self, round_number: int, topic: str, agent_names: List[str]):
         self.round_number = round_number
         self.topic = topic
-        self.timestamp = datetime.now().isoformat()
-        self.agent_positions: Dict[str, Dict[str, Any]] = {}
+        self.timestamp = now_iso()
         self.consensus_reached = False
         self.consensus_level = 0.0
         self.decision = None
 
+        # One slot per participating agent; stance -1 means no position yet
+        self.agent_names = tuple(agent_names)
+        self._name_to_idx = {name: i for i, name in enumerate(self.agent_names)}
+        self.stance_idx = np.full(len(self.agent_names), -1, dtype=np.int8)
+        self.confidences = np.zeros(len(self.agent_names), dtype=np.float64)
+        self.reasonings: List[Optional[str]] = [None] * len(self.agent_names)
+        self.position_times: List[Optional[str]] = [None] * len(self.agent_names)
+
+        # Consensus is recomputed only after a position changes
+        self._consensus_cache: Optional[Tuple[bool, float, str]] = None
+
+    @property
+    def agent_positions(self) -> Dict[str, Dict[str, Any]]:
+        """Positions keyed by agent name, in the transcript's dict shape"""
+        return self.export_positions()
+
+    def export_positions(self, include_reasoning: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Build the positions dict, optionally leaving out the reasoning text"""
+        positions = {}
+        for i, name in enumerate(self.agent_names):
+            if self.stance_idx[i] < 0:
+                continue
+            position = {
+                "stance": STANCE_BY_INDEX[self.stance_idx[i]].value,
+                "confidence": float(self.confidences[i]),
+                "timestamp": self.position_times[i]
+            }
+            if include_reasoning:
+                position["reasoning"] = self.reasonings[i]
+            positions[name] = position
+        return positions
+
     def add_position(self, agent_name: str, stance: AgentStance, reasoning: str, confidence: float):
         """Add an agent's position to the round"""
-        self.agent_positions[agent_name] = {
-            "stance": stance.value,
-            "reasoning": reasoning,
-            "confidence": confidence,
-            "timestamp": datetime.now().isoformat()
-        }
+        i = self._name_to_idx[agent_name]
+        self.stance_idx[i] = STANCE_INDEX[stance]
+        self.confidences[i] = confidence
+        self.reasonings[i] = reasoning
+        self.position_times[i] = now_iso()
+        self._consensus_cache = None
 
     def calculate_consensus(self) -> Tuple[bool, float, str]:
         """
@@ -47,46 +114,35 @@ class DebateRound:
         Returns:
             (consensus_reached, consensus_level, dominant_decision)
         """
-        if not self.agent_positions:
+        if self._consensus_cache is None:
+            self._consensus_cache = self._tally_consensus()
+        return self._consensus_cache
+
+    def _tally_consensus(self) -> Tuple[bool, float, str]:
+        """Compute consensus from the current positions"""
+        taken = self.stance_idx >= 0
+        if not taken.any():
             return False, 0.0, "no_positions"
 
-        # Weight stances by agent confidence
-        stance_weights = {
-            AgentStance.AGREE.value: [],
-            AgentStance.DISAGREE.value: [],
-            AgentStance.NEUTRAL.value: [],
-        }
-
-        total_weight = 0.0
-        for agent_name, position in self.agent_positions.items():
-            stance = position["stance"]
-            confidence = position["confidence"]
-            
-            if stance in stance_weights:
-                stance_weights[stance].append(confidence)
-                total_weight += confidence
+        # Weight stances by agent confidence in one masked pass (abstentions excluded)
+        weighted = taken & (self.stance_idx < WEIGHTED_STANCES)
+        weights = np.bincount(
+            self.stance_idx[weighted],
+            weights=self.confidences[weighted],
+            minlength=WEIGHTED_STANCES
+        )
+        total_weight = weights.sum()
 
         if total_weight == 0:
             return False, 0.0, "no_valid_positions"
 
-        # Normalize and find dominant stance
-        agree_score = sum(stance_weights[AgentStance.AGREE.value]) / total_weight if total_weight > 0 else 0
-        disagree_score = sum(stance_weights[AgentStance.DISAGREE.value]) / total_weight if total_weight > 0 else 0
+        # Normalize agree/disagree and pick the dominant one
+        scores = weights[:2] / total_weight
+        winner = int(scores.argmax())
+        max_score = float(scores[winner])
+        dominant = "tie" if scores[0] == scores[1] else DECISIONS[winner]
 
-        # Consensus threshold: 66% agreement
-        consensus_threshold = 0.66
-        max_score = max(agree_score, disagree_score)
-        consensus_reached = max_score >= consensus_threshold
-
-        # Dominant decision
-        if agree_score > disagree_score:
-            dominant = "approve"
-        elif disagree_score > agree_score:
-            dominant = "reject"
-        else:
-            dominant = "tie"
-
-        return consensus_reached, max_score, dominant
+        return max_score >= CONSENSUS_THRESHOLD, max_score, dominant
 
 
 class AgentDebateEngine:
@@ -116,7 +172,7 @@ class AgentDebateEngine:
             self.logger.warning(f"Max debate rounds ({self.max_rounds}) reached")
             return None
 
-        round_obj = DebateRound(self.current_round, topic)
+        round_obj = DebateRound(self.current_round, topic, self.agent_names)
         self.rounds.append(round_obj)
         self.logger.info(f"Debate round {self.current_round} started: {topic}")
         return round_obj
@@ -208,7 +264,7 @@ class AgentDebateEngine:
         resolution_details = {
             "strategy": tiebreaker_strategy,
             "conflicting_positions": conflict_positions,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
 
         # Apply resolution strategy
@@ -263,7 +319,7 @@ class AgentDebateEngine:
         self.logger.info(f"Conflict resolved: {decision} ({tiebreaker_strategy})")
         return decision, resolution_details
 
-    def get_debate_transcript(self) -> List[Dict[str, Any]]:
+    def get_debate_transcript(self, include_reasoning: bool = True) -> List[Dict[str, Any]]:
         """Get full transcript of all debate rounds"""
         transcript = []
         for round_obj in self.rounds:
@@ -273,7 +329,7 @@ class AgentDebateEngine:
                 "timestamp": round_obj.timestamp,
                 "consensus_reached": round_obj.consensus_reached,
                 "decision": round_obj.decision,
-                "positions": round_obj.agent_positions
+                "positions": round_obj.export_positions(include_reasoning)
             })
         return transcript
 
@@ -296,13 +352,27 @@ class AgentDebateEngine:
             "final_decision": decision,
             "consensus_reached": reached,
             "consensus_level": level,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "transcript": self.get_debate_transcript()
         }
 
         self.logger.info(f"Debate finalized: {decision} (consensus: {level:.1%})")
         return summary
 
-    def export_to_json(self) -> str:
-        """Export debate history to JSON"""
-        return json.dumps(self.get_debate_transcript(), indent=2)
+    def export_to_json(self, include_reasoning: bool = True, compress: bool = False) -> bytes:
+        """
+        Export debate history to JSON.
+
+        Args:
+            include_reasoning: Include each agent's reasoning text (omit for dashboards/metrics)
+            compress: Return compact zstd-compressed JSON instead of indented JSON
+
+        Returns:
+            UTF-8 JSON bytes, zstd-compressed if requested
+        """
+        transcript = self.get_debate_transcript(include_reasoning)
+        if not compress:
+            return orjson.dumps(transcript, option=orjson.OPT_INDENT_2)
+
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(orjson.dumps(transcript))
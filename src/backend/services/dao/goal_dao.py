@@ -3,18 +3,40 @@
 Data Access Object for Goal model.
 Handles all database operations for financial goals.
 """
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, func, values, column, bindparam, cast, JSON, Text
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, array
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...models.goal import Goal
+from ..postgres_db import utc_now
+from ..redis_cache import redis_cache, GOALS_BY_USER_KEY
+
+# Fixed-shape status updates, built once and executed with bound parameters
+_SET_STATUS_STMT = (
+    update(Goal)
+    .where(Goal.id == bindparam("goal_id"))
+    .values(status=bindparam("status"), updated_at=utc_now())
+    .returning(Goal.user_id)
+)
+_ABANDON_STMT = (
+    update(Goal)
+    .where(Goal.id == bindparam("goal_id"))
+    .values(status="abandoned", is_active=0, updated_at=utc_now())
+    .returning(Goal.user_id)
+)
 
 
 class GoalDAO:
     """Goal Data Access Object"""
 
+    @staticmethod
+    async def _invalidate_users(*user_ids):
+        """Drop cached goal lists for users whose goals were written"""
+        await redis_cache.invalidate(*{GOALS_BY_USER_KEY.format(user_id=user_id) for user_id in user_ids})
+
     @staticmethod
     async def create(
         db: AsyncSession,
@@ -39,6 +61,7 @@ class GoalDAO:
         db.add(goal)
         await db.commit()
         await db.refresh(goal)
+        await GoalDAO._invalidate_users(user_id)
         return goal
 
     @staticmethod
@@ -47,6 +70,14 @@ class GoalDAO:
         result = await db.execute(select(Goal).where(Goal.id == goal_id))
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_by_id_for_user(db: AsyncSession, goal_id: str, user_id: str) -> Optional[Goal]:
+        """Get goal by ID if it belongs to the user (None if missing or not owned)"""
+        result = await db.execute(
+            select(Goal).where(Goal.id == goal_id, Goal.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
     @staticmethod
     async def get_by_user(db: AsyncSession, user_id: str) -> List[Goal]:
         """Get all goals for a user"""
@@ -92,25 +123,41 @@ class GoalDAO:
     @staticmethod
     async def update(db: AsyncSession, goal_id: str, user_id: str, **kwargs) -> Optional[Goal]:
         """Update goal with user ownership validation (public API)"""
-        # Verify goal belongs to user
-        goal = await GoalDAO.get_by_id(db, goal_id)
-        if not goal or str(goal.user_id) != str(user_id):
-            return None
-        
-        return await GoalDAO._update_internal(db, goal_id, **kwargs)
+        return await GoalDAO._update_internal(db, goal_id, owner_id=user_id, **kwargs)
 
     @staticmethod
-    async def _update_internal(db: AsyncSession, goal_id: str, **kwargs) -> Optional[Goal]:
-        """Internal update without user validation"""
-        stmt = (
-            update(Goal)
-            .where(Goal.id == goal_id)
-            .values(**kwargs, updated_at=datetime.utcnow())
-            .returning(Goal)
-        )
+    async def _update_internal(
+        db: AsyncSession,
+        goal_id: str,
+        owner_id: Optional[str] = None,
+        conditions: tuple = (),
+        **kwargs
+    ) -> Optional[Goal]:
+        """
+        Internal update; when owner_id is given, only a goal owned by that user is updated.
+        Extra WHERE clauses in conditions must also hold for the row to change.
+        """
+        stmt = update(Goal).where(Goal.id == goal_id, *conditions)
+        if owner_id is not None:
+            stmt = stmt.where(Goal.user_id == owner_id)
+        stmt = stmt.values(**kwargs, updated_at=utc_now()).returning(Goal)
         result = await db.execute(stmt)
         await db.commit()
-        return result.scalar_one_or_none()
+        goal = result.scalar_one_or_none()
+        if goal:
+            await GoalDAO._invalidate_users(goal.user_id)
+        return goal
+
+    @staticmethod
+    async def _execute_noreturn(db: AsyncSession, stmt, params: Dict[str, Any]) -> bool:
+        """Run a prebuilt UPDATE that returns only the owner, for callers that only need to know it matched"""
+        result = await db.execute(stmt, params)
+        await db.commit()
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            return False
+        await GoalDAO._invalidate_users(user_id)
+        return True
 
     @staticmethod
     async def update_progress(
@@ -119,18 +166,12 @@ class GoalDAO:
         user_id: str,
         current_amount: Decimal
     ) -> Optional[Goal]:
-        """Update goal progress"""
-        goal = await GoalDAO.get_by_id(db, goal_id)
-        if not goal or str(goal.user_id) != str(user_id):
-            return None
-
-        progress_pct = (current_amount / goal.target_amount * 100) if goal.target_amount else 0
-
+        """Update goal progress (progress_percentage is a generated column)"""
         return await GoalDAO._update_internal(
             db,
             goal_id,
-            current_amount=current_amount,
-            progress_percentage=progress_pct
+            owner_id=user_id,
+            current_amount=current_amount
         )
 
     @staticmethod
@@ -150,9 +191,59 @@ class GoalDAO:
             moderate_projection=moderate,
             aggressive_projection=aggressive,
             success_probability=success_probability,
-            last_reviewed_at=datetime.utcnow()
+            last_reviewed_at=utc_now()
         )
 
+    @staticmethod
+    async def update_many_projections(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+        """
+        Update projections for many goals with one UPDATE ... FROM (VALUES ...).
+
+        Each row holds goal_id, conservative, moderate, aggressive and
+        success_probability, as passed to update_projections.
+        """
+        if not rows:
+            return 0
+
+        projections = values(
+            column("goal_id", Goal.id.type),
+            column("conservative", Goal.conservative_projection.type),
+            column("moderate", Goal.moderate_projection.type),
+            column("aggressive", Goal.aggressive_projection.type),
+            column("success_probability", Goal.success_probability.type),
+            name="projections"
+        ).data([
+            (
+                row["goal_id"],
+                row["conservative"],
+                row["moderate"],
+                row["aggressive"],
+                row["success_probability"]
+            )
+            for row in rows
+        ])
+
+        now = utc_now()
+        stmt = (
+            update(Goal)
+            .where(Goal.id == projections.c.goal_id)
+            .values(
+                conservative_projection=projections.c.conservative,
+                moderate_projection=projections.c.moderate,
+                aggressive_projection=projections.c.aggressive,
+                success_probability=projections.c.success_probability,
+                last_reviewed_at=now,
+                updated_at=now
+            )
+            .returning(Goal.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        await db.commit()
+        user_ids = result.scalars().all()
+        await GoalDAO._invalidate_users(*user_ids)
+        return len(user_ids)
+
     @staticmethod
     async def mark_agent_validated(
         db: AsyncSession,
@@ -178,15 +269,11 @@ class GoalDAO:
         goal_id: str,
         milestone: dict
     ) -> Optional[Goal]:
-        """Add a milestone to goal"""
-        goal = await GoalDAO.get_by_id(db, goal_id)
-        if not goal:
-            return None
-
-        milestones = goal.milestones or []
-        milestones.append(milestone)
+        """Add a milestone to goal, appending to the stored array in SQL"""
+        milestones = func.coalesce(cast(Goal.milestones, JSONB), cast([], JSONB))
+        appended = milestones.op("||", return_type=JSONB)(cast([milestone], JSONB))
 
-        return await GoalDAO._update_internal(db, goal_id, milestones=milestones)
+        return await GoalDAO._update_internal(db, goal_id, milestones=cast(appended, JSON))
 
     @staticmethod
     async def update_milestone(
@@ -195,16 +282,21 @@ class GoalDAO:
         milestone_index: int,
         achieved: bool
     ) -> Optional[Goal]:
-        """Mark a milestone as achieved"""
-        goal = await GoalDAO.get_by_id(db, goal_id)
-        if not goal or not goal.milestones or milestone_index >= len(goal.milestones):
-            return None
-
-        milestones = goal.milestones
-        milestones[milestone_index]["achieved"] = achieved
-        milestones[milestone_index]["achieved_at"] = datetime.utcnow().isoformat()
+        """Mark a milestone as achieved, patching that array element in SQL"""
+        milestones = cast(Goal.milestones, JSONB)
+        patch = cast({"achieved": achieved, "achieved_at": datetime.utcnow().isoformat()}, JSONB)
+        patched = func.jsonb_set(
+            milestones,
+            cast(array([str(milestone_index)]), ARRAY(Text)),
+            milestones.op("->", return_type=JSONB)(milestone_index).op("||", return_type=JSONB)(patch)
+        )
 
-        return await GoalDAO._update_internal(db, goal_id, milestones=milestones)
+        return await GoalDAO._update_internal(
+            db,
+            goal_id,
+            conditions=(func.jsonb_array_length(func.coalesce(milestones, cast([], JSONB))) > milestone_index,),
+            milestones=cast(patched, JSON)
+        )
 
     @staticmethod
     async def mark_achieved(db: AsyncSession, goal_id: str) -> Optional[Goal]:
@@ -213,33 +305,31 @@ class GoalDAO:
             db,
             goal_id,
             status="achieved",
-            achieved_at=datetime.utcnow(),
-            progress_percentage=100.0
+            achieved_at=utc_now()
         )
 
     @staticmethod
-    async def pause(db: AsyncSession, goal_id: str) -> Optional[Goal]:
+    async def pause(db: AsyncSession, goal_id: str) -> bool:
         """Pause goal"""
-        return await GoalDAO._update_internal(db, goal_id, status="paused")
+        return await GoalDAO._execute_noreturn(db, _SET_STATUS_STMT, {"goal_id": goal_id, "status": "paused"})
 
     @staticmethod
-    async def resume(db: AsyncSession, goal_id: str) -> Optional[Goal]:
+    async def resume(db: AsyncSession, goal_id: str) -> bool:
         """Resume paused goal"""
-        return await GoalDAO._update_internal(db, goal_id, status="active")
+        return await GoalDAO._execute_noreturn(db, _SET_STATUS_STMT, {"goal_id": goal_id, "status": "active"})
 
     @staticmethod
-    async def abandon(db: AsyncSession, goal_id: str) -> Optional[Goal]:
+    async def abandon(db: AsyncSession, goal_id: str) -> bool:
         """Mark goal as abandoned"""
-        return await GoalDAO._update_internal(db, goal_id, status="abandoned", is_active=0)
+        return await GoalDAO._execute_noreturn(db, _ABANDON_STMT, {"goal_id": goal_id})
 
     @staticmethod
     async def delete(db: AsyncSession, goal_id: str, user_id: str) -> bool:
         """Delete goal with user ownership validation"""
-        goal = await GoalDAO.get_by_id(db, goal_id)
-        if not goal or str(goal.user_id) != str(user_id):
-            return False
-        
-        stmt = delete(Goal).where(Goal.id == goal_id)
+        stmt = delete(Goal).where(Goal.id == goal_id, Goal.user_id == user_id)
         result = await db.execute(stmt)
         await db.commit()
-        return result.rowcount > 0
+        if result.rowcount == 0:
+            return False
+        await GoalDAO._invalidate_users(user_id)
+        return True
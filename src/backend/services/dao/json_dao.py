@@ -4,14 +4,68 @@ Replaces database-specific DAOs with JSON file operations.
 
 All DAO methods perform Pydantic validation to ensure data integrity.
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Type, TypeVar
 from datetime import datetime
-from pydantic import ValidationError
+from collections import OrderedDict
+import threading
+from pydantic import BaseModel, ValidationError
 from models.pydantic_models import (
     User, Portfolio, Trade, Goal, Account, Transaction,
     Subscription, VoiceCommand, RAGDocument
 )
-from services.json_storage_service import storage
+from services.json_storage_service import JSONStorage, storage
+
+M = TypeVar("M", bound=BaseModel)
+
+# Validated models kept for repeated by-ID reads
+MODEL_CACHE_SIZE = 10_000
+
+_model_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_model_cache_lock = threading.Lock()
+
+
+def _get_cached_model(model_cls: Type[M], store: JSONStorage, entity_id: str) -> Optional[M]:
+    """
+    Read an entity and build its model, reusing the last validated instance.
+
+    Entries are keyed by (model, id, storage version) and also remember the raw
+    data they were built from, so writes made by another worker process still
+    miss. Callers get a shallow copy, so reassigning fields leaves the cached
+    instance untouched.
+    """
+    version = store.version
+    data = store.read(entity_id)
+    if not data:
+        return None
+
+    key = (model_cls, store.entity_type, entity_id, version)
+    with _model_cache_lock:
+        entry = _model_cache.get(key)
+        if entry is not None and entry[0] == data:
+            _model_cache.move_to_end(key)
+            return entry[1].model_copy()
+
+    model = model_cls(**data)
+    with _model_cache_lock:
+        _model_cache[key] = (data, model)
+        if len(_model_cache) > MODEL_CACHE_SIZE:
+            _model_cache.popitem(last=False)
+    return model.model_copy()
+
+
+def _from_stored(model: M, stored: Dict[str, Any]) -> M:
+    """
+    Return a just-created model with the timestamps storage stamped on it.
+
+    The model was validated immediately before the write and storage only adds
+    its id and timestamps, so re-running validation on the stored dict is skipped.
+    """
+    fields = type(model).model_fields
+    return model.model_copy(update={
+        field: datetime.fromisoformat(stored[field])
+        for field in ("created_at", "updated_at")
+        if field in fields
+    })
 
 
 class DAOValidationError(Exception):
@@ -39,28 +93,27 @@ class UserDAO:
         try:
             # Validate user data with Pydantic
             user = User(**user_data)
-            stored = storage.users.create(user.id, user.dict())
-            return User(**stored)
+            stored = storage.users.create(user.id, user.model_dump(mode="json"))
+            return _from_stored(user, stored)
         except ValidationError as e:
             raise DAOValidationError(f"User validation failed: {e}")
 
     @staticmethod
     def get_user_by_id(user_id: str) -> Optional[User]:
         """Get user by ID"""
-        data = storage.users.read(user_id)
-        return User(**data) if data else None
+        return _get_cached_model(User, storage.users, user_id)
 
     @staticmethod
     def get_user_by_username(username: str) -> Optional[User]:
         """Get user by username"""
-        data = storage.users.find_one(lambda u: u.get("username") == username)
-        return User(**data) if data else None
+        user_ids = storage.users.lookup("username", username)
+        return _get_cached_model(User, storage.users, user_ids[0]) if user_ids else None
 
     @staticmethod
     def get_user_by_email(email: str) -> Optional[User]:
         """Get user by email"""
-        data = storage.users.find_one(lambda u: u.get("email") == email)
-        return User(**data) if data else None
+        user_ids = storage.users.lookup("email", email)
+        return _get_cached_model(User, storage.users, user_ids[0]) if user_ids else None
 
     @staticmethod
     def update_user(user_id: str, updates: Dict[str, Any]) -> Optional[User]:
@@ -78,7 +131,6 @@ class UserDAO:
             DAOValidationError: If update results in invalid user data
         """
         try:
-            updates["updated_at"] = datetime.utcnow().isoformat()
             data = storage.users.update(user_id, updates)
             if data:
                 # Validate the updated user data
@@ -95,13 +147,7 @@ class UserDAO:
     @staticmethod
     def list_users() -> List[User]:
         """List all users"""
-        user_ids = storage.users.list_all()
-        users = []
-        for user_id in user_ids:
-            data = storage.users.read(user_id)
-            if data:
-                users.append(User(**data))
-        return users
+        return [User(**data) for data in storage.users.read_all()]
 
 
 class PortfolioDAO:
@@ -111,25 +157,23 @@ class PortfolioDAO:
     def create_portfolio(portfolio_data: Dict[str, Any]) -> Portfolio:
         """Create a new portfolio"""
         portfolio = Portfolio(**portfolio_data)
-        stored = storage.portfolios.create(portfolio.id, portfolio.dict())
-        return Portfolio(**stored)
+        stored = storage.portfolios.create(portfolio.id, portfolio.model_dump(mode="json"))
+        return _from_stored(portfolio, stored)
 
     @staticmethod
     def get_portfolio_by_id(portfolio_id: str) -> Optional[Portfolio]:
         """Get portfolio by ID"""
-        data = storage.portfolios.read(portfolio_id)
-        return Portfolio(**data) if data else None
+        return _get_cached_model(Portfolio, storage.portfolios, portfolio_id)
 
     @staticmethod
     def get_portfolios_by_user(user_id: str) -> List[Portfolio]:
         """Get all portfolios for a user"""
-        portfolios_data = storage.portfolios.find(lambda p: p.get("user_id") == user_id)
+        portfolios_data = storage.portfolios.find_eq("user_id", user_id)
         return [Portfolio(**p) for p in portfolios_data]
 
     @staticmethod
     def update_portfolio(portfolio_id: str, updates: Dict[str, Any]) -> Optional[Portfolio]:
         """Update portfolio"""
-        updates["updated_at"] = datetime.utcnow().isoformat()
         data = storage.portfolios.update(portfolio_id, updates)
         return Portfolio(**data) if data else None
 
@@ -146,31 +190,34 @@ class TradeDAO:
     def create_trade(trade_data: Dict[str, Any]) -> Trade:
         """Create a new trade"""
         trade = Trade(**trade_data)
-        stored = storage.trades.create(trade.id, trade.dict())
-        return Trade(**stored)
+        stored = storage.trades.create(trade.id, trade.model_dump(mode="json"))
+        return _from_stored(trade, stored)
 
     @staticmethod
     def get_trade_by_id(trade_id: str) -> Optional[Trade]:
         """Get trade by ID"""
-        data = storage.trades.read(trade_id)
-        return Trade(**data) if data else None
+        return _get_cached_model(Trade, storage.trades, trade_id)
+
+    @staticmethod
+    def iter_trades_by_user(user_id: str) -> Iterator[Trade]:
+        """Yield a user's trades one validated model at a time (for exports of long histories)"""
+        for t in storage.trades.find_eq("user_id", user_id):
+            yield Trade(**t)
 
     @staticmethod
     def get_trades_by_user(user_id: str) -> List[Trade]:
         """Get all trades for a user"""
-        trades_data = storage.trades.find(lambda t: t.get("user_id") == user_id)
-        return [Trade(**t) for t in trades_data]
+        return list(TradeDAO.iter_trades_by_user(user_id))
 
     @staticmethod
     def get_trades_by_portfolio(portfolio_id: str) -> List[Trade]:
         """Get all trades for a portfolio"""
-        trades_data = storage.trades.find(lambda t: t.get("portfolio_id") == portfolio_id)
+        trades_data = storage.trades.find_eq("portfolio_id", portfolio_id)
         return [Trade(**t) for t in trades_data]
 
     @staticmethod
     def update_trade(trade_id: str, updates: Dict[str, Any]) -> Optional[Trade]:
         """Update trade"""
-        updates["updated_at"] = datetime.utcnow().isoformat()
         data = storage.trades.update(trade_id, updates)
         return Trade(**data) if data else None
 
@@ -187,25 +234,23 @@ class GoalDAO:
     def create_goal(goal_data: Dict[str, Any]) -> Goal:
         """Create a new goal"""
         goal = Goal(**goal_data)
-        stored = storage.goals.create(goal.id, goal.dict())
-        return Goal(**stored)
+        stored = storage.goals.create(goal.id, goal.model_dump(mode="json"))
+        return _from_stored(goal, stored)
 
     @staticmethod
     def get_goal_by_id(goal_id: str) -> Optional[Goal]:
         """Get goal by ID"""
-        data = storage.goals.read(goal_id)
-        return Goal(**data) if data else None
+        return _get_cached_model(Goal, storage.goals, goal_id)
 
     @staticmethod
     def get_goals_by_user(user_id: str) -> List[Goal]:
         """Get all goals for a user"""
-        goals_data = storage.goals.find(lambda g: g.get("user_id") == user_id)
+        goals_data = storage.goals.find_eq("user_id", user_id)
         return [Goal(**g) for g in goals_data]
 
     @staticmethod
     def update_goal(goal_id: str, updates: Dict[str, Any]) -> Optional[Goal]:
         """Update goal"""
-        updates["updated_at"] = datetime.utcnow().isoformat()
         data = storage.goals.update(goal_id, updates)
         return Goal(**data) if data else None
 
@@ -222,25 +267,23 @@ class AccountDAO:
     def create_account(account_data: Dict[str, Any]) -> Account:
         """Create a new account"""
         account = Account(**account_data)
-        stored = storage.accounts.create(account.id, account.dict())
-        return Account(**stored)
+        stored = storage.accounts.create(account.id, account.model_dump(mode="json"))
+        return _from_stored(account, stored)
 
     @staticmethod
     def get_account_by_id(account_id: str) -> Optional[Account]:
         """Get account by ID"""
-        data = storage.accounts.read(account_id)
-        return Account(**data) if data else None
+        return _get_cached_model(Account, storage.accounts, account_id)
 
     @staticmethod
     def get_accounts_by_user(user_id: str) -> List[Account]:
         """Get all accounts for a user"""
-        accounts_data = storage.accounts.find(lambda a: a.get("user_id") == user_id)
+        accounts_data = storage.accounts.find_eq("user_id", user_id)
         return [Account(**a) for a in accounts_data]
 
     @staticmethod
     def update_account(account_id: str, updates: Dict[str, Any]) -> Optional[Account]:
         """Update account"""
-        updates["updated_at"] = datetime.utcnow().isoformat()
         data = storage.accounts.update(account_id, updates)
         return Account(**data) if data else None
 
@@ -257,25 +300,29 @@ class TransactionDAO:
     def create_transaction(transaction_data: Dict[str, Any]) -> Transaction:
         """Create a new transaction"""
         transaction = Transaction(**transaction_data)
-        stored = storage.transactions.create(transaction.id, transaction.dict())
-        return Transaction(**stored)
+        stored = storage.transactions.create(transaction.id, transaction.model_dump(mode="json"))
+        return _from_stored(transaction, stored)
 
     @staticmethod
     def get_transaction_by_id(transaction_id: str) -> Optional[Transaction]:
         """Get transaction by ID"""
-        data = storage.transactions.read(transaction_id)
-        return Transaction(**data) if data else None
+        return _get_cached_model(Transaction, storage.transactions, transaction_id)
+
+    @staticmethod
+    def iter_transactions_by_user(user_id: str) -> Iterator[Transaction]:
+        """Yield a user's transactions one validated model at a time (for exports of long histories)"""
+        for t in storage.transactions.find_eq("user_id", user_id):
+            yield Transaction(**t)
 
     @staticmethod
     def get_transactions_by_user(user_id: str) -> List[Transaction]:
         """Get all transactions for a user"""
-        transactions_data = storage.transactions.find(lambda t: t.get("user_id") == user_id)
-        return [Transaction(**t) for t in transactions_data]
+        return list(TransactionDAO.iter_transactions_by_user(user_id))
 
     @staticmethod
     def get_transactions_by_account(account_id: str) -> List[Transaction]:
         """Get all transactions for an account"""
-        transactions_data = storage.transactions.find(lambda t: t.get("account_id") == account_id)
+        transactions_data = storage.transactions.find_eq("account_id", account_id)
         return [Transaction(**t) for t in transactions_data]
 
 
@@ -286,19 +333,20 @@ class SubscriptionDAO:
     def create_subscription(subscription_data: Dict[str, Any]) -> Subscription:
         """Create a new subscription"""
         subscription = Subscription(**subscription_data)
-        stored = storage.subscriptions.create(subscription.id, subscription.dict())
-        return Subscription(**stored)
+        stored = storage.subscriptions.create(subscription.id, subscription.model_dump(mode="json"))
+        return _from_stored(subscription, stored)
 
     @staticmethod
     def get_subscription_by_user(user_id: str) -> Optional[Subscription]:
         """Get subscription for a user"""
-        data = storage.subscriptions.find_one(lambda s: s.get("user_id") == user_id)
-        return Subscription(**data) if data else None
+        subscription_ids = storage.subscriptions.lookup("user_id", user_id)
+        if not subscription_ids:
+            return None
+        return _get_cached_model(Subscription, storage.subscriptions, subscription_ids[0])
 
     @staticmethod
     def update_subscription(subscription_id: str, updates: Dict[str, Any]) -> Optional[Subscription]:
         """Update subscription"""
-        updates["updated_at"] = datetime.utcnow().isoformat()
         data = storage.subscriptions.update(subscription_id, updates)
         return Subscription(**data) if data else None
 
@@ -310,19 +358,18 @@ class VoiceCommandDAO:
     def create_command(command_data: Dict[str, Any]) -> VoiceCommand:
         """Create a new voice command"""
         command = VoiceCommand(**command_data)
-        stored = storage.voice_commands.create(command.id, command.dict())
-        return VoiceCommand(**stored)
+        stored = storage.voice_commands.create(command.id, command.model_dump(mode="json"))
+        return _from_stored(command, stored)
 
     @staticmethod
     def get_command_by_id(command_id: str) -> Optional[VoiceCommand]:
         """Get voice command by ID"""
-        data = storage.voice_commands.read(command_id)
-        return VoiceCommand(**data) if data else None
+        return _get_cached_model(VoiceCommand, storage.voice_commands, command_id)
 
     @staticmethod
     def get_commands_by_user(user_id: str) -> List[VoiceCommand]:
         """Get all voice commands for a user"""
-        commands_data = storage.voice_commands.find(lambda c: c.get("user_id") == user_id)
+        commands_data = storage.voice_commands.find_eq("user_id", user_id)
         return [VoiceCommand(**c) for c in commands_data]
 
     @staticmethod
@@ -339,25 +386,23 @@ class RAGDocumentDAO:
     def create_document(document_data: Dict[str, Any]) -> RAGDocument:
         """Create a new RAG document"""
         document = RAGDocument(**document_data)
-        stored = storage.rag_documents.create(document.id, document.dict())
-        return RAGDocument(**stored)
+        stored = storage.rag_documents.create(document.id, document.model_dump(mode="json"))
+        return _from_stored(document, stored)
 
     @staticmethod
     def get_document_by_id(document_id: str) -> Optional[RAGDocument]:
         """Get RAG document by ID"""
-        data = storage.rag_documents.read(document_id)
-        return RAGDocument(**data) if data else None
+        return _get_cached_model(RAGDocument, storage.rag_documents, document_id)
 
     @staticmethod
     def get_documents_by_user(user_id: str) -> List[RAGDocument]:
         """Get all RAG documents for a user"""
-        documents_data = storage.rag_documents.find(lambda d: d.get("user_id") == user_id)
+        documents_data = storage.rag_documents.find_eq("user_id", user_id)
         return [RAGDocument(**d) for d in documents_data]
 
     @staticmethod
     def update_document(document_id: str, updates: Dict[str, Any]) -> Optional[RAGDocument]:
         """Update RAG document"""
-        updates["updated_at"] = datetime.utcnow().isoformat()
         data = storage.rag_documents.update(document_id, updates)
         return RAGDocument(**data) if data else None
 
@@ -2,14 +2,40 @@
 """
 Data Access Object for Portfolio and Position models.
 """
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable
 from decimal import Decimal
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, insert, update, delete, case, func, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, raiseload
 
 from ...models.portfolio import Portfolio, Position
+from ..postgres_db import utc_now
+
+
+def _market_data_values(current_price) -> Dict[str, Any]:
+    """SET clause that derives market value and P&L from a price inside the UPDATE"""
+    market_value = Position.quantity * current_price
+    unrealized_pl = market_value - Position.cost_basis
+    return {
+        "current_price": current_price,
+        "market_value": market_value,
+        "unrealized_pl": unrealized_pl,
+        "unrealized_pl_pct": case(
+            (func.coalesce(Position.cost_basis, 0) != 0, unrealized_pl / Position.cost_basis * 100),
+            else_=0
+        ),
+    }
+
+
+# Price tick update, built once and executed with one parameter set per position
+_MARKET_PRICES_STMT = (
+    update(Position.__table__)
+    .where(Position.__table__.c.id == bindparam("position_id"))
+    .values(
+        **_market_data_values(bindparam("price", type_=Position.__table__.c.current_price.type)),
+        last_updated_at=utc_now()
+    )
+)
 
 
 class PortfolioDAO:
@@ -35,7 +61,7 @@ class PortfolioDAO:
         result = await db.execute(
             select(Portfolio)
             .where(Portfolio.id == portfolio_id)
-            .options(selectinload(Portfolio.positions))
+            .options(selectinload(Portfolio.positions), raiseload("*"))
         )
         return result.scalar_one_or_none()
 
@@ -45,7 +71,7 @@ class PortfolioDAO:
         result = await db.execute(
             select(Portfolio)
             .where(Portfolio.user_id == user_id)
-            .options(selectinload(Portfolio.positions))
+            .options(selectinload(Portfolio.positions), raiseload("*"))
         )
         return list(result.scalars().all())
 
@@ -55,7 +81,7 @@ class PortfolioDAO:
         result = await db.execute(
             select(Portfolio)
             .where(Portfolio.user_id == user_id, Portfolio.is_active == 1)
-            .options(selectinload(Portfolio.positions))
+            .options(selectinload(Portfolio.positions), raiseload("*"))
         )
         return list(result.scalars().all())
 
@@ -65,13 +91,25 @@ class PortfolioDAO:
         stmt = (
             update(Portfolio)
             .where(Portfolio.id == portfolio_id)
-            .values(**kwargs, updated_at=datetime.utcnow())
+            .values(**kwargs, updated_at=utc_now())
             .returning(Portfolio)
         )
         result = await db.execute(stmt)
         await db.commit()
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def _update_noreturn(db: AsyncSession, portfolio_id: str, **kwargs) -> bool:
+        """Update portfolio without RETURNING, for callers that only need to know it matched"""
+        stmt = (
+            update(Portfolio)
+            .where(Portfolio.id == portfolio_id)
+            .values(**kwargs, updated_at=utc_now())
+        )
+        result = await db.execute(stmt)
+        await db.commit()
+        return result.rowcount > 0
+
     @staticmethod
     async def update_metrics(
         db: AsyncSession,
@@ -86,7 +124,7 @@ class PortfolioDAO:
             portfolio_id,
             total_value=total_value,
             cash_balance=cash_balance,
-            last_synced_at=datetime.utcnow(),
+            last_synced_at=utc_now(),
             **kwargs
         )
 
@@ -95,9 +133,9 @@ class PortfolioDAO:
         db: AsyncSession,
         portfolio_id: str,
         **risk_metrics
-    ) -> Optional[Portfolio]:
+    ) -> bool:
         """Update risk metrics"""
-        return await PortfolioDAO.update(db, portfolio_id, **risk_metrics)
+        return await PortfolioDAO._update_noreturn(db, portfolio_id, **risk_metrics)
 
     @staticmethod
     async def delete(db: AsyncSession, portfolio_id: str) -> bool:
@@ -134,6 +172,21 @@ class PositionDAO:
         await db.refresh(position)
         return position
 
+    @staticmethod
+    async def create_many(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Position]:
+        """Create several positions with one INSERT ... RETURNING and a single commit"""
+        if not rows:
+            return []
+
+        values = [
+            {"cost_basis": row["quantity"] * row["average_entry_price"], **row}
+            for row in rows
+        ]
+        result = await db.scalars(insert(Position).returning(Position), values)
+        positions = list(result)
+        await db.commit()
+        return positions
+
     @staticmethod
     async def get_by_id(db: AsyncSession, position_id: str) -> Optional[Position]:
         """Get position by ID"""
@@ -148,6 +201,23 @@ class PositionDAO:
         )
         return list(result.scalars().all())
 
+    @staticmethod
+    async def get_by_portfolios(
+        db: AsyncSession,
+        portfolio_ids: Iterable[str]
+    ) -> Dict[str, List[Position]]:
+        """Get positions for several portfolios in one query, keyed by portfolio ID string"""
+        positions_by_portfolio = {str(portfolio_id): [] for portfolio_id in portfolio_ids}
+        if not positions_by_portfolio:
+            return positions_by_portfolio
+
+        result = await db.execute(
+            select(Position).where(Position.portfolio_id.in_(list(positions_by_portfolio)))
+        )
+        for position in result.scalars():
+            positions_by_portfolio[str(position.portfolio_id)].append(position)
+        return positions_by_portfolio
+
     @staticmethod
     async def get_by_symbol(
         db: AsyncSession,
@@ -169,7 +239,7 @@ class PositionDAO:
         stmt = (
             update(Position)
             .where(Position.id == position_id)
-            .values(**kwargs, last_updated_at=datetime.utcnow())
+            .values(**kwargs, last_updated_at=utc_now())
             .returning(Position)
         )
         result = await db.execute(stmt)
@@ -182,25 +252,25 @@ class PositionDAO:
         position_id: str,
         current_price: Decimal
     ) -> Optional[Position]:
-        """Update position with current market price"""
-        # Get current position to calculate P&L
-        position = await PositionDAO.get_by_id(db, position_id)
-        if not position:
-            return None
-
-        market_value = position.quantity * current_price
-        unrealized_pl = market_value - position.cost_basis
-        unrealized_pl_pct = (unrealized_pl / position.cost_basis * 100) if position.cost_basis else 0
-
+        """Update position with current market price, computing P&L in the same statement"""
         return await PositionDAO.update(
             db,
             position_id,
-            current_price=current_price,
-            market_value=market_value,
-            unrealized_pl=unrealized_pl,
-            unrealized_pl_pct=unrealized_pl_pct
+            **_market_data_values(current_price)
         )
 
+    @staticmethod
+    async def update_market_prices(db: AsyncSession, prices: Dict[str, Decimal]) -> None:
+        """Apply a tick of prices (position ID -> price) as one executemany UPDATE"""
+        if not prices:
+            return
+
+        await db.execute(
+            _MARKET_PRICES_STMT,
+            [{"position_id": position_id, "price": price} for position_id, price in prices.items()]
+        )
+        await db.commit()
+
     @staticmethod
     async def delete(db: AsyncSession, position_id: str) -> bool:
         """Delete position"""
@@ -3,18 +3,129 @@
 Data Access Object for User model.
 Handles all database operations for users with proper async support.
 """
-from typing import Optional, List
+from contextlib import contextmanager
+from functools import cache, lru_cache
+from contextvars import ContextVar
+from typing import Optional, List, Dict, Tuple, Any, NamedTuple, AsyncIterator
 from datetime import datetime
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, insert, update, delete, func, bindparam, cast, DateTime, Text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB, ARRAY, array
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import make_transient_to_detached
 from uuid import UUID
 import logging
 
 from ...models.user import User
+from ..redis_cache import redis_cache, USER_BY_ID_KEY, USER_ID_BY_USERNAME_KEY, USER_ID_BY_EMAIL_KEY
 
 logger = logging.getLogger(__name__)
 
+# Parsed ids for string user ids seen recently (hot on every authenticated request)
+_parse_uuid = lru_cache(maxsize=4096)(UUID)
+
+
+def _as_uuid(user_id) -> UUID:
+    """Return user_id as a UUID, parsing strings through the memo"""
+    return _parse_uuid(user_id) if isinstance(user_id, str) else user_id
+
+
+class AuthRecord(NamedTuple):
+    """Columns a login check needs, without hydrating a User"""
+    id: UUID
+    hashed_password: str
+    is_active: bool
+    two_factor_enabled: bool
+
+
+# Users fetched during the current request, keyed by (lookup field, value);
+# None outside a request scope, which disables memoization
+_request_users: ContextVar[Optional[Dict[Tuple[str, Any], User]]] = ContextVar("user_cache", default=None)
+
+
+@contextmanager
+def user_cache_scope():
+    """Memoize UserDAO lookups for the duration of one request"""
+    token = _request_users.set({})
+    try:
+        yield
+    finally:
+        _request_users.reset(token)
+
+
+def _cached_user(key: Tuple[str, Any]) -> Optional[User]:
+    """Return the user memoized for key in this request, if any"""
+    cache = _request_users.get()
+    return cache.get(key) if cache is not None else None
+
+
+def _remember_user(user: Optional[User]):
+    """Memoize a fetched user under every key it can be looked up by"""
+    cache = _request_users.get()
+    if cache is not None and user is not None:
+        cache[("id", user.id)] = user
+        cache[("username", user.username)] = user
+        cache[("email", user.email)] = user
+
+
+def _forget_user(user_id):
+    """Drop every memoized entry for a user after it is written"""
+    cache = _request_users.get()
+    if cache:
+        for key in [k for k, u in cache.items() if u.id == user_id]:
+            del cache[key]
+
+
+# Seconds a user row stays in Redis
+USER_CACHE_TTL = 120
+
+# Credential type -> encrypted column
+_CREDENTIAL_COLUMNS = {
+    "plaid_token": User.plaid_access_token,
+    "alpaca_api_key": User.alpaca_api_key,
+    "alpaca_secret_key": User.alpaca_secret_key,
+}
+
+
+@cache
+def _credential_select(credential_type: str):
+    """SELECT of a user's key and one encrypted credential, built once per type"""
+    return select(User.encryption_key, _CREDENTIAL_COLUMNS[credential_type]).where(User.id == bindparam("user_id"))
+
+
+# Rows per INSERT statement in create_many
+CREATE_MANY_CHUNK_SIZE = 5000
+
+# Secrets never leave Postgres (password hash, TOTP seed, credential material).
+# They are deferred with raiseload on User, so they are never loaded on either
+# a cached or a fresh User; read them with explicit column SELECTs
+_UNCACHED_COLUMNS = {
+    "hashed_password", "two_factor_secret",
+    "encryption_key", "plaid_access_token", "alpaca_api_key", "alpaca_secret_key",
+}
+_CACHED_COLUMNS = [c for c in User.__table__.columns if c.key not in _UNCACHED_COLUMNS]
+
+
+def _user_row(user: User) -> Dict[str, Any]:
+    """Serializable column values of a user for Redis"""
+    return {c.key: getattr(user, c.key) for c in _CACHED_COLUMNS}
+
+
+def _user_from_row(row: Dict[str, Any]) -> User:
+    """Rebuild a detached User from a cached row"""
+    values = {}
+    for c in _CACHED_COLUMNS:
+        value = row.get(c.key)
+        if value is not None:
+            if isinstance(c.type, PG_UUID):
+                value = UUID(value)
+            elif isinstance(c.type, DateTime):
+                value = datetime.fromisoformat(value)
+        values[c.key] = value
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
 
 class UserDAO:
     """User Data Access Object"""
@@ -38,6 +149,8 @@ class UserDAO:
             db.add(user)
             await db.commit()
             await db.refresh(user)
+            await UserDAO._invalidate(username=username, email=email)
+            _remember_user(user)
             logger.info(f"User created: {username}")
             return user
         except IntegrityError as e:
@@ -49,14 +162,103 @@ class UserDAO:
             logger.error(f"User creation error: {e}")
             raise
 
+    @staticmethod
+    async def create_many(db: AsyncSession, users: List[Dict[str, Any]]) -> List[User]:
+        """
+        Create several users in one transaction.
+
+        Each chunk is a single INSERT ... RETURNING batched by insertmanyvalues;
+        nothing is committed if any row fails.
+
+        Args:
+            db: Database session
+            users: Column values per user (username, email, hashed_password, ...)
+
+        Returns:
+            Created users, in input order
+        """
+        if not users:
+            return []
+
+        created = []
+        try:
+            for start in range(0, len(users), CREATE_MANY_CHUNK_SIZE):
+                chunk = users[start:start + CREATE_MANY_CHUNK_SIZE]
+                result = await db.scalars(insert(User).returning(User, sort_by_parameter_order=True), chunk)
+                created.extend(result)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Bulk user creation failed: {e}")
+            raise
+
+        keys = []
+        for user in created:
+            keys.append(USER_ID_BY_USERNAME_KEY.format(username=user.username))
+            keys.append(USER_ID_BY_EMAIL_KEY.format(email=user.email))
+        await redis_cache.invalidate(*keys)
+        logger.info(f"Created {len(created)} users")
+        return created
+
+    @staticmethod
+    async def _fetch_by_id(db: AsyncSession, user_id: UUID) -> Optional[User]:
+        """Load a user through Redis, attaching cached rows to the session without a SELECT"""
+        fetched = []
+
+        async def load_row():
+            result = await db.execute(select(User).where(User.id == user_id))
+            fetched.append(result.scalar_one_or_none())
+            return _user_row(fetched[0]) if fetched[0] is not None else None
+
+        row = await redis_cache.get_or_set(USER_BY_ID_KEY.format(user_id=user_id), USER_CACHE_TTL, load_row)
+        if fetched:
+            return fetched[0]
+        if row is None:
+            return None
+        return await db.merge(_user_from_row(row), load=False)
+
+    @staticmethod
+    async def _fetch_by_field(db: AsyncSession, column, value: str, key: str) -> Optional[User]:
+        """Resolve a unique field to a user id through Redis, then load the user by id"""
+        async def load_id():
+            result = await db.execute(select(User.id).where(column == value))
+            user_id = result.scalar_one_or_none()
+            return str(user_id) if user_id is not None else None
+
+        user_id = await redis_cache.get_or_set(key, USER_CACHE_TTL, load_id)
+        if user_id is None:
+            return None
+        user = await UserDAO._fetch_by_id(db, _as_uuid(user_id))
+        if user is not None and getattr(user, column.key) == value:
+            return user
+
+        # Stale pointer (the user was renamed or deleted since); ask the database
+        await redis_cache.invalidate(key)
+        result = await db.execute(select(User).where(column == value))
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def _invalidate(user_id=None, username: str = None, email: str = None):
+        """Drop a user's Redis entries after a write"""
+        keys = []
+        if user_id is not None:
+            keys.append(USER_BY_ID_KEY.format(user_id=user_id))
+        if username is not None:
+            keys.append(USER_ID_BY_USERNAME_KEY.format(username=username))
+        if email is not None:
+            keys.append(USER_ID_BY_EMAIL_KEY.format(email=email))
+        await redis_cache.invalidate(*keys)
+
     @staticmethod
     async def get_by_id(db: AsyncSession, user_id) -> Optional[User]:
         """Get user by ID"""
         try:
-            if isinstance(user_id, str):
-                user_id = UUID(user_id)
-            result = await db.execute(select(User).where(User.id == user_id))
-            return result.scalar_one_or_none()
+            user_id = _as_uuid(user_id)
+            user = _cached_user(("id", user_id))
+            if user is None:
+                user = await UserDAO._fetch_by_id(db, user_id)
+                _remember_user(user)
+            return user
         except Exception as e:
             logger.error(f"Error fetching user {user_id}: {e}")
             return None
@@ -65,8 +267,11 @@ class UserDAO:
     async def get_by_username(db: AsyncSession, username: str) -> Optional[User]:
         """Get user by username"""
         try:
-            result = await db.execute(select(User).where(User.username == username))
-            return result.scalar_one_or_none()
+            user = _cached_user(("username", username))
+            if user is None:
+                user = await UserDAO._fetch_by_field(db, User.username, username, USER_ID_BY_USERNAME_KEY.format(username=username))
+                _remember_user(user)
+            return user
         except Exception as e:
             logger.error(f"Error fetching user {username}: {e}")
             return None
@@ -75,44 +280,26 @@ class UserDAO:
     async def get_by_email(db: AsyncSession, email: str) -> Optional[User]:
         """Get user by email"""
         try:
-            result = await db.execute(select(User).where(User.email == email))
-            return result.scalar_one_or_none()
+            user = _cached_user(("email", email))
+            if user is None:
+                user = await UserDAO._fetch_by_field(db, User.email, email, USER_ID_BY_EMAIL_KEY.format(email=email))
+                _remember_user(user)
+            return user
         except Exception as e:
             logger.error(f"Error fetching user by email {email}: {e}")
             return None
 
-    @staticmethod
-    async def update(
-        db: AsyncSession,
-        user_id,
-        **kwargs
-    ) -> Optional[User]:
-        """Update user fields"""
-        try:
-            if isinstance(user_id, str):
-                user_id = UUID(user_id)
-            
-            stmt = update(User).where(User.id == user_id).values(**kwargs)
-            await db.execute(stmt)
-            await db.commit()
-            
-            # Fetch updated user
-            return await UserDAO.get_by_id(db, user_id)
-        except Exception as e:
-            await db.rollback()
-            logger.error(f"Error updating user {user_id}: {e}")
-            raise
-
     @staticmethod
     async def delete(db: AsyncSession, user_id) -> bool:
-        """Delete a user"""
+        """Delete a user (soft delete by deactivating is recommended)"""
         try:
-            if isinstance(user_id, str):
-                user_id = UUID(user_id)
+            user_id = _as_uuid(user_id)
             
             stmt = delete(User).where(User.id == user_id)
             result = await db.execute(stmt)
             await db.commit()
+            await UserDAO._invalidate(user_id)
+            _forget_user(user_id)
             logger.info(f"User {user_id} deleted")
             return result.rowcount > 0
         except Exception as e:
@@ -135,6 +322,18 @@ class UserDAO:
             logger.error(f"Error listing users: {e}")
             return []
 
+    @staticmethod
+    async def iter_all(db: AsyncSession, batch_size: int = 1000) -> AsyncIterator[User]:
+        """
+        Yield every user through a server-side cursor, batch_size rows at a time.
+
+        Memory stays flat regardless of table size, so exports can stream
+        rows out as they arrive instead of paging through list_all.
+        """
+        stmt = select(User).order_by(User.created_at).execution_options(yield_per=batch_size)
+        async for user in await db.stream_scalars(stmt):
+            yield user
+
     @staticmethod
     async def search_by_username(
         db: AsyncSession,
@@ -153,19 +352,11 @@ class UserDAO:
     async def count_active_users(db: AsyncSession) -> int:
         """Count active users"""
         try:
-            result = await db.execute(select(User).where(User.is_active == True))
-            return len(result.scalars().all())
+            stmt = select(func.count()).select_from(User).where(User.is_active)
+            return (await db.execute(stmt)).scalar_one()
         except Exception as e:
             logger.error(f"Error counting users: {e}")
             return 0
-        result = await db.execute(select(User).where(User.username == username))
-        return result.scalar_one_or_none()
-
-    @staticmethod
-    async def get_by_email(db: AsyncSession, email: str) -> Optional[User]:
-        """Get user by email"""
-        result = await db.execute(select(User).where(User.email == email))
-        return result.scalar_one_or_none()
 
     @staticmethod
     async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
@@ -174,28 +365,80 @@ class UserDAO:
         return list(result.scalars().all())
 
     @staticmethod
-    async def update(db: AsyncSession, user_id: str, **kwargs) -> Optional[User]:
-        """Update user"""
-        stmt = (
-            update(User)
-            .where(User.id == user_id)
-            .values(**kwargs, updated_at=datetime.utcnow())
-            .returning(User)
-        )
-        result = await db.execute(stmt)
-        await db.commit()
-        return result.scalar_one_or_none()
+    async def get_auth_record(db: AsyncSession, username: str) -> Optional[AuthRecord]:
+        """Get the login fields for a username with a narrow SELECT (the hash is never loaded on Users)"""
+        stmt = select(
+            User.id,
+            User.hashed_password,
+            User.is_active,
+            User.two_factor_enabled
+        ).where(User.username == username)
+        row = (await db.execute(stmt)).first()
+        return AuthRecord(*row) if row is not None else None
+
+    @staticmethod
+    async def update(db: AsyncSession, user_id, **kwargs) -> Optional[User]:
+        """Update user fields, returning the updated row in the same round-trip"""
+        try:
+            user_id = _as_uuid(user_id)
+
+            stmt = (
+                update(User)
+                .where(User.id == user_id)
+                .values(**kwargs, updated_at=datetime.utcnow())
+                .returning(User)
+                .execution_options(populate_existing=True)
+            )
+            result = await db.execute(stmt)
+            await db.commit()
+            user = result.scalar_one_or_none()
+            # A new username/email may have been looked up (and cached as missing) before the rename
+            await UserDAO._invalidate(user_id, username=kwargs.get("username"), email=kwargs.get("email"))
+            _forget_user(user_id)
+            _remember_user(user)
+            return user
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error updating user {user_id}: {e}")
+            raise
 
     @staticmethod
     async def update_last_login(db: AsyncSession, user_id: str) -> Optional[User]:
         """Update user's last login timestamp"""
         return await UserDAO.update(db, user_id, last_login=datetime.utcnow())
 
+    @staticmethod
+    async def touch_last_login(db: AsyncSession, user_id) -> bool:
+        """
+        Record a login with a bare UPDATE (no RETURNING).
+
+        Meant for BackgroundTasks after the login response is sent, when no
+        caller needs the updated row.
+        """
+        user_id = _as_uuid(user_id)
+        now = datetime.utcnow()
+        stmt = update(User).where(User.id == user_id).values(last_login=now, updated_at=now)
+        result = await db.execute(stmt)
+        await db.commit()
+        await UserDAO._invalidate(user_id)
+        _forget_user(user_id)
+        return result.rowcount > 0
+
     @staticmethod
     async def update_preferences(db: AsyncSession, user_id: str, preferences: dict) -> Optional[User]:
         """Update user preferences"""
         return await UserDAO.update(db, user_id, preferences=preferences)
 
+    @staticmethod
+    async def patch_preferences(db: AsyncSession, user_id: str, key: str, value: Any) -> Optional[User]:
+        """Set one top-level preference in SQL with jsonb_set, without reading the blob first"""
+        preferences = func.jsonb_set(
+            func.coalesce(User.preferences, cast({}, JSONB)),
+            cast(array([key]), ARRAY(Text)),
+            cast(value, JSONB)
+        )
+        return await UserDAO.update(db, user_id, preferences=preferences)
+
     @staticmethod
     async def activate(db: AsyncSession, user_id: str) -> Optional[User]:
         """Activate user account"""
@@ -270,41 +513,67 @@ class UserDAO:
         Returns:
             True if successful, False otherwise
         """
-        from ..credential_encryption import CredentialEncryptionService
+        return await UserDAO.set_encrypted_credentials(db, user_id, {credential_type: plaintext_value})
+
+    @staticmethod
+    async def set_encrypted_credentials(
+        db: AsyncSession,
+        user_id: UUID,
+        credentials: Dict[str, str]
+    ) -> bool:
+        """
+        Encrypt and store several credentials for a user in a single UPDATE.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            credentials: credential_type -> plaintext value, with types as in
+                set_encrypted_credential
         
+        Returns:
+            True if successful, False otherwise
+        """
+        from ..credential_encryption import CredentialEncryptionService
+
+        unknown = set(credentials) - set(_CREDENTIAL_COLUMNS)
+        if unknown:
+            logger.error(f"Unknown credential type: {', '.join(sorted(unknown))}")
+            return False
+
         try:
-            # Get user and their encryption key
-            user = await UserDAO.get_by_id(db, user_id)
-            if not user:
+            user_id = _as_uuid(user_id)
+
+            # Get the user's encryption key, locking the row so a concurrent call
+            # cannot generate a second key and orphan these ciphertexts
+            stmt = select(User.encryption_key).where(User.id == user_id).with_for_update()
+            result = await db.execute(stmt)
+            row = result.one_or_none()
+            if row is None:
                 logger.error(f"User not found: {user_id}")
                 return False
-            
+
             # If user doesn't have an encryption key, generate one
-            if not user.encryption_key:
-                user.encryption_key = CredentialEncryptionService.generate_encryption_key()
+            fields = {}
+            encryption_key = row.encryption_key
+            if not encryption_key:
+                encryption_key = fields["encryption_key"] = CredentialEncryptionService.generate_encryption_key()
                 logger.info(f"Generated encryption key for user {user_id}")
-            
-            # Encrypt the credential
-            ciphertext = CredentialEncryptionService.encrypt_credential(
-                plaintext_value,
-                user.encryption_key
-            )
-            
-            # Store the encrypted credential
-            if credential_type == 'plaid_token':
-                user.plaid_access_token = ciphertext
-            elif credential_type == 'alpaca_api_key':
-                user.alpaca_api_key = ciphertext
-            elif credential_type == 'alpaca_secret_key':
-                user.alpaca_secret_key = ciphertext
-            else:
-                logger.error(f"Unknown credential type: {credential_type}")
-                return False
-            
+
+            # Encrypt every credential, then store them (and any new key) together
+            for credential_type, plaintext_value in credentials.items():
+                fields[_CREDENTIAL_COLUMNS[credential_type].key] = CredentialEncryptionService.encrypt_credential(
+                    plaintext_value,
+                    encryption_key
+                )
+
+            stmt = update(User).where(User.id == user_id).values(**fields, updated_at=datetime.utcnow())
+            await db.execute(stmt)
             await db.commit()
-            logger.info(f"Encrypted credential stored for user {user_id}: {credential_type}")
+            await UserDAO._invalidate(user_id)
+            _forget_user(user_id)
+            logger.info(f"Encrypted credentials stored for user {user_id}: {', '.join(credentials)}")
             return True
-            
+
         except Exception as e:
             await db.rollback()
             logger.error(f"Failed to set encrypted credential: {e}")
@@ -329,24 +598,19 @@ class UserDAO:
         """
         from ..credential_encryption import CredentialEncryptionService
         
+        if credential_type not in _CREDENTIAL_COLUMNS:
+            logger.error(f"Unknown credential type: {credential_type}")
+            return None
+
         try:
-            # Get user
-            user = await UserDAO.get_by_id(db, user_id)
-            if not user or not user.encryption_key:
+            # Get the user's key and the encrypted credential (never cached in Redis)
+            result = await db.execute(_credential_select(credential_type), {"user_id": _as_uuid(user_id)})
+            row = result.one_or_none()
+            if row is None or not row.encryption_key:
                 logger.error(f"User or encryption key not found for {user_id}")
                 return None
-            
-            # Get the encrypted credential
-            if credential_type == 'plaid_token':
-                ciphertext = user.plaid_access_token
-            elif credential_type == 'alpaca_api_key':
-                ciphertext = user.alpaca_api_key
-            elif credential_type == 'alpaca_secret_key':
-                ciphertext = user.alpaca_secret_key
-            else:
-                logger.error(f"Unknown credential type: {credential_type}")
-                return None
-            
+
+            encryption_key, ciphertext = row
             if not ciphertext:
                 logger.warning(f"No credential stored for user {user_id}: {credential_type}")
                 return None
@@ -354,7 +618,7 @@ class UserDAO:
             # Decrypt and return
             plaintext = CredentialEncryptionService.decrypt_credential(
                 ciphertext,
-                user.encryption_key
+                encryption_key
             )
             
             return plaintext
@@ -363,16 +627,8 @@ class UserDAO:
             logger.error(f"Failed to get encrypted credential: {e}")
             return None
 
-    @staticmethod
-    async def delete(db: AsyncSession, user_id: str) -> bool:
-        """Delete user (soft delete by deactivating is recommended)"""
-        stmt = delete(User).where(User.id == user_id)
-        result = await db.execute(stmt)
-        await db.commit()
-        return result.rowcount > 0
-
     @staticmethod
     async def count(db: AsyncSession) -> int:
         """Count total users"""
-        result = await db.execute(select(User))
-        return len(list(result.scalars().all()))
+        result = await db.execute(select(func.count()).select_from(User))
+        return result.scalar_one()
@@ -1,26 +1,44 @@
 # backend/services/db.py
 import os
+from functools import lru_cache
 from motor.motor_asyncio import AsyncIOMotorClient
 
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "apex")
 
-client = AsyncIOMotorClient(MONGO_URI)
-db = client[DB_NAME]
+# Connection pool sizing (per worker process)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+
+
+@lru_cache(maxsize=None)
+def get_client() -> AsyncIOMotorClient:
+    """
+    Shared Motor client, created on first use so importing this module does no I/O.
+    The server first calls this from its startup hook, so each worker opens
+    its sockets inside its own running event loop.
+    """
+    return AsyncIOMotorClient(
+        MONGO_URI,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+    )
 
-# Dependency for FastAPI
-async def get_db():
-    return db
 
-# Example: User auth collection
-async def get_user(username: str):
-    return await db.users.find_one({"username": username})
+def get_database():
+    """Shared handle on the APEX database"""
+    return get_client()[DB_NAME]
 
-async def create_user(username: str, hashed_password: str):
-    user = {"username": username, "password": hashed_password, "portfolio": []}
-    await db.users.insert_one(user)
-    return user
 
-async def get_user_portfolio(user_id: str):
-    user = await db.users.find_one({"_id": user_id})
-    return user.get("portfolio", []) if user else []
+def close_client():
+    """Close the shared client if this process created one"""
+    if get_client.cache_info().currsize:
+        get_client().close()
+        get_client.cache_clear()
+
+
+# Dependency for FastAPI
+async def get_db():
+    return get_database()
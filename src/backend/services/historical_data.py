@@ -9,9 +9,16 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import os
-import json
+import orjson
 from pathlib import Path
 
+# Cache format version: 1 stored every column inline in the scenario JSON,
+# 2 keeps only metadata there and one .npz array file per symbol
+CACHE_VERSION = 2
+
+# Per-symbol columns stored in the array files
+SYMBOL_COLUMNS = ("dates", "open", "high", "low", "close", "volume", "adj_close")
+
 
 class HistoricalDataLoader:
     """
@@ -23,6 +30,10 @@ class HistoricalDataLoader:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # Scenarios and returns matrices already loaded by this process
+        self._loaded: Dict[str, Dict] = {}
+        self._returns: Dict[str, Tuple[np.ndarray, List[str]]] = {}
+        
         # Crisis periods
         self.scenarios = {
             "2008_crisis": {
@@ -66,7 +77,7 @@ class HistoricalDataLoader:
             force_refresh: Re-download even if cached
             
         Returns:
-            Dict with scenario metadata and OHLCV data for all symbols
+            Dict with scenario metadata and OHLCV arrays for all symbols
         """
         if scenario_name not in self.scenarios:
             raise ValueError(f"Unknown scenario: {scenario_name}. Choose from {list(self.scenarios.keys())}")
@@ -74,85 +85,135 @@ class HistoricalDataLoader:
         scenario = self.scenarios[scenario_name]
         cache_file = self.cache_dir / f"{scenario_name}.json"
         
+        if force_refresh:
+            self._loaded.pop(scenario_name, None)
+            self._returns.pop(scenario_name, None)
+        elif scenario_name in self._loaded:
+            return self._loaded[scenario_name]
+        
         # Load from cache if exists and not forcing refresh
         if cache_file.exists() and not force_refresh:
             print(f"📂 Loading {scenario['name']} from cache...")
-            with open(cache_file, 'r') as f:
-                return json.load(f)
+            data = orjson.loads(cache_file.read_bytes())
+            if data.get("version", 1) >= CACHE_VERSION:
+                data["symbols"] = {
+                    symbol: self._read_symbol_arrays(scenario_name, symbol, info["description"])
+                    for symbol, info in data["symbols"].items()
+                }
+            self._loaded[scenario_name] = data
+            return data
         
         # Download data
         print(f"📥 Downloading {scenario['name']} data...")
         data = {
+            "version": CACHE_VERSION,
             "scenario": scenario,
             "symbols": {},
             "downloaded_at": datetime.now().isoformat()
         }
         
+        # One request for every ticker; columns come back grouped per symbol
+        print(f"  Fetching {', '.join(self.symbols)}...")
+        df_all = yf.download(
+            " ".join(self.symbols),
+            start=scenario["start"],
+            end=scenario["end"],
+            progress=False,
+            group_by="ticker",
+            threads=True
+        )
+        
         for symbol, description in self.symbols.items():
             try:
-                print(f"  Fetching {symbol}...")
-                df = yf.download(
-                    symbol,
-                    start=scenario["start"],
-                    end=scenario["end"],
-                    progress=False
-                )
+                df = df_all[symbol].dropna(how='all') if symbol in df_all.columns.get_level_values(0) else None
                 
-                if df.empty:
+                if df is None or df.empty:
                     print(f"  ⚠️  No data for {symbol}")
                     continue
                 
-                # Convert to dict format
+                # Keep columns as float64 arrays; they are written as-is below
                 data["symbols"][symbol] = {
                     "description": description,
-                    "dates": df.index.strftime('%Y-%m-%d').tolist(),
-                    "open": df['Open'].tolist(),
-                    "high": df['High'].tolist(),
-                    "low": df['Low'].tolist(),
-                    "close": df['Close'].tolist(),
-                    "volume": df['Volume'].tolist(),
-                    "adj_close": df['Adj Close'].tolist() if 'Adj Close' in df.columns else df['Close'].tolist()
+                    "dates": df.index.strftime('%Y-%m-%d').to_numpy(dtype=str),
+                    "open": df['Open'].to_numpy(dtype=np.float64).ravel(),
+                    "high": df['High'].to_numpy(dtype=np.float64).ravel(),
+                    "low": df['Low'].to_numpy(dtype=np.float64).ravel(),
+                    "close": df['Close'].to_numpy(dtype=np.float64).ravel(),
+                    "volume": df['Volume'].to_numpy(dtype=np.float64).ravel(),
+                    "adj_close": (df['Adj Close'] if 'Adj Close' in df.columns else df['Close']).to_numpy(dtype=np.float64).ravel()
                 }
                 
             except Exception as e:
                 print(f"  ❌ Error fetching {symbol}: {e}")
         
-        # Save to cache
+        # Save to cache: one compressed array file per symbol plus a small metadata file
         print(f"💾 Saving to cache: {cache_file}")
-        with open(cache_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        for symbol, info in data["symbols"].items():
+            np.savez_compressed(
+                self._symbol_cache_file(scenario_name, symbol),
+                **{column: info[column] for column in SYMBOL_COLUMNS}
+            )
+        metadata = {
+            **data,
+            "symbols": {symbol: {"description": info["description"]} for symbol, info in data["symbols"].items()}
+        }
+        cache_file.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
         
+        self._loaded[scenario_name] = data
         return data
     
-    def get_returns_matrix(self, scenario_name: str) -> np.ndarray:
+    def _symbol_cache_file(self, scenario_name: str, symbol: str) -> Path:
+        """Path of the array file holding one symbol's data for a scenario."""
+        return self.cache_dir / f"{scenario_name}_{symbol}.npz"
+    
+    def _read_symbol_arrays(self, scenario_name: str, symbol: str, description: str) -> Dict:
+        """Read one symbol's cached columns back as numpy arrays."""
+        with np.load(self._symbol_cache_file(scenario_name, symbol)) as arrays:
+            info = {column: arrays[column] for column in SYMBOL_COLUMNS}
+        info["description"] = description
+        return info
+    
+    def get_returns_matrix(self, scenario_name: str) -> Tuple[np.ndarray, List[str]]:
         """
         Get daily returns matrix for GPU backtesting.
         
         Returns:
-            numpy array of shape (days, num_symbols) with daily returns
+            numpy array of shape (days, num_symbols) with daily returns, and the symbol names
         """
+        if scenario_name in self._returns:
+            aligned, symbol_names = self._returns[scenario_name]
+            return aligned, list(symbol_names)
+        
         data = self.load_scenario(scenario_name)
         
-        symbols_data = []
-        symbol_names = []
+        # Skip VIX for returns calculation
+        symbol_names = [symbol for symbol in data["symbols"] if symbol != "^VIX"]
         
-        for symbol, info in data["symbols"].items():
-            if symbol == "^VIX":  # Skip VIX for returns calculation
-                continue
-            
-            closes = np.array(info["adj_close"])
-            returns = np.diff(closes) / closes[:-1]  # Daily returns
-            symbols_data.append(returns)
-            symbol_names.append(symbol)
+        # Align all to same length (some may have missing days) in one closes matrix
+        min_length = min(len(data["symbols"][symbol]["adj_close"]) for symbol in symbol_names)
+        closes = np.empty((min_length, len(symbol_names)), dtype=np.float64)
+        for j, symbol in enumerate(symbol_names):
+            closes[:, j] = data["symbols"][symbol]["adj_close"][:min_length]
         
-        # Align all to same length (some may have missing days)
-        min_length = min(len(r) for r in symbols_data)
-        aligned = np.array([r[:min_length] for r in symbols_data]).T
+        aligned = closes[1:] / closes[:-1] - 1.0  # Daily returns
         
-        print(f"📊 Returns matrix shape: {aligned.shape} ({min_length} days, {len(symbol_names)} symbols)")
+        print(f"📊 Returns matrix shape: {aligned.shape} ({len(aligned)} days, {len(symbol_names)} symbols)")
         print(f"   Symbols: {symbol_names}")
         
-        return aligned, symbol_names
+        # Shared between callers, so keep it read-only
+        aligned.flags.writeable = False
+        self._returns[scenario_name] = (aligned, symbol_names)
+        return aligned, list(symbol_names)
+    
+    def _spy_closes(self, scenario_name: str) -> Tuple[List[str], np.ndarray]:
+        """Return SPY's trading dates and adjusted closes for a scenario."""
+        data = self.load_scenario(scenario_name)
+        
+        if "SPY" not in data["symbols"]:
+            raise ValueError("SPY data not available")
+        
+        spy = data["symbols"]["SPY"]
+        return spy["dates"], np.asarray(spy["adj_close"], dtype=np.float64)
     
     def get_spy_benchmark(self, scenario_name: str) -> pd.DataFrame:
         """
@@ -161,15 +222,10 @@ class HistoricalDataLoader:
         Returns:
             DataFrame with Date, Close, and Cumulative Return
         """
-        data = self.load_scenario(scenario_name)
-        
-        if "SPY" not in data["symbols"]:
-            raise ValueError("SPY data not available")
-        
-        spy = data["symbols"]["SPY"]
+        dates, closes = self._spy_closes(scenario_name)
         df = pd.DataFrame({
-            "Date": pd.to_datetime(spy["dates"]),
-            "Close": spy["adj_close"]
+            "Date": pd.to_datetime(dates),
+            "Close": closes
         })
         
         # Calculate cumulative returns
@@ -198,35 +254,34 @@ class HistoricalDataLoader:
         Returns:
             Dict with max drawdown, volatility, recovery time, etc.
         """
-        spy_data = self.get_spy_benchmark(scenario_name)
+        dates, closes = self._spy_closes(scenario_name)
         
-        # Calculate statistics
-        cumulative = spy_data["Cumulative_Return"].values
-        daily_returns = spy_data["Daily_Return"].dropna().values
+        # Calculate statistics straight from the closes
+        growth = closes / closes[0]
+        daily_returns = closes[1:] / closes[:-1] - 1
         
         # Maximum drawdown
-        running_max = np.maximum.accumulate(cumulative + 1)
-        drawdown = (cumulative + 1 - running_max) / running_max
+        running_max = np.maximum.accumulate(growth)
+        drawdown = growth / running_max - 1
         max_drawdown = drawdown.min()
         
         # Find drawdown dates
-        max_dd_idx = drawdown.argmin()
-        max_dd_date = spy_data.iloc[max_dd_idx]["Date"]
+        max_dd_date = str(dates[drawdown.argmin()])
         
         # Volatility (annualized)
         volatility = daily_returns.std() * np.sqrt(252)
         
         # Final return
-        final_return = cumulative[-1]
+        final_return = growth[-1] - 1
         
         return {
             "scenario": self.scenarios[scenario_name]["name"],
             "period": f"{self.scenarios[scenario_name]['start']} to {self.scenarios[scenario_name]['end']}",
             "max_drawdown": f"{max_drawdown:.2%}",
-            "max_drawdown_date": max_dd_date.strftime('%Y-%m-%d'),
+            "max_drawdown_date": max_dd_date,
             "volatility_annualized": f"{volatility:.2%}",
             "total_return": f"{final_return:.2%}",
-            "num_trading_days": len(spy_data)
+            "num_trading_days": len(closes)
         }
 
 
@@ -1,8 +1,11 @@
 """
 JSON-based local storage service to replace database operations.
 Provides thread-safe file-based storage with automatic indexing and backup.
+Entities are served from an in-memory snapshot; files stay the source of truth
+and every write goes straight to disk.
 """
 
+import asyncio
 import json
 import os
 from pathlib import Path
@@ -14,6 +17,12 @@ from pydantic import BaseModel
 
 T = TypeVar('T', bound=BaseModel)
 
+# Entity collections exposed by StorageManager
+ENTITY_TYPES = (
+    "users", "portfolios", "trades", "goals", "accounts", "transactions",
+    "subscriptions", "plaid", "voice_commands", "rag_documents",
+)
+
 
 class JSONStorage(Generic[T]):
     """Generic JSON storage handler for a specific entity type."""
@@ -33,6 +42,16 @@ class JSONStorage(Generic[T]):
         self.index_file = self.entity_path / "index.json"
         self.lock = threading.Lock()
 
+        # Bumped on every successful write so readers can key caches on it
+        self.version = 0
+
+        # In-memory snapshot of every entity (ID -> data), loaded on first access
+        self._entities: Optional[Dict[str, Dict[str, Any]]] = None
+
+        # Secondary indexes: field -> value -> entity IDs in creation order
+        self._indexes: Dict[str, Dict[Any, List[str]]] = {}
+        self._stamp: Optional[tuple] = None
+
         # Ensure directories exist
         self.entity_path.mkdir(parents=True, exist_ok=True)
         self.backup_path.mkdir(parents=True, exist_ok=True)
@@ -70,6 +89,47 @@ class JSONStorage(Generic[T]):
             backup = self.backup_path / f"{entity_id}_{timestamp}.json"
             shutil.copy2(source, backup)
 
+    def _file_stamp(self) -> Optional[tuple]:
+        """Modification stamp of the index file, which every write rewrites."""
+        try:
+            stat = self.index_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _sync(self):
+        """Drop the snapshot and indexes if another process has written since we last looked."""
+        stamp = self._file_stamp()
+        if stamp != self._stamp:
+            self._entities = None
+            self._indexes.clear()
+            self._stamp = stamp
+
+    def _snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Entity snapshot, reading every file once after start-up or an external write."""
+        if self._entities is None:
+            entities = {}
+            for entity_id in self._read_index():
+                entity_data = self._read_file(self.entity_path / f"{entity_id}.json")
+                if entity_data:
+                    entities[entity_id] = entity_data
+            self._entities = entities
+        return self._entities
+
+    def _index_add(self, entity_id: str, entity_data: Dict[str, Any]):
+        """Add an entity to every built secondary index."""
+        for field, index in self._indexes.items():
+            index.setdefault(entity_data.get(field), []).append(entity_id)
+
+    def _index_remove(self, entity_id: str, entity_data: Dict[str, Any]):
+        """Remove an entity from every built secondary index."""
+        for field, index in self._indexes.items():
+            ids = index.get(entity_data.get(field))
+            if ids and entity_id in ids:
+                ids.remove(entity_id)
+                if not ids:
+                    del index[entity_data.get(field)]
+
     def create(self, entity_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new entity.
@@ -82,17 +142,20 @@ class JSONStorage(Generic[T]):
             Created entity data with metadata
         """
         with self.lock:
+            self._sync()
+
             # Check if already exists
             index = self._read_index()
             if entity_id in index:
                 raise ValueError(f"{self.entity_type} with ID {entity_id} already exists")
 
             # Add metadata
+            now = datetime.utcnow().isoformat()
             entity_data = {
                 **data,
                 "id": entity_id,
-                "created_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat()
+                "created_at": now,
+                "updated_at": now
             }
 
             # Write entity file
@@ -105,9 +168,20 @@ class JSONStorage(Generic[T]):
                 "updated_at": entity_data["updated_at"]
             }
             self._write_index(index)
+            self.version += 1
+            if self._entities is not None:
+                self._entities[entity_id] = entity_data
+            self._index_add(entity_id, entity_data)
+            self._stamp = self._file_stamp()
 
             return entity_data
 
+    def load(self):
+        """Load the in-memory snapshot now rather than on first access."""
+        with self.lock:
+            self._sync()
+            self._snapshot()
+
     def read(self, entity_id: str) -> Optional[Dict[str, Any]]:
         """
         Read an entity by ID.
@@ -116,13 +190,11 @@ class JSONStorage(Generic[T]):
             entity_id: Unique identifier for the entity
 
         Returns:
-            Entity data or None if not found
+            Entity data or None if not found (shared with the snapshot; do not mutate)
         """
         with self.lock:
-            entity_file = self.entity_path / f"{entity_id}.json"
-            if not entity_file.exists():
-                return None
-            return self._read_file(entity_file)
+            self._sync()
+            return self._snapshot().get(entity_id)
 
     def update(self, entity_id: str, data: Dict[str, Any], create_backup: bool = True) -> Optional[Dict[str, Any]]:
         """
@@ -137,33 +209,39 @@ class JSONStorage(Generic[T]):
             Updated entity data or None if not found
         """
         with self.lock:
-            entity_file = self.entity_path / f"{entity_id}.json"
-            if not entity_file.exists():
+            self._sync()
+
+            entities = self._snapshot()
+            existing_data = entities.get(entity_id)
+            if existing_data is None:
                 return None
 
             # Backup existing data
             if create_backup:
                 self._backup_file(entity_id)
 
-            # Read existing data
-            existing_data = self._read_file(entity_file)
-
             # Merge with updates
+            now = datetime.utcnow().isoformat()
             entity_data = {
                 **existing_data,
                 **data,
                 "id": entity_id,
-                "created_at": existing_data.get("created_at", datetime.utcnow().isoformat()),
-                "updated_at": datetime.utcnow().isoformat()
+                "created_at": existing_data.get("created_at", now),
+                "updated_at": now
             }
 
             # Write updated data
-            self._write_file(entity_file, entity_data)
+            self._write_file(self.entity_path / f"{entity_id}.json", entity_data)
+            entities[entity_id] = entity_data
 
             # Update index
             index = self._read_index()
             index[entity_id]["updated_at"] = entity_data["updated_at"]
             self._write_index(index)
+            self.version += 1
+            self._index_remove(entity_id, existing_data)
+            self._index_add(entity_id, entity_data)
+            self._stamp = self._file_stamp()
 
             return entity_data
 
@@ -179,8 +257,11 @@ class JSONStorage(Generic[T]):
             True if deleted, False if not found
         """
         with self.lock:
-            entity_file = self.entity_path / f"{entity_id}.json"
-            if not entity_file.exists():
+            self._sync()
+
+            entities = self._snapshot()
+            existing_data = entities.pop(entity_id, None)
+            if existing_data is None:
                 return False
 
             # Backup before deleting
@@ -188,13 +269,16 @@ class JSONStorage(Generic[T]):
                 self._backup_file(entity_id)
 
             # Delete file
-            entity_file.unlink()
+            (self.entity_path / f"{entity_id}.json").unlink(missing_ok=True)
+            self.version += 1
+            self._index_remove(entity_id, existing_data)
 
             # Update index
             index = self._read_index()
             if entity_id in index:
                 del index[entity_id]
                 self._write_index(index)
+            self._stamp = self._file_stamp()
 
             return True
 
@@ -206,8 +290,63 @@ class JSONStorage(Generic[T]):
             List of entity IDs
         """
         with self.lock:
-            index = self._read_index()
-            return list(index.keys())
+            self._sync()
+            return list(self._snapshot())
+
+    def read_all(self) -> List[Dict[str, Any]]:
+        """
+        Read every entity from the in-memory snapshot.
+
+        Returns:
+            List of all entity data
+        """
+        with self.lock:
+            self._sync()
+            return list(self._snapshot().values())
+
+    def _field_index(self, field: str) -> Dict[Any, List[str]]:
+        """Secondary index for a field, built from the snapshot on first use."""
+        index = self._indexes.get(field)
+        if index is None:
+            index = {}
+            for entity_id, entity_data in self._snapshot().items():
+                index.setdefault(entity_data.get(field), []).append(entity_id)
+            self._indexes[field] = index
+        return index
+
+    def lookup(self, field: str, value: Any) -> List[str]:
+        """
+        Find entity IDs whose field equals a value using a secondary index.
+
+        The index for a field is built on first use and kept up to date by
+        create, update and delete.
+
+        Args:
+            field: Entity field to match
+            value: Value the field must equal
+
+        Returns:
+            Matching entity IDs in creation order
+        """
+        with self.lock:
+            self._sync()
+            return list(self._field_index(field).get(value, ()))
+
+    def find_eq(self, field: str, value: Any) -> List[Dict[str, Any]]:
+        """
+        Find entities whose field equals a value using a secondary index.
+
+        Args:
+            field: Entity field to match
+            value: Value the field must equal
+
+        Returns:
+            List of matching entities in creation order
+        """
+        with self.lock:
+            self._sync()
+            entities = self._snapshot()
+            return [entities[entity_id] for entity_id in self._field_index(field).get(value, ())]
 
     def find(self, filter_fn: callable) -> List[Dict[str, Any]]:
         """
@@ -219,13 +358,7 @@ class JSONStorage(Generic[T]):
         Returns:
             List of matching entities
         """
-        with self.lock:
-            results = []
-            for entity_id in self.list_all():
-                entity_data = self.read(entity_id)
-                if entity_data and filter_fn(entity_data):
-                    results.append(entity_data)
-            return results
+        return [entity_data for entity_data in self.read_all() if filter_fn(entity_data)]
 
     def find_one(self, filter_fn: callable) -> Optional[Dict[str, Any]]:
         """
@@ -262,6 +395,18 @@ class StorageManager:
             self._storages[entity_type] = JSONStorage(entity_type, self.base_path)
         return self._storages[entity_type]
 
+    async def warm(self, entity_types=ENTITY_TYPES):
+        """
+        Load several collections' snapshots concurrently in worker threads.
+
+        Args:
+            entity_types: Names of the entity types to load
+        """
+        await asyncio.gather(*(
+            asyncio.to_thread(self.get_storage(entity_type).load)
+            for entity_type in entity_types
+        ))
+
     @property
     def users(self) -> JSONStorage:
         return self.get_storage("users")
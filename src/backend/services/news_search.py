@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 import json
 from ddgs import DDGS
 import feedparser  # type: ignore
+import httpx
 import requests
 
 try:
@@ -58,6 +60,68 @@ def fetch_rss() -> List[Dict[str, Any]]:
             continue
     return articles
 
+def create_http_client() -> httpx.AsyncClient:
+    """Create the long-lived client shared by news fetches (keep-alive + HTTP/2)"""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+        timeout=10.0,
+        follow_redirects=True,
+    )
+
+async def fetch_rss_async(client: httpx.AsyncClient) -> List[Dict[str, Any]]:
+    """Fetch every RSS feed concurrently over the shared client"""
+    responses = await asyncio.gather(
+        *(client.get(url) for _, url in FINANCE_RSS),
+        return_exceptions=True
+    )
+    articles: List[Dict[str, Any]] = []
+    for (src_title, _), response in zip(FINANCE_RSS, responses):
+        if isinstance(response, Exception):
+            print(f"Error fetching {src_title}: {str(response)}")
+            continue
+        if response.status_code != 200:
+            print(f"Error fetching {src_title}: HTTP {response.status_code}")
+            continue
+        feed = feedparser.parse(response.content)
+        articles.extend(_parse_entry(src_title, entry) for entry in getattr(feed, "entries", []))
+    return articles
+
+def _matches(article: Dict[str, Any], terms: List[str]) -> bool:
+    text = f"{article.get('title') or ''} {article.get('summary') or ''}".lower()
+    return any(term in text for term in terms)
+
+async def aggregate_news(
+    query: Optional[str] = None,
+    symbols: Optional[List[str]] = None,
+    max_results: int = 50,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[Dict[str, Any]]:
+    """RSS headlines (plus DuckDuckGo results for a query), filtered and de-duplicated"""
+    if client is None:
+        async with create_http_client() as own_client:
+            return await aggregate_news(query, symbols, max_results, own_client)
+
+    articles = await fetch_rss_async(client)
+    terms = [t.lower() for t in ([query] if query else []) + (symbols or [])]
+    if terms:
+        articles = [a for a in articles if _matches(a, terms)]
+    if query and _DDG_AVAILABLE:
+        articles.extend(await asyncio.to_thread(ddg_news_search, query, max_results))
+
+    seen = set()
+    unique: List[Dict[str, Any]] = []
+    for article in articles:
+        key = (article.get("title"), article.get("link"))
+        if key not in seen:
+            seen.add(key)
+            unique.append(article)
+    return unique[:max_results]
+
+async def web_search(query: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    """DuckDuckGo news search, run off the event loop (DDGS manages its own session)"""
+    return await asyncio.to_thread(ddg_news_search, query, max_results)
+
 def ddg_news_search(query: str, max_results: int = 20) -> List[Dict[str, Any]]:
     if not _DDG_AVAILABLE:
         return []
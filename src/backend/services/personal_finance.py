@@ -4,7 +4,12 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
-from .db import db
+from pymongo.errors import OperationFailure
+
+from .db import get_database
+
+# Superseded by the covering (user_id, date, amount, category) transactions index
+LEGACY_TRANSACTIONS_DATE_INDEX = "user_id_1_date_-1"
 
 
 class PersonalFinanceService:
@@ -18,13 +23,23 @@ class PersonalFinanceService:
 
 	def __init__(self):
 		self.logger = logging.getLogger(__name__)
+		db = get_database()
 		self.accounts = db["finance_accounts"]
 		self.transactions = db["finance_transactions"]
 		self.budgets = db["finance_budgets"]
 
 	async def ensure_indexes(self) -> None:
 		await self.accounts.create_index("user_id")
-		await self.transactions.create_index([("user_id", 1), ("date", -1)])
+		# Serves date-sorted listings and covers the summary pipelines, so those
+		# never fetch whole transaction documents
+		await self.transactions.create_index([("user_id", 1), ("date", -1), ("amount", 1), ("category", 1)])
+		# The covering index replaces the older (user_id, date) one; drop it on existing deployments
+		if LEGACY_TRANSACTIONS_DATE_INDEX in await self.transactions.index_information():
+			try:
+				await self.transactions.drop_index(LEGACY_TRANSACTIONS_DATE_INDEX)
+			except OperationFailure as e:
+				# Another worker dropped it first
+				self.logger.debug("Legacy index %s already dropped: %s", LEGACY_TRANSACTIONS_DATE_INDEX, e)
 		await self.transactions.create_index([("user_id", 1), ("account_id", 1), ("date", -1)])
 		await self.transactions.create_index([("user_id", 1), ("category", 1), ("date", -1)])
 		await self.budgets.create_index([("user_id", 1), ("month", 1)], unique=True)
@@ -120,8 +135,7 @@ class PersonalFinanceService:
 			match["date"] = {"$gte": start, "$lt": end}
 
 		pipeline = [
-			{"$match": match},
-			{"$match": {"amount": {"$lt": 0}}},  # expenses
+			{"$match": {**match, "amount": {"$lt": 0}}},  # expenses
 			{"$group": {"_id": "$category", "total": {"$sum": "$amount"}}},
 			{"$project": {"category": "$_id", "total": 1, "_id": 0}},
 			{"$sort": {"total": 1}}
@@ -4,13 +4,23 @@ ChromaDB service for APEX RAG system.
 Handles vector storage and semantic search for historical market data, news, and company information.
 """
 import os
-from typing import List, Dict, Optional, Any
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 from sentence_transformers import SentenceTransformer
 
+# Number of query embeddings kept in memory for repeat searches
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Upper bound on documents per collection.add call (also capped by the client)
+MAX_ADD_BATCH_SIZE = 5000
+
+
 class ChromaService:
     """Service for managing vector embeddings and semantic search"""
 
@@ -36,10 +46,18 @@ class ChromaService:
             model_name="sentence-transformers/all-MiniLM-L6-v2"
         )
 
+        # Query embeddings keyed by a digest of the query text (LRU order)
+        self._query_embeddings: "OrderedDict[bytes, List[float]]" = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
+
         # Collections
         self.collections = {}
         self._init_collections()
 
+        # Collections are fixed after init; snapshot them for fan-out searches
+        self.collection_items = tuple(self.collections.items())
+        self.collection_names = tuple(self.collections)
+
     def _init_collections(self):
         """Initialize or load collections"""
         # Market events collection (crashes, bull markets, major events)
@@ -70,6 +88,33 @@ class ChromaService:
             metadata={"description": "Significant price movements and their causes"}
         )
 
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a query text, reusing the cached vector for repeat queries.
+        All collections share one embedding function, so the vector can be
+        passed to any collection as query_embeddings.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Embedding vector
+        """
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        with self._query_embeddings_lock:
+            embedding = self._query_embeddings.get(key)
+            if embedding is not None:
+                self._query_embeddings.move_to_end(key)
+                return embedding
+
+        embedding = self.embedding_function([text])[0]
+
+        with self._query_embeddings_lock:
+            self._query_embeddings[key] = embedding
+            while len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        return embedding
+
     def add_market_event(
         self,
         event_id: str,
@@ -96,17 +141,9 @@ class ChromaService:
             True if successful
         """
         try:
-            # Combine title and description for embedding
-            document = f"{title}. {description}"
-
-            # Prepare metadata
-            meta = {
-                "title": title,
-                "date": date,
-                "event_type": event_type,
-                "affected_symbols": ",".join(affected_symbols or []),
-                **(metadata or {})
-            }
+            document, meta = self.format_market_event(
+                title, description, date, event_type, affected_symbols, metadata
+            )
 
             self.collections["market_events"].add(
                 documents=[document],
@@ -146,18 +183,9 @@ class ChromaService:
             True if successful
         """
         try:
-            # Combine title and content for embedding
-            document = f"{title}. {content}"
-
-            # Prepare metadata
-            meta = {
-                "title": title,
-                "published_date": published_date,
-                "source": source,
-                "symbols": ",".join(symbols or []),
-                "sentiment": sentiment or "neutral",
-                **(metadata or {})
-            }
+            document, meta = self.format_news_article(
+                title, content, published_date, source, symbols, sentiment, metadata
+            )
 
             self.collections["news_archive"].add(
                 documents=[document],
@@ -195,17 +223,9 @@ class ChromaService:
             True if successful
         """
         try:
-            # Combine all text fields for embedding
-            document = f"{company_name} ({symbol}). {description}. Sector: {sector}. Industry: {industry}."
-
-            # Prepare metadata
-            meta = {
-                "symbol": symbol,
-                "company_name": company_name,
-                "sector": sector,
-                "industry": industry,
-                **(metadata or {})
-            }
+            document, meta = self.format_company_info(
+                symbol, company_name, description, sector, industry, metadata
+            )
 
             self.collections["company_info"].add(
                 documents=[document],
@@ -243,19 +263,9 @@ class ChromaService:
             True if successful
         """
         try:
-            # Create document for embedding
-            document = f"{symbol} moved {price_change_pct:+.2f}% on {date}. Reason: {reason}."
-            if context:
-                document += f" Context: {context}"
-
-            # Prepare metadata
-            meta = {
-                "symbol": symbol,
-                "date": date,
-                "price_change_pct": price_change_pct,
-                "reason": reason,
-                **(metadata or {})
-            }
+            document, meta = self.format_price_movement(
+                symbol, date, price_change_pct, reason, context, metadata
+            )
 
             self.collections["price_movements"].add(
                 documents=[document],
@@ -267,6 +277,130 @@ class ChromaService:
             print(f"Error adding price movement: {e}")
             return False
 
+    @staticmethod
+    def format_market_event(
+        title: str,
+        description: str,
+        date: str,
+        event_type: str,
+        affected_symbols: List[str] = None,
+        metadata: Dict[str, Any] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the document text and metadata for a market event"""
+        # Combine title and description for embedding
+        document = f"{title}. {description}"
+
+        # Prepare metadata
+        meta = {
+            "title": title,
+            "date": date,
+            "event_type": event_type,
+            "affected_symbols": ",".join(affected_symbols or []),
+            **(metadata or {})
+        }
+        return document, meta
+
+    @staticmethod
+    def format_news_article(
+        title: str,
+        content: str,
+        published_date: str,
+        source: str,
+        symbols: List[str] = None,
+        sentiment: str = None,
+        metadata: Dict[str, Any] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the document text and metadata for a news article"""
+        # Combine title and content for embedding
+        document = f"{title}. {content}"
+
+        # Prepare metadata
+        meta = {
+            "title": title,
+            "published_date": published_date,
+            "source": source,
+            "symbols": ",".join(symbols or []),
+            "sentiment": sentiment or "neutral",
+            **(metadata or {})
+        }
+        return document, meta
+
+    @staticmethod
+    def format_company_info(
+        symbol: str,
+        company_name: str,
+        description: str,
+        sector: str,
+        industry: str,
+        metadata: Dict[str, Any] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the document text and metadata for company information"""
+        # Combine all text fields for embedding
+        document = f"{company_name} ({symbol}). {description}. Sector: {sector}. Industry: {industry}."
+
+        # Prepare metadata
+        meta = {
+            "symbol": symbol,
+            "company_name": company_name,
+            "sector": sector,
+            "industry": industry,
+            **(metadata or {})
+        }
+        return document, meta
+
+    @staticmethod
+    def format_price_movement(
+        symbol: str,
+        date: str,
+        price_change_pct: float,
+        reason: str,
+        context: str = None,
+        metadata: Dict[str, Any] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the document text and metadata for a price movement"""
+        # Create document for embedding
+        document = f"{symbol} moved {price_change_pct:+.2f}% on {date}. Reason: {reason}."
+        if context:
+            document += f" Context: {context}"
+
+        # Prepare metadata
+        meta = {
+            "symbol": symbol,
+            "date": date,
+            "price_change_pct": price_change_pct,
+            "reason": reason,
+            **(metadata or {})
+        }
+        return document, meta
+
+    def add_batch(
+        self,
+        collection_name: str,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ):
+        """
+        Add many documents to a collection with batched embedding and insert calls.
+
+        Args:
+            collection_name: Target collection
+            ids: Document identifiers
+            documents: Document texts
+            metadatas: Metadata for each document
+        """
+        collection = self.collections[collection_name]
+        batch_size = min(MAX_ADD_BATCH_SIZE, getattr(self.client, "max_batch_size", MAX_ADD_BATCH_SIZE))
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            batch_documents = documents[start:end]
+            collection.add(
+                ids=ids[start:end],
+                documents=batch_documents,
+                metadatas=metadatas[start:end],
+                embeddings=self.embedding_function(batch_documents)
+            )
+
     def search_market_events(
         self,
         query: str,
@@ -478,7 +612,7 @@ class ChromaService:
         """Get count of items in each collection"""
         return {
             name: collection.count()
-            for name, collection in self.collections.items()
+            for name, collection in self.collection_items
         }
 
     def persist(self):
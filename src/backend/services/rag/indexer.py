@@ -0,0 +1,97 @@
+# backend/services/rag/indexer.py
+"""
+Batched indexing for the RAG collections.
+Index requests are buffered per collection and written with one embedding
+call and one collection.add per flush instead of one insert per document.
+"""
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ChromaBatchIndexer:
+    """Buffers documents per collection and flushes them in bulk"""
+
+    def __init__(
+        self,
+        chroma: Any,
+        executor: Optional[Executor] = None,
+        batch_size: int = 512,
+        flush_interval: float = 0.25
+    ):
+        """
+        Initialize the indexer.
+
+        Args:
+            chroma: ChromaService providing add_batch
+            executor: Executor the blocking inserts run on (default loop executor if None)
+            batch_size: Buffered documents that trigger an immediate flush
+            flush_interval: Seconds a partial batch waits before being flushed
+        """
+        self.chroma = chroma
+        self.executor = executor
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffers: Dict[str, List[Tuple[str, str, Dict[str, Any]]]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def enqueue(self, collection_name: str, doc_id: str, document: str, metadata: Dict[str, Any]) -> str:
+        """
+        Buffer a document for indexing.
+
+        Args:
+            collection_name: Target collection
+            doc_id: Document identifier
+            document: Document text
+            metadata: Document metadata
+
+        Returns:
+            The document id, usable as a job id
+        """
+        buffer = self._buffers.setdefault(collection_name, [])
+        buffer.append((doc_id, document, metadata))
+
+        if len(buffer) >= self.batch_size:
+            self._start_flush(collection_name)
+        elif self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.flush_interval, self._flush_all)
+        return doc_id
+
+    def _flush_all(self):
+        """Flush every collection with buffered documents"""
+        self._flush_handle = None
+        for collection_name in list(self._buffers):
+            self._start_flush(collection_name)
+
+    def _start_flush(self, collection_name: str):
+        """Hand a collection's buffer to a background insert task"""
+        entries = self._buffers.pop(collection_name, None)
+        if not entries:
+            return
+        task = asyncio.ensure_future(self._write(collection_name, entries))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _write(self, collection_name: str, entries: List[Tuple[str, str, Dict[str, Any]]]):
+        """Insert a batch of buffered documents"""
+        ids, documents, metadatas = (list(column) for column in zip(*entries))
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                self.executor, self.chroma.add_batch, collection_name, ids, documents, metadatas
+            )
+        except Exception as e:
+            logger.error("Error indexing %d documents into %s: %s", len(ids), collection_name, e)
+
+    async def flush(self):
+        """Write all buffered documents and wait for in-flight inserts"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_all()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
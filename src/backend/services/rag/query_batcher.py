@@ -0,0 +1,107 @@
+# backend/services/rag/query_batcher.py
+"""
+Micro-batching for ChromaDB queries.
+Concurrent searches against the same collection are coalesced into a single
+multi-embedding collection.query call, amortizing HNSW setup across callers.
+"""
+import asyncio
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class ChromaQueryBatcher:
+    """Coalesces concurrent collection queries into batched Chroma calls"""
+
+    def __init__(
+        self,
+        collections: Dict[str, Any],
+        executor: Optional[Executor] = None,
+        max_batch_size: int = 64,
+        max_delay: float = 0.005
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            collections: Collection name -> Chroma collection mapping
+            executor: Executor the blocking Chroma queries run on (default loop executor if None)
+            max_batch_size: Pending queries that trigger an immediate flush
+            max_delay: Seconds to wait for more queries before flushing
+        """
+        self.collections = collections
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: Dict[str, List[Tuple[List[float], int, asyncio.Future]]] = {}
+        self._pending_count = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def query(self, collection_name: str, embedding: List[float], n_results: int) -> List[Tuple[float, str]]:
+        """
+        Queue a query and wait for its batch to run.
+
+        Args:
+            collection_name: Name of the collection to search
+            embedding: Query embedding
+            n_results: Number of documents to return
+
+        Returns:
+            (distance, document) pairs, nearest first
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(collection_name, []).append((embedding, n_results, future))
+        self._pending_count += 1
+
+        if self._pending_count >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Dispatch one batched query per collection for everything pending"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, {}
+        self._pending_count = 0
+        for collection_name, entries in pending.items():
+            # Keep a strong reference: the loop only holds tasks weakly
+            task = asyncio.ensure_future(self._run_batch(collection_name, entries))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, collection_name: str, entries: List[Tuple[List[float], int, asyncio.Future]]):
+        """Run a batched query and resolve each caller's future with its own slice"""
+        n_results = max(k for _, k, _ in entries)
+        try:
+            collection = self.collections[collection_name]
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                self.executor,
+                partial(
+                    collection.query,
+                    query_embeddings=[embedding for embedding, _, _ in entries],
+                    n_results=n_results,
+                    include=["documents", "distances"]
+                )
+            )
+        except Exception as e:
+            for _, _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        documents = results["documents"] or []
+        distances = results.get("distances") or []
+        for i, (_, k, future) in enumerate(entries):
+            if future.done():
+                continue
+            docs = documents[i][:k] if i < len(documents) else []
+            dists = distances[i] if i < len(distances) else [float("inf")] * len(docs)
+            future.set_result(list(zip(dists, docs)))
@@ -130,13 +130,13 @@ class RAGQueryEngine:
         query_date = self.extract_date(query_text)
 
         # Route to appropriate handler
-        if intent == QueryIntent.PRICE_MOVEMENT and symbol:
+        if intent is QueryIntent.PRICE_MOVEMENT and symbol:
             return await self._handle_price_movement(symbol, query_date, n_results)
-        elif intent == QueryIntent.MARKET_EVENT:
+        elif intent is QueryIntent.MARKET_EVENT:
             return await self._handle_market_event(query_text, n_results)
-        elif intent == QueryIntent.COMPANY_INFO:
+        elif intent is QueryIntent.COMPANY_INFO:
             return await self._handle_company_info(query_text, n_results)
-        elif intent == QueryIntent.NEWS_SEARCH:
+        elif intent is QueryIntent.NEWS_SEARCH:
             return await self._handle_news_search(query_text, symbol, n_results)
         else:
             return await self._handle_general_query(query_text, n_results)
@@ -0,0 +1,119 @@
+"""
+Redis cache-aside layer for hot DAO reads shared across worker processes.
+Values are stored as JSON envelopes with their own expiry so readers can
+refresh a key probabilistically before it expires instead of stampeding
+the database the moment it does. Redis errors degrade to calling the loader.
+"""
+import os
+import random
+import time
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Key templates (bump the version prefix when the cached shape changes)
+GOALS_BY_USER_KEY = "v1:goals:user:{user_id}"
+USER_BY_ID_KEY = "v2:user:id:{user_id}"
+USER_ID_BY_USERNAME_KEY = "v1:user:username:{username}"
+USER_ID_BY_EMAIL_KEY = "v1:user:email:{email}"
+
+# Fraction of the TTL after which readers may start refreshing early
+EARLY_REFRESH_FRACTION = 0.8
+
+# Seconds to skip Redis after a connection error
+RETRY_AFTER = 30.0
+
+
+class RedisCache:
+    """Cache-aside helper over a shared Redis instance."""
+
+    def __init__(self, redis_url: str = None):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_url: Redis connection URL (default from env)
+        """
+        self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://localhost:6379")
+        self.redis: Optional[aioredis.Redis] = None
+        self._disabled_until = 0.0
+
+    def _client(self) -> Optional[aioredis.Redis]:
+        """Return the client, or None while backing off after an error."""
+        if time.monotonic() < self._disabled_until:
+            return None
+        if self.redis is None:
+            self.redis = aioredis.from_url(self.redis_url, socket_connect_timeout=0.25)
+        return self.redis
+
+    def _disable(self, error: Exception):
+        """Back off from Redis for a while after an error."""
+        self._disabled_until = time.monotonic() + RETRY_AFTER
+        logger.warning("Redis cache unavailable, bypassing for %.0fs: %s", RETRY_AFTER, error)
+
+    async def get_or_set(self, key: str, ttl: float, build: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, building and storing it on a miss.
+
+        Args:
+            key: Redis key
+            ttl: Seconds the built value stays valid
+            build: Coroutine factory producing a JSON-serializable value
+
+        Returns:
+            Cached or freshly built value
+        """
+        client = self._client()
+        if client is None:
+            return await build()
+
+        try:
+            raw = await client.get(key)
+        except (RedisError, OSError) as e:
+            self._disable(e)
+            return await build()
+
+        if raw is not None:
+            envelope = orjson.loads(raw)
+            now = time.time()
+            refresh_at, expires_at = envelope["refresh_at"], envelope["expires_at"]
+            # Refresh probability rises from 0 at refresh_at to 1 at expiry
+            if now < refresh_at or random.random() >= (now - refresh_at) / max(expires_at - refresh_at, 1e-9):
+                return envelope["value"]
+
+        value = await build()
+        now = time.time()
+        envelope = {
+            "value": value,
+            "refresh_at": now + ttl * EARLY_REFRESH_FRACTION,
+            "expires_at": now + ttl,
+        }
+        try:
+            await client.set(key, orjson.dumps(envelope), px=int(ttl * 1000))
+        except (RedisError, OSError) as e:
+            self._disable(e)
+        return value
+
+    async def invalidate(self, *keys: str):
+        """Delete keys after a write; errors are logged and ignored."""
+        client = self._client()
+        if client is None or not keys:
+            return
+        try:
+            await client.delete(*keys)
+        except (RedisError, OSError) as e:
+            self._disable(e)
+
+    async def close(self):
+        """Close the Redis connection pool."""
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+
+
+redis_cache = RedisCache()
@@ -0,0 +1,82 @@
+"""
+In-process TTL cache for read-mostly API responses.
+Stores built response objects (not serialized bytes) and coalesces
+concurrent misses for the same key behind a per-key lock.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class ResponseCache:
+    """LRU cache with per-entry TTL for idempotent endpoint results."""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the least recently used
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    def _get_fresh(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value) for a non-expired entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any, ttl: float):
+        """Insert a value and evict the oldest entries beyond maxsize."""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            evicted, _ = self._entries.popitem(last=False)
+            self._locks.pop(evicted, None)
+
+    async def get_or_set(self, key: Hashable, ttl: float, build: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, building it on a miss.
+
+        Args:
+            key: Hashable cache key (typically the endpoint name plus its parameters)
+            ttl: Seconds the built value stays valid
+            build: Coroutine factory producing the response object
+
+        Returns:
+            Cached or freshly built response object
+        """
+        hit, value = self._get_fresh(key)
+        if hit:
+            return value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have filled the entry while we waited
+            hit, value = self._get_fresh(key)
+            if hit:
+                return value
+            value = await build()
+            self._store(key, value, ttl)
+            return value
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop all entries."""
+        self._entries.clear()
+        self._locks.clear()
+
+
+response_cache = ResponseCache()
@@ -3,7 +3,7 @@ Voice Command Security Service for APEX.
 Implements trade confirmation, rate limiting, and voice command validation.
 """
 import time
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
 from enum import Enum
@@ -21,6 +21,16 @@ class CommandType(Enum):
     CANCEL_ORDER = "cancel_order"
 
 
+# Command values are the lowercased member names, so this gives a
+# case-insensitive name lookup without exception handling
+_COMMAND_TYPE_LOOKUP: Dict[str, CommandType] = {cmd.value: cmd for cmd in CommandType}
+
+
+def parse_command_type(command_type: str) -> Optional[CommandType]:
+    """Resolve a command type name to its CommandType, or None if unknown"""
+    return _COMMAND_TYPE_LOOKUP.get(command_type.lower())
+
+
 class VoiceCommandTracker:
     """
     Tracks voice commands per user for rate limiting and confirmation.
@@ -30,8 +40,8 @@ class VoiceCommandTracker:
     def __init__(self):
         # {user_id: {command_id: {timestamp, command_type, amount, symbol, confirmed}}}
         self.pending_commands: Dict[str, Dict[str, dict]] = {}
-        # {user_id: [timestamp1, timestamp2, ...]} for rate limiting
-        self.command_timestamps: Dict[str, List[float]] = {}
+        # {user_id: (tokens, last_refill_monotonic)} token buckets for rate limiting
+        self.rate_buckets: Dict[str, Tuple[float, float]] = {}
         self.RATE_LIMIT_WINDOW = 60  # seconds
         self.MAX_COMMANDS_PER_WINDOW = 5  # 5 commands per minute
         self.CONFIRMATION_TIMEOUT = 30  # seconds to confirm command
@@ -40,29 +50,26 @@ class VoiceCommandTracker:
         """
         Check if user exceeds rate limit (5 commands per minute).
         
+        Uses a token bucket holding MAX_COMMANDS_PER_WINDOW tokens that refills
+        continuously over RATE_LIMIT_WINDOW, so each check is O(1).
+        
         Returns:
             (is_allowed: bool, error_message: Optional[str])
         """
         user_id_str = str(user_id)
-        now = time.time()
-        
-        # Initialize tracking for new users
-        if user_id_str not in self.command_timestamps:
-            self.command_timestamps[user_id_str] = []
+        now = time.monotonic()
+        capacity = self.MAX_COMMANDS_PER_WINDOW
         
-        # Remove old timestamps outside the window
-        self.command_timestamps[user_id_str] = [
-            ts for ts in self.command_timestamps[user_id_str]
-            if now - ts < self.RATE_LIMIT_WINDOW
-        ]
+        tokens, last_refill = self.rate_buckets.get(user_id_str, (capacity, now))
+        tokens = min(capacity, tokens + (now - last_refill) * capacity / self.RATE_LIMIT_WINDOW)
         
         # Check if limit exceeded
-        command_count = len(self.command_timestamps[user_id_str])
-        if command_count >= self.MAX_COMMANDS_PER_WINDOW:
-            return False, f"Rate limit exceeded: {command_count}/{self.MAX_COMMANDS_PER_WINDOW} commands in last minute"
+        if tokens < 1:
+            self.rate_buckets[user_id_str] = (tokens, now)
+            return False, f"Rate limit exceeded: {capacity} commands per minute"
         
         # Record this command
-        self.command_timestamps[user_id_str].append(now)
+        self.rate_buckets[user_id_str] = (tokens - 1, now)
         
         return True, None
     
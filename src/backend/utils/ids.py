@@ -0,0 +1,17 @@
+"""
+Process-unique, time-ordered document identifiers.
+IDs combine the process start time, the PID and a monotonic counter, so
+concurrent requests never collide and IDs sort in creation order.
+"""
+
+import itertools
+import os
+import time
+
+_PREFIX = f"{int(time.time()):x}_{os.getpid():x}_"
+_COUNTER = itertools.count()
+
+
+def generate_id(kind: str) -> str:
+    """Return a new identifier such as 'event_6720f1a3_1f2c_00000000'"""
+    return f"{kind}_{_PREFIX}{next(_COUNTER):08x}"
@@ -0,0 +1,47 @@
+"""
+Logging helpers for hot error paths.
+Full tracebacks are rate limited with a token bucket so an error storm
+(e.g. the vector store being down) logs one-line summaries instead of
+formatting every stack trace on the event loop.
+"""
+
+import logging
+import threading
+import time
+
+# Full tracebacks allowed per second, and how many may burst at once
+TRACEBACK_RATE = 1.0
+TRACEBACK_BURST = 5
+
+
+class TracebackBudget:
+    """Token bucket deciding when an error may log its full traceback"""
+
+    def __init__(self, rate: float = TRACEBACK_RATE, capacity: int = TRACEBACK_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self) -> bool:
+        """Take one token if available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+_traceback_budget = TracebackBudget()
+
+
+def log_error(logger: logging.Logger, message: str, error: BaseException):
+    """Log an error, including its traceback only while the budget allows"""
+    if _traceback_budget.consume():
+        logger.error("%s: %s", message, error, exc_info=error)
+    else:
+        logger.error("%s: %s", message, error)
@@ -0,0 +1,18 @@
+"""
+Fallback encoder for WebSocket frames.
+orjson and msgpack call this for values they cannot encode themselves;
+numpy scalars and arrays become native numbers and lists instead of strings.
+"""
+
+from typing import Any
+
+import numpy as np
+
+
+def wire_default(value: Any) -> Any:
+    """Return an encodable stand-in for value (numbers stay numbers)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
@@ -0,0 +1,24 @@
+"""
+Cheap ISO-8601 timestamps for hot messaging paths.
+Reuses the last formatted string while the monotonic clock has not advanced
+past the cache resolution, so bursts of broadcasts share one datetime.
+"""
+
+import time
+from datetime import datetime
+
+# Seconds a formatted timestamp is reused for
+NOW_ISO_RESOLUTION = 0.001
+
+_last_tick = float("-inf")
+_last_iso = ""
+
+
+def now_iso() -> str:
+    """Return datetime.now().isoformat(), cached at millisecond resolution"""
+    global _last_tick, _last_iso
+    tick = time.monotonic()
+    if tick - _last_tick >= NOW_ISO_RESOLUTION:
+        _last_tick = tick
+        _last_iso = datetime.now().isoformat()
+    return _last_iso
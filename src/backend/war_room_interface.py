@@ -5,11 +5,12 @@ This is the KEY differentiator: Users can see and participate in agent debates.
 """
 
 import asyncio
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, asdict
 from collections import deque
-import json
+from itertools import islice
+import orjson
 
 
 @dataclass
@@ -50,6 +51,10 @@ class WarRoomInterface:
         self.messages: deque = deque(maxlen=max_messages)
         self.message_counter = 0
 
+        # Secondary indexes over self.messages, maintained on append/evict
+        self._messages_by_agent: Dict[str, deque] = {}
+        self._critical_messages: deque = deque()
+
         # Debate threading
         self.active_threads: Dict[str, List[str]] = {}  # thread_id -> [message_ids]
         self.thread_counter = 0
@@ -119,8 +124,7 @@ class WarRoomInterface:
             metadata=data.get("metadata")
         )
 
-        self.messages.append(msg)
-        self.message_counter += 1
+        self._append_message(msg)
 
         # Check if this is a critical debate moment (good time for user input)
         if self._is_decision_point(msg):
@@ -145,12 +149,38 @@ class WarRoomInterface:
             metadata={"action": data.get("action")}
         )
 
-        self.messages.append(msg)
-        self.message_counter += 1
+        self._append_message(msg)
 
         # Pause agents to process user input
         await self.agent_network.pause_agents("User interjection")
 
+    def _append_message(self, msg: AgentMessage):
+        """Store a message and keep the per-agent and critical indexes in sync"""
+        if len(self.messages) == self.messages.maxlen:
+            # The oldest message is about to be evicted; it is also the
+            # oldest entry in each index that holds it
+            evicted = self.messages[0]
+            self._messages_by_agent[evicted.from_agent].popleft()
+            if evicted.importance in ("critical", "high"):
+                self._critical_messages.popleft()
+
+        self.messages.append(msg)
+        self.message_counter += 1
+
+        agent_messages = self._messages_by_agent.get(msg.from_agent)
+        if agent_messages is None:
+            agent_messages = self._messages_by_agent[msg.from_agent] = deque()
+        agent_messages.append(msg)
+        if msg.importance in ("critical", "high"):
+            self._critical_messages.append(msg)
+
+    @staticmethod
+    def _tail(messages: deque, limit: int) -> List[AgentMessage]:
+        """Last `limit` items of a deque in chronological order, in O(limit)"""
+        tail = list(islice(reversed(messages), limit))
+        tail.reverse()
+        return tail
+
     def _classify_importance(self, message: str) -> str:
         """Classify message importance based on content"""
         message_lower = message.lower()
@@ -181,8 +211,7 @@ class WarRoomInterface:
             message_type="system",
             importance=importance
         )
-        self.messages.append(msg)
-        self.message_counter += 1
+        self._append_message(msg)
 
     # ========================================
     # PUBLIC API FOR UI
@@ -190,18 +219,18 @@ class WarRoomInterface:
 
     def get_recent_messages(self, limit: int = 50) -> List[Dict]:
         """Get recent messages for UI display"""
-        messages = list(self.messages)[-limit:]
-        return [msg.to_dict() for msg in messages]
+        return [msg.to_dict() for msg in self._tail(self.messages, limit)]
 
     def get_messages_by_agent(self, agent_name: str, limit: int = 50) -> List[Dict]:
         """Get messages from specific agent"""
-        filtered = [msg for msg in self.messages if msg.from_agent == agent_name]
-        return [msg.to_dict() for msg in filtered[-limit:]]
+        agent_messages = self._messages_by_agent.get(agent_name)
+        if not agent_messages:
+            return []
+        return [msg.to_dict() for msg in self._tail(agent_messages, limit)]
 
     def get_critical_messages(self, limit: int = 20) -> List[Dict]:
         """Get high-priority messages"""
-        critical = [msg for msg in self.messages if msg.importance in ["critical", "high"]]
-        return [msg.to_dict() for msg in critical[-limit:]]
+        return [msg.to_dict() for msg in self._tail(self._critical_messages, limit)]
 
     def search_messages(self, query: str, limit: int = 50) -> List[Dict]:
         """Search messages by content"""
@@ -310,11 +339,12 @@ class WarRoomInterface:
         
         return threads_summary
 
+    def get_agent_stats(self) -> Dict[str, Dict]:
         """Get statistics on agent activity"""
         stats = {}
 
         for agent_name in self.agent_profiles.keys():
-            agent_messages = [msg for msg in self.messages if msg.from_agent == agent_name]
+            agent_messages = self._messages_by_agent.get(agent_name, ())
             stats[agent_name] = {
                 "total_messages": len(agent_messages),
                 "critical_messages": len([m for m in agent_messages if m.importance == "critical"]),
@@ -325,19 +355,43 @@ class WarRoomInterface:
         return stats
 
     def export_conversation(self, filename: Optional[str] = None) -> str:
-        """Export entire conversation to JSON"""
-        if filename is None:
-            filename = f"war_room_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-
-        export_data = {
+        """
+        Export entire conversation as JSON lines.
+
+        The first line holds export metadata and agent stats; each following
+        line is one message, written as it is serialized so peak memory stays
+        at a single message.
+        """
+        header, messages = self.snapshot_conversation()
+        return self.write_export(header, messages, filename)
+
+    def snapshot_conversation(self) -> Tuple[Dict, List[AgentMessage]]:
+        """
+        Capture the export header and message list.
+
+        Walks the live deques, so call it on the event loop that appends to
+        them; the returned snapshot is then safe to hand to another thread.
+        """
+        messages = list(self.messages)
+        header = {
             "export_timestamp": datetime.now().isoformat(),
-            "total_messages": len(self.messages),
-            "messages": [msg.to_dict() for msg in self.messages],
+            "total_messages": len(messages),
             "agent_stats": self.get_agent_stats()
         }
+        return header, messages
 
-        with open(filename, 'w') as f:
-            json.dump(export_data, f, indent=2)
+    @staticmethod
+    def write_export(header: Dict, messages: List[AgentMessage], filename: Optional[str] = None) -> str:
+        """Write a conversation snapshot as JSON lines; touches no live state, so it can run in a worker thread"""
+        if filename is None:
+            filename = f"war_room_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(header))
+            f.write(b"\n")
+            for msg in messages:
+                f.write(orjson.dumps(msg))
+                f.write(b"\n")
 
         return filename
 
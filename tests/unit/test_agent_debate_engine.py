@@ -0,0 +1,142 @@
+"""
+Unit tests for the Agent Debate Engine.
+Tests confidence-weighted consensus across debate rounds.
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+from services.agent_debate_engine import AgentDebateEngine, AgentStance, DebateRound
+
+
+AGENTS = ["market_agent", "strategy_agent", "risk_agent"]
+
+
+@pytest.fixture
+def engine():
+    """Create a debate engine with an open round."""
+    engine = AgentDebateEngine(agent_names=AGENTS)
+    engine.start_debate("Rebalance into bonds?")
+    return engine
+
+
+class TestConsensus:
+    """Test consensus calculation."""
+
+    def test_no_positions(self):
+        """Test that an empty round has no consensus."""
+        assert DebateRound(1, "topic", AGENTS).calculate_consensus() == (False, 0.0, "no_positions")
+
+    def test_only_abstentions(self):
+        """Test that abstentions carry no weight."""
+        round_obj = DebateRound(1, "topic", AGENTS)
+        round_obj.add_position("risk_agent", AgentStance.ABSTAIN, "pass", 0.9)
+
+        assert round_obj.calculate_consensus() == (False, 0.0, "no_valid_positions")
+
+    def test_weighted_approval(self, engine):
+        """Test that confident agreement reaches consensus."""
+        engine.record_position("market_agent", AgentStance.AGREE, "momentum", 0.9)
+        engine.record_position("strategy_agent", AgentStance.AGREE, "fits plan", 0.8)
+        engine.record_position("risk_agent", AgentStance.NEUTRAL, "acceptable", 0.3)
+
+        reached, level, decision = engine.rounds[-1].calculate_consensus()
+
+        assert reached is True
+        assert level == pytest.approx(1.7 / 2.0)
+        assert decision == "approve"
+
+    def test_rejection_below_threshold(self, engine):
+        """Test a majority below the 66% threshold."""
+        engine.record_position("market_agent", AgentStance.AGREE, "cheap", 0.4)
+        engine.record_position("risk_agent", AgentStance.DISAGREE, "drawdown", 0.6)
+
+        reached, level, decision = engine.rounds[-1].calculate_consensus()
+
+        assert reached is False
+        assert level == pytest.approx(0.6)
+        assert decision == "reject"
+
+    def test_tie(self, engine):
+        """Test equal agree and disagree weight."""
+        engine.record_position("market_agent", AgentStance.AGREE, "up", 0.5)
+        engine.record_position("risk_agent", AgentStance.DISAGREE, "down", 0.5)
+
+        assert engine.rounds[-1].calculate_consensus() == (False, 0.5, "tie")
+
+    def test_repeat_position_replaces_previous(self, engine):
+        """Test that an agent changing its stance replaces its earlier vote."""
+        engine.record_position("risk_agent", AgentStance.DISAGREE, "too risky", 0.9)
+        engine.record_position("risk_agent", AgentStance.AGREE, "hedged now", 0.9)
+
+        reached, level, decision = engine.rounds[-1].calculate_consensus()
+
+        assert (reached, level, decision) == (True, 1.0, "approve")
+        assert engine.rounds[-1].agent_positions["risk_agent"]["stance"] == "agree"
+
+    def test_finalize_debate(self, engine):
+        """Test that finalizing reports the last round's consensus."""
+        engine.record_position("market_agent", AgentStance.DISAGREE, "overvalued", 0.7)
+        engine.record_position("risk_agent", AgentStance.DISAGREE, "volatility", 0.8)
+
+        summary = engine.finalize_debate()
+
+        assert summary["final_decision"] == "reject"
+        assert summary["consensus_reached"] is True
+        assert summary["transcript"][0]["positions"]["risk_agent"]["reasoning"] == "volatility"
+
+    def test_many_agents(self):
+        """Test tallying a larger panel of agents."""
+        round_obj = DebateRound(1, "topic", [f"agent_{i}" for i in range(9)])
+        for i in range(9):
+            stance = AgentStance.AGREE if i < 7 else AgentStance.DISAGREE
+            round_obj.add_position(f"agent_{i}", stance, "", 1.0)
+
+        reached, level, decision = round_obj.calculate_consensus()
+
+        assert (reached, decision) == (True, "approve")
+        assert level == pytest.approx(7 / 9)
+
+    def test_consensus_cached_until_position_changes(self, engine):
+        """Test that repeat checks reuse the result and new positions refresh it."""
+        round_obj = engine.rounds[-1]
+        engine.record_position("market_agent", AgentStance.AGREE, "momentum", 0.9)
+
+        first = round_obj.calculate_consensus()
+        assert round_obj.calculate_consensus() is first
+
+        engine.record_position("risk_agent", AgentStance.DISAGREE, "drawdown", 0.9)
+
+        assert round_obj.calculate_consensus() == (False, 0.5, "tie")
+
+
+class TestExport:
+    """Test transcript export."""
+
+    def test_export_to_json(self, engine):
+        """Test that the exported transcript round-trips through JSON."""
+        import json
+
+        engine.record_position("risk_agent", AgentStance.DISAGREE, "drawdown", 0.6)
+
+        transcript = json.loads(engine.export_to_json())
+
+        assert transcript[0]["topic"] == "Rebalance into bonds?"
+        assert transcript[0]["positions"]["risk_agent"]["stance"] == "disagree"
+
+    def test_export_without_reasoning(self, engine):
+        """Test the lightweight export that drops reasoning text."""
+        import json
+
+        engine.record_position("risk_agent", AgentStance.DISAGREE, "drawdown", 0.6)
+
+        transcript = json.loads(engine.export_to_json(include_reasoning=False))
+
+        assert transcript[0]["positions"]["risk_agent"] == {
+            "stance": "disagree",
+            "confidence": 0.6,
+            "timestamp": engine.rounds[-1].position_times[2],
+        }
@@ -0,0 +1,43 @@
+"""
+Unit tests for rate-limited error logging.
+Tests that tracebacks are only formatted while the budget allows.
+"""
+
+import logging
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+import utils.logger as error_logging
+from utils.logger import TracebackBudget, log_error
+
+
+class TestTracebackBudget:
+    """Test TracebackBudget class."""
+
+    def test_burst_then_exhausted(self):
+        """Test that only the burst capacity is available at once."""
+        budget = TracebackBudget(rate=0.0, capacity=2)
+
+        assert [budget.consume() for _ in range(3)] == [True, True, False]
+
+
+class TestLogError:
+    """Test log_error function."""
+
+    def test_traceback_only_within_budget(self, caplog, monkeypatch):
+        """Test that errors beyond the budget log without exc_info."""
+        monkeypatch.setattr(error_logging, "_traceback_budget", TracebackBudget(rate=0.0, capacity=1))
+        logger = logging.getLogger("test_error_logging")
+
+        with caplog.at_level(logging.ERROR, logger="test_error_logging"):
+            for _ in range(2):
+                try:
+                    raise RuntimeError("chroma down")
+                except RuntimeError as e:
+                    log_error(logger, "RAG search error", e)
+
+        assert [r.getMessage() for r in caplog.records] == ["RAG search error: chroma down"] * 2
+        assert caplog.records[0].exc_info is not None
+        assert caplog.records[1].exc_info is None
@@ -0,0 +1,192 @@
+"""
+Unit tests for Goal Planner.
+Tests compound interest projections and Monte Carlo simulations.
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+from services.goal_planner import GoalPlanner
+
+
+@pytest.fixture
+def planner():
+    """Create a GoalPlanner instance for testing."""
+    return GoalPlanner()
+
+
+class TestProjections:
+    """Test deterministic compound interest projections."""
+
+    def test_scenarios_match_compound_interest(self, planner):
+        """Test that each vectorized scenario equals its scalar projection."""
+        scenarios = planner.generate_scenarios(10000, 500, 10)
+
+        for name, rate in (("conservative", 0.05), ("moderate", 0.07), ("aggressive", 0.10)):
+            assert scenarios[name] == planner.calculate_compound_interest(10000, 500, rate, 10)
+
+    def test_required_contribution_reaches_target(self, planner):
+        """Test that the required contribution projects back to the target."""
+        required = planner.calculate_required_monthly_contribution(100000, 10000, 0.07, 10)
+        projected = planner.calculate_compound_interest(10000, required, 0.07, 10)["future_value"]
+
+        assert projected == pytest.approx(100000, abs=1.0)
+        assert planner.calculate_required_monthly_contribution(12000, 0, 0.0, 1) == 1000.0
+
+    def test_required_contributions_broadcast(self, planner):
+        """Test that the grid solver matches the scalar solver element by element."""
+        targets = [[50000], [100000], [5000]]
+        returns = [0.0, 0.05, 0.07]
+        years = [5, 10, 20]
+
+        grid = planner.calculate_required_monthly_contributions(targets, 10000, returns, years)
+
+        assert grid.shape == (3, 3)
+        for i, (target,) in enumerate(targets):
+            for j, (rate, horizon) in enumerate(zip(returns, years)):
+                assert grid[i, j] == planner.calculate_required_monthly_contribution(target, 10000, rate, horizon)
+        assert (grid[2] == 0).all()
+
+    def test_compound_interest_known_values(self, planner):
+        """Test projections against closed-form reference values."""
+        result = planner.calculate_compound_interest(1000, 100, 0.07, 10)
+
+        assert result["future_value"] == pytest.approx(1000 * (1 + 0.07 / 12) ** 120 + 100 * ((1 + 0.07 / 12) ** 120 - 1) / (0.07 / 12), abs=0.01)
+        assert planner.calculate_compound_interest(1000, 100, 0.0, 10)["future_value"] == 13000.0
+        assert planner.calculate_inflation_adjusted_target(1000, 10) == round(1000 * 1.03 ** 10, 2)
+
+
+class TestMonteCarlo:
+    """Test Monte Carlo simulations."""
+
+    def test_zero_volatility_matches_compounding(self, planner, monkeypatch):
+        """Test that without volatility every path equals monthly compounding, without drawing."""
+        import numpy as np
+
+        def no_rng():
+            raise AssertionError("zero volatility should not draw random returns")
+
+        monkeypatch.setattr(np.random, "default_rng", no_rng)
+        result = planner.monte_carlo_simulation(
+            10000, 500, 10, expected_return=0.06, volatility=0.0, num_simulations=50
+        )
+        expected = planner.calculate_compound_interest(10000, 500, 0.06, 10)["future_value"]
+
+        for key in ("p10", "p25", "p50", "p75", "p90", "mean"):
+            assert result[key] == pytest.approx(expected, abs=0.01)
+        assert result["std"] == pytest.approx(0.0, abs=0.01)
+
+    def test_percentiles_are_ordered(self, planner):
+        """Test that percentile outcomes increase from p10 to p90."""
+        result = planner.monte_carlo_simulation(10000, 500, 10, num_simulations=2000)
+
+        assert result["p10"] <= result["p25"] <= result["p50"] <= result["p75"] <= result["p90"]
+        assert result["std"] > 0
+
+    def test_antithetic_paths_mirror_shocks(self, planner, monkeypatch):
+        """Test that antithetic sampling pairs each draw with its negation."""
+        import numpy as np
+        from services import goal_planner as goal_planner_module
+
+        class OnesRng:
+            def standard_normal(self, size, dtype):
+                return np.ones(size, dtype=dtype)
+
+        monkeypatch.setattr(goal_planner_module.np.random, "default_rng", lambda: OnesRng())
+
+        final_values = planner._simulate_final_values(1.0, 0.0, 1, 0.12, 0.12 * 12 ** 0.5, 5)
+
+        up, down = 1.01 + 0.12, 1.01 - 0.12
+        assert final_values == pytest.approx([up ** 12] * 3 + [down ** 12] * 2, rel=1e-6)
+
+    def test_success_probability_bounds(self, planner):
+        """Test success probability for unreachable, certain and uncertain targets."""
+        assert planner.calculate_success_probability(1e12, 1000, 100, 5, num_simulations=500) == 0.0
+        assert planner.calculate_success_probability(1, 1000, 100, 5, num_simulations=500) == 1.0
+
+        probability = planner.calculate_success_probability(
+            planner.calculate_compound_interest(10000, 500, 0.07, 10)["future_value"],
+            10000, 500, 10, num_simulations=2000
+        )
+        assert 0.0 < probability < 1.0
+
+
+class TestMilestones:
+    """Test generate_milestones."""
+
+    def test_milestones_from_leap_day(self, planner, monkeypatch):
+        """Test that milestones starting on Feb 29 land on Feb 28 in non-leap years."""
+        from datetime import date
+        from services import goal_planner as goal_planner_module
+
+        class LeapDay(date):
+            @classmethod
+            def today(cls):
+                return cls(2024, 2, 29)
+
+        monkeypatch.setattr(goal_planner_module, "date", LeapDay)
+
+        milestones = planner.generate_milestones(50000, 5)
+
+        assert [m["target_date"] for m in milestones] == [
+            "2025-02-28", "2026-02-28", "2027-02-28", "2028-02-29", "2029-02-28"
+        ]
+        assert [m["target_amount"] for m in milestones] == [10000, 20000, 30000, 40000, 50000]
+
+
+class TestTimeToGoal:
+    """Test time-to-goal calculations."""
+
+    @staticmethod
+    def months_by_iteration(target, principal, monthly, annual_return):
+        """Reference month-by-month accumulation, capped at 100 years."""
+        value, months = principal, 0
+        while value < target and months < 1200:
+            value = value * (1 + annual_return / 12) + monthly
+            months += 1
+        return round(months / 12, 2)
+
+    @pytest.mark.parametrize("target,principal,monthly,annual_return", [
+        (100000, 10000, 500, 0.07),
+        (1000000, 0, 2500, 0.05),
+        (50000, 1000, 100, 0.0),
+        (50000, 1000, 100, -0.05),
+        (5000, 10000, 100, 0.07),
+    ])
+    def test_matches_monthly_accumulation(self, planner, target, principal, monthly, annual_return):
+        """Test that the closed form agrees with month-by-month accumulation."""
+        assert planner.calculate_time_to_goal(target, principal, monthly, annual_return) == \
+            self.months_by_iteration(target, principal, monthly, annual_return)
+
+
+class TestAnalyzeGoal:
+    """Test the combined goal analysis."""
+
+    def test_analysis_shares_one_simulation(self, planner, monkeypatch):
+        """Test that outcomes and success probability come from a single run."""
+        calls = []
+        simulate = planner._simulate_final_values
+
+        def counting_simulate(*args):
+            calls.append(args)
+            return simulate(*args)
+
+        monkeypatch.setattr(planner, "_simulate_final_values", counting_simulate)
+
+        analysis = planner.analyze_goal({
+            "target_amount": 100000,
+            "initial_investment": 10000,
+            "monthly_contribution": 500,
+            "years_to_goal": 10
+        })
+
+        assert len(calls) == 1
+        assert 0.0 <= analysis["success_probability"] <= 1.0
+        assert analysis["monte_carlo"]["p10"] <= analysis["monte_carlo"]["p90"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,168 @@
+"""
+Unit tests for the historical market data loader.
+Tests the scenario cache round trip and the returns matrix.
+"""
+
+import json
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+pytest.importorskip("yfinance")
+
+from services import historical_data as historical_data_module
+from services.historical_data import HistoricalDataLoader
+
+
+def fake_prices(start: float, days: int = 5) -> pd.DataFrame:
+    """OHLCV frame for one ticker of a grouped yfinance download."""
+    index = pd.date_range("2020-01-01", periods=days, freq="B")
+    close = start * np.cumprod(np.full(days, 1.01))
+    return pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Adj Close": close, "Volume": np.full(days, 1e6)},
+        index=index,
+    )
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    """Loader over a temp cache with downloads served from fake frames."""
+    loader = HistoricalDataLoader(cache_dir=str(tmp_path))
+    loader.symbols = {"SPY": "S&P 500 ETF", "TLT": "20+ Year Treasury Bond ETF", "^VIX": "CBOE Volatility Index"}
+    starts = {"SPY": 100.0, "TLT": 50.0, "^VIX": 20.0}
+    downloads = []
+
+    def download(tickers, **kwargs):
+        downloads.append(tickers)
+        symbols = tickers.split()
+        return pd.concat([fake_prices(starts[s]) for s in symbols], axis=1, keys=symbols)
+
+    monkeypatch.setattr(historical_data_module.yf, "download", download, raising=False)
+    loader.downloads = downloads
+    return loader
+
+
+class TestScenarioCache:
+    """Test the scenario cache format."""
+
+    def test_cache_round_trip(self, loader):
+        """Test that cached arrays read back equal to the downloaded data."""
+        downloaded = loader.load_scenario("2020_covid")
+        cached = loader.load_scenario("2020_covid")
+
+        assert cached["version"] == historical_data_module.CACHE_VERSION
+        assert set(cached["symbols"]) == {"SPY", "TLT", "^VIX"}
+        for symbol, info in downloaded["symbols"].items():
+            np.testing.assert_array_equal(cached["symbols"][symbol]["adj_close"], info["adj_close"])
+            assert list(cached["symbols"][symbol]["dates"]) == list(info["dates"])
+            assert cached["symbols"][symbol]["description"] == info["description"]
+
+    def test_one_download_for_all_symbols(self, loader):
+        """Test that a cache miss fetches every ticker in a single request."""
+        loader.load_scenario("2020_covid")
+        loader.load_scenario("2020_covid", force_refresh=True)
+
+        assert loader.downloads == ["SPY TLT ^VIX", "SPY TLT ^VIX"]
+
+    def test_repeat_loads_served_from_memory(self, loader, tmp_path):
+        """Test that a loaded scenario is not re-read until force_refresh."""
+        first = loader.load_scenario("2020_covid")
+        (tmp_path / "2020_covid.json").unlink()
+
+        assert loader.load_scenario("2020_covid") is first
+        assert loader.load_scenario("2020_covid", force_refresh=True) is not first
+        assert len(loader.downloads) == 2
+
+    def test_metadata_file_has_no_prices(self, loader, tmp_path):
+        """Test that prices live in per-symbol array files, not the JSON."""
+        loader.load_scenario("2020_covid")
+
+        metadata = json.loads((tmp_path / "2020_covid.json").read_text())
+
+        assert metadata["symbols"]["SPY"] == {"description": "S&P 500 ETF"}
+        assert (tmp_path / "2020_covid_SPY.npz").exists()
+
+    def test_legacy_json_cache_still_loads(self, loader, tmp_path):
+        """Test that version 1 caches with inline columns are read as-is."""
+        legacy = {
+            "scenario": loader.scenarios["2008_crisis"],
+            "symbols": {"SPY": {"description": "S&P 500 ETF", "dates": ["2008-01-02", "2008-01-03"], "adj_close": [100.0, 99.0]}},
+        }
+        (tmp_path / "2008_crisis.json").write_text(json.dumps(legacy))
+
+        data = loader.load_scenario("2008_crisis")
+
+        assert data["symbols"]["SPY"]["adj_close"] == [100.0, 99.0]
+
+
+class TestReturnsMatrix:
+    """Test get_returns_matrix."""
+
+    def test_returns_exclude_vix(self, loader):
+        """Test daily returns per symbol with the VIX column dropped."""
+        returns, symbols = loader.get_returns_matrix("2020_covid")
+
+        assert symbols == ["SPY", "TLT"]
+        assert returns.shape == (4, 2)
+        np.testing.assert_allclose(returns, 0.01)
+
+    def test_returns_matrix_reused(self, loader):
+        """Test that the matrix is computed once and shared read-only."""
+        first, _ = loader.get_returns_matrix("2020_covid")
+        second, symbols = loader.get_returns_matrix("2020_covid")
+
+        assert second is first
+        assert not first.flags.writeable
+        symbols.append("XLF")
+        assert loader.get_returns_matrix("2020_covid")[1] == ["SPY", "TLT"]
+
+    def test_symbols_truncated_to_shortest_history(self, loader, tmp_path):
+        """Test that symbols with missing days are aligned to the shortest series."""
+        legacy = {
+            "scenario": loader.scenarios["2008_crisis"],
+            "symbols": {
+                "SPY": {"description": "S&P 500 ETF", "adj_close": [100.0, 110.0, 99.0, 50.0]},
+                "TLT": {"description": "20+ Year Treasury Bond ETF", "adj_close": [50.0, 25.0, 50.0]},
+            },
+        }
+        (tmp_path / "2008_crisis.json").write_text(json.dumps(legacy))
+
+        returns, symbols = loader.get_returns_matrix("2008_crisis")
+
+        assert symbols == ["SPY", "TLT"]
+        np.testing.assert_allclose(returns, [[0.1, -0.5], [-0.1, 1.0]])
+
+
+
+class TestScenarioStats:
+    """Test get_scenario_stats."""
+
+    def test_stats_match_spy_benchmark(self, loader, tmp_path):
+        """Test drawdown, volatility and return against the benchmark frame."""
+        closes = [100.0, 120.0, 90.0, 96.0, 130.0]
+        legacy = {
+            "scenario": loader.scenarios["2008_crisis"],
+            "symbols": {"SPY": {
+                "description": "S&P 500 ETF",
+                "dates": ["2008-01-02", "2008-01-03", "2008-01-04", "2008-01-07", "2008-01-08"],
+                "adj_close": closes,
+            }},
+        }
+        (tmp_path / "2008_crisis.json").write_text(json.dumps(legacy))
+
+        stats = loader.get_scenario_stats("2008_crisis")
+        benchmark = loader.get_spy_benchmark("2008_crisis")
+
+        assert stats["max_drawdown"] == "-25.00%"
+        assert stats["max_drawdown_date"] == "2008-01-04"
+        assert stats["total_return"] == f"{benchmark['Cumulative_Return'].iloc[-1]:.2%}"
+        assert stats["volatility_annualized"] == f"{benchmark['Daily_Return'].dropna().values.std() * np.sqrt(252):.2%}"
+        assert stats["num_trading_days"] == len(closes)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -106,6 +106,20 @@ class TestJSONStorage:
         result = json_storage.delete("nonexistent")
         assert result is False
 
+    def test_version_bumps_on_writes(self, json_storage):
+        """Test that successful writes bump the storage version and misses do not."""
+        assert json_storage.version == 0
+
+        json_storage.create("user_123", {"username": "testuser"})
+        json_storage.update("user_123", {"username": "renamed"})
+        json_storage.delete("user_123")
+        assert json_storage.version == 3
+
+        json_storage.read("user_123")
+        json_storage.update("user_123", {"username": "ghost"})
+        json_storage.delete("user_123")
+        assert json_storage.version == 3
+
     def test_list_all_entities(self, json_storage):
         """Test listing all entity IDs."""
         json_storage.create("user_1", {"username": "user1"})
@@ -119,6 +133,15 @@ class TestJSONStorage:
         assert "user_2" in entity_ids
         assert "user_3" in entity_ids
 
+    def test_read_all_entities(self, json_storage):
+        """Test reading every entity in one call."""
+        json_storage.create("user_1", {"username": "alice"})
+        json_storage.create("user_2", {"username": "bob"})
+
+        results = json_storage.read_all()
+
+        assert sorted(r["username"] for r in results) == ["alice", "bob"]
+
     def test_find_entities(self, json_storage):
         """Test finding entities with a filter function."""
         json_storage.create("user_1", {"username": "alice", "age": 25})
@@ -150,6 +173,70 @@ class TestJSONStorage:
         result = json_storage.find_one(lambda e: e.get("role") == "admin")
         assert result is None
 
+    def test_lookup_by_field(self, json_storage):
+        """Test indexed lookups by field value."""
+        json_storage.create("user_1", {"username": "alice", "age": 25})
+        json_storage.create("user_2", {"username": "bob", "age": 30})
+        json_storage.create("user_3", {"username": "charlie", "age": 25})
+
+        assert json_storage.lookup("age", 25) == ["user_1", "user_3"]
+        assert json_storage.lookup("username", "bob") == ["user_2"]
+        assert json_storage.lookup("username", "dave") == []
+
+    def test_find_eq(self, json_storage):
+        """Test indexed equality finds return entity data."""
+        json_storage.create("user_1", {"username": "alice", "age": 25})
+        json_storage.create("user_2", {"username": "bob", "age": 30})
+        json_storage.create("user_3", {"username": "charlie"})
+
+        assert [r["username"] for r in json_storage.find_eq("age", 25)] == ["alice"]
+        assert [r["username"] for r in json_storage.find_eq("age", None)] == ["charlie"]
+        assert json_storage.find_eq("age", 40) == []
+
+    def test_lookup_follows_writes(self, json_storage):
+        """Test that built indexes track create, update and delete."""
+        json_storage.create("user_1", {"username": "alice"})
+        assert json_storage.lookup("username", "alice") == ["user_1"]
+
+        json_storage.update("user_1", {"username": "alicia"})
+        json_storage.create("user_2", {"username": "alice"})
+        assert json_storage.lookup("username", "alicia") == ["user_1"]
+        assert json_storage.lookup("username", "alice") == ["user_2"]
+
+        json_storage.delete("user_2")
+        assert json_storage.lookup("username", "alice") == []
+
+    def test_lookup_sees_writes_from_other_instances(self, json_storage, temp_storage_dir):
+        """Test that indexes are rebuilt after another process writes the same files."""
+        json_storage.create("user_1", {"username": "alice"})
+        assert json_storage.lookup("username", "bob") == []
+
+        other = JSONStorage("test_users", base_path=temp_storage_dir)
+        other.create("user_2", {"username": "bob"})
+
+        assert json_storage.lookup("username", "bob") == ["user_2"]
+
+    def test_reads_served_from_snapshot(self, json_storage):
+        """Test that reads after the first load do not touch entity files."""
+        json_storage.create("user_1", {"username": "alice"})
+        json_storage.read_all()
+
+        (json_storage.entity_path / "user_1.json").unlink()
+
+        assert json_storage.read("user_1")["username"] == "alice"
+
+    def test_snapshot_reloads_after_external_write(self, json_storage, temp_storage_dir):
+        """Test that another instance's writes invalidate the snapshot."""
+        json_storage.create("user_1", {"username": "alice"})
+        assert json_storage.read("user_1")["username"] == "alice"
+
+        other = JSONStorage("test_users", base_path=temp_storage_dir)
+        other.update("user_1", {"username": "alicia"})
+        other.create("user_2", {"username": "bob"})
+
+        assert json_storage.read("user_1")["username"] == "alicia"
+        assert sorted(json_storage.list_all()) == ["user_1", "user_2"]
+
     def test_backup_creation(self, json_storage):
         """Test that backups are created on updates."""
         json_storage.create("user_1", {"username": "testuser"})
@@ -191,6 +278,18 @@ class TestStorageManager:
         assert isinstance(manager.trades, JSONStorage)
         assert isinstance(manager.goals, JSONStorage)
 
+    def test_warm_loads_snapshots(self, temp_storage_dir):
+        """Test that warming loads each requested collection's snapshot."""
+        import asyncio
+
+        JSONStorage("users", base_path=temp_storage_dir).create("user_1", {"username": "alice"})
+        manager = StorageManager(base_path=temp_storage_dir)
+
+        asyncio.run(manager.warm(("users", "goals")))
+
+        assert list(manager.users._entities) == ["user_1"]
+        assert manager.goals._entities == {}
+
     def test_thread_safety(self, json_storage):
         """Test that concurrent operations are thread-safe."""
         import threading
@@ -0,0 +1,42 @@
+"""
+Unit tests for the server-facing Orchestrator wrapper.
+Tests the agent registry behind /api/agents.
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+pytest.importorskip("openai")
+
+from orchestrator import Orchestrator
+
+
+class FakeMarketAgent:
+    """Stand-in agent; only its class name is reported."""
+
+
+class TestAgentRegistry:
+    """Test agent slot registration."""
+
+    def test_slots_listed_before_agents_attach(self):
+        """Test that every agent slot is reported, uninitialized by default."""
+        orchestrator = Orchestrator()
+
+        assert list(orchestrator.agent_types) == list(Orchestrator.AGENT_SLOTS)
+        assert set(orchestrator.agent_types.values()) == {None}
+
+    def test_attached_agents_report_their_type(self):
+        """Test that agents passed in or registered later report their class name."""
+        orchestrator = Orchestrator(agents={"market_agent": FakeMarketAgent()})
+        orchestrator.register_agent("risk_agent", FakeMarketAgent())
+
+        assert orchestrator.agent_types["market_agent"] == "FakeMarketAgent"
+        assert orchestrator.agent_types["risk_agent"] == "FakeMarketAgent"
+        assert orchestrator.agent_types["strategy_agent"] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,116 @@
+"""
+Unit tests for the Chroma query batcher.
+Tests coalescing of concurrent queries into batched collection calls.
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+pytest.importorskip("chromadb")
+
+from services.rag.query_batcher import ChromaQueryBatcher
+
+
+class FakeCollection:
+    """Collection that records each query call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def query(self, query_embeddings, n_results, include):
+        self.calls.append((len(query_embeddings), n_results))
+        return {
+            "documents": [
+                [f"doc_{embedding[0]}_{i}" for i in range(n_results)]
+                for embedding in query_embeddings
+            ],
+            "distances": [
+                [embedding[0] + i for i in range(n_results)]
+                for embedding in query_embeddings
+            ]
+        }
+
+
+class FailingCollection:
+    """Collection whose queries always fail."""
+
+    def query(self, query_embeddings, n_results, include):
+        raise RuntimeError("index unavailable")
+
+
+class TestChromaQueryBatcher:
+    """Test ChromaQueryBatcher class."""
+
+    def test_concurrent_queries_share_one_call(self):
+        """Test that concurrent queries on a collection are batched together."""
+        collection = FakeCollection()
+        batcher = ChromaQueryBatcher({"news_archive": collection})
+
+        async def run():
+            return await asyncio.gather(
+                batcher.query("news_archive", [1.0], 2),
+                batcher.query("news_archive", [2.0], 3)
+            )
+
+        first, second = asyncio.run(run())
+
+        assert collection.calls == [(2, 3)]
+        assert first == [(1.0, "doc_1.0_0"), (2.0, "doc_1.0_1")]
+        assert second == [(2.0, "doc_2.0_0"), (3.0, "doc_2.0_1"), (4.0, "doc_2.0_2")]
+
+    def test_batches_per_collection(self):
+        """Test that each collection gets its own batched call."""
+        events, news = FakeCollection(), FakeCollection()
+        batcher = ChromaQueryBatcher({"market_events": events, "news_archive": news})
+
+        async def run():
+            await asyncio.gather(
+                batcher.query("market_events", [1.0], 1),
+                batcher.query("news_archive", [1.0], 1)
+            )
+
+        asyncio.run(run())
+
+        assert events.calls == [(1, 1)]
+        assert news.calls == [(1, 1)]
+
+    def test_batch_tasks_held_until_done(self):
+        """Test that in-flight batch tasks are strongly referenced and released when done."""
+        collection = FakeCollection()
+        batcher = ChromaQueryBatcher({"news_archive": collection}, max_batch_size=1)
+
+        async def run():
+            pending = asyncio.ensure_future(batcher.query("news_archive", [1.0], 1))
+            await asyncio.sleep(0)
+            held = len(batcher._tasks)
+            await pending
+            return held
+
+        assert asyncio.run(run()) == 1
+        assert batcher._tasks == set()
+
+    def test_max_batch_size_flushes_immediately(self):
+        """Test that a full batch is dispatched without waiting for the delay."""
+        collection = FakeCollection()
+        batcher = ChromaQueryBatcher({"company_info": collection}, max_batch_size=2, max_delay=10)
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.query("company_info", [float(i)], 1) for i in range(2))),
+                timeout=1
+            )
+
+        asyncio.run(run())
+
+        assert collection.calls == [(2, 1)]
+
+    def test_query_error_propagates(self):
+        """Test that a failed batch raises in every waiting caller."""
+        batcher = ChromaQueryBatcher({"price_movements": FailingCollection()})
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(batcher.query("price_movements", [1.0], 1))
@@ -0,0 +1,74 @@
+"""
+Unit tests for the RAG batch indexer.
+Tests buffering and bulk flushing of index requests.
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+pytest.importorskip("chromadb")
+
+from services.rag.indexer import ChromaBatchIndexer
+
+
+class FakeChroma:
+    """Chroma service that records batched inserts."""
+
+    def __init__(self):
+        self.batches = []
+
+    def add_batch(self, collection_name, ids, documents, metadatas):
+        self.batches.append((collection_name, ids))
+
+
+class TestChromaBatchIndexer:
+    """Test ChromaBatchIndexer class."""
+
+    def test_documents_flushed_together(self):
+        """Test that documents queued within the interval share one insert."""
+        chroma = FakeChroma()
+        indexer = ChromaBatchIndexer(chroma, flush_interval=0.01)
+
+        async def run():
+            for i in range(3):
+                await indexer.enqueue("news_archive", f"article_{i}", f"doc {i}", {})
+            await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+
+        assert chroma.batches == [("news_archive", ["article_0", "article_1", "article_2"])]
+
+    def test_full_batch_flushes_immediately(self):
+        """Test that reaching batch_size starts a flush without waiting."""
+        chroma = FakeChroma()
+        indexer = ChromaBatchIndexer(chroma, batch_size=2, flush_interval=10)
+
+        async def run():
+            await indexer.enqueue("market_events", "event_0", "doc", {})
+            await indexer.enqueue("market_events", "event_1", "doc", {})
+            await asyncio.gather(*indexer._tasks)
+
+        asyncio.run(run())
+
+        assert chroma.batches == [("market_events", ["event_0", "event_1"])]
+
+    def test_flush_drains_every_collection(self):
+        """Test that flush writes all buffered collections."""
+        chroma = FakeChroma()
+        indexer = ChromaBatchIndexer(chroma, flush_interval=10)
+
+        async def run():
+            job_id = await indexer.enqueue("company_info", "company_0", "doc", {})
+            await indexer.enqueue("price_movements", "movement_0", "doc", {})
+            await indexer.flush()
+            return job_id
+
+        assert asyncio.run(run()) == "company_0"
+        assert sorted(chroma.batches) == [
+            ("company_info", ["company_0"]),
+            ("price_movements", ["movement_0"]),
+        ]
@@ -0,0 +1,113 @@
+"""
+Unit tests for the Redis cache-aside layer.
+Tests hits, invalidation, early refresh, and degradation when Redis fails.
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from services import redis_cache as redis_cache_module
+from services.redis_cache import RedisCache
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the async Redis client."""
+
+    def __init__(self, fail: bool = False):
+        self.data = {}
+        self.fail = fail
+
+    async def get(self, key):
+        if self.fail:
+            raise RedisConnectionError("down")
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        if self.fail:
+            raise RedisConnectionError("down")
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def cache():
+    """Create a cache backed by the in-memory fake."""
+    cache = RedisCache("redis://unused")
+    cache.redis = FakeRedis()
+    return cache
+
+
+def counting_build(calls):
+    """Build coroutine factory that records each call."""
+    async def build():
+        calls.append(1)
+        return {"count": len(calls)}
+    return build
+
+
+class TestRedisCache:
+    """Test RedisCache class."""
+
+    def test_hit_skips_build(self, cache):
+        """Test that a second lookup is served from Redis."""
+        calls = []
+
+        async def run():
+            first = await cache.get_or_set("k", 60, counting_build(calls))
+            second = await cache.get_or_set("k", 60, counting_build(calls))
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first == second == {"count": 1}
+        assert len(calls) == 1
+
+    def test_invalidate_forces_rebuild(self, cache):
+        """Test that invalidated keys are rebuilt."""
+        calls = []
+
+        async def run():
+            await cache.get_or_set("k", 60, counting_build(calls))
+            await cache.invalidate("k")
+            return await cache.get_or_set("k", 60, counting_build(calls))
+
+        assert asyncio.run(run()) == {"count": 2}
+
+    def test_early_refresh_near_expiry(self, cache, monkeypatch):
+        """Test that readers past the refresh point rebuild before expiry."""
+        calls = []
+        clock = [1000.0]
+        monkeypatch.setattr(redis_cache_module.time, "time", lambda: clock[0])
+        monkeypatch.setattr(redis_cache_module.random, "random", lambda: 0.5)
+
+        async def run():
+            await cache.get_or_set("k", 100, counting_build(calls))
+            clock[0] = 1085.0
+            early = await cache.get_or_set("k", 100, counting_build(calls))
+            clock[0] = 1180.0
+            refreshed = await cache.get_or_set("k", 100, counting_build(calls))
+            return early, refreshed
+
+        early, refreshed = asyncio.run(run())
+
+        assert early == {"count": 1}
+        assert refreshed == {"count": 2}
+
+    def test_redis_errors_fall_back_to_build(self, cache):
+        """Test that a failing Redis still returns built values and backs off."""
+        cache.redis = FakeRedis(fail=True)
+        calls = []
+
+        result = asyncio.run(cache.get_or_set("k", 60, counting_build(calls)))
+
+        assert result == {"count": 1}
+        assert cache._client() is None
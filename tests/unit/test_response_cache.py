@@ -0,0 +1,95 @@
+"""
+Unit tests for the response cache.
+Tests TTL expiry, LRU eviction, and miss coalescing.
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+from services.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Test ResponseCache class."""
+
+    def test_hit_returns_cached_value(self):
+        """Test that a second lookup does not rebuild the value."""
+        cache = ResponseCache()
+        calls = []
+
+        async def build():
+            calls.append(1)
+            return {"count": len(calls)}
+
+        async def run():
+            first = await cache.get_or_set(("news", "fed"), 30, build)
+            second = await cache.get_or_set(("news", "fed"), 30, build)
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first is second
+        assert len(calls) == 1
+
+    def test_expired_entry_is_rebuilt(self):
+        """Test that entries are rebuilt after their TTL elapses."""
+        cache = ResponseCache()
+        calls = []
+
+        async def build():
+            calls.append(1)
+            return len(calls)
+
+        async def run():
+            await cache.get_or_set("stats", 0, build)
+            return await cache.get_or_set("stats", 0, build)
+
+        assert asyncio.run(run()) == 2
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted at maxsize."""
+        cache = ResponseCache(maxsize=2)
+
+        async def run():
+            for key in ("a", "b"):
+                await cache.get_or_set(key, 30, lambda key=key: asyncio.sleep(0, result=key))
+            await cache.get_or_set("a", 30, lambda: asyncio.sleep(0, result="stale"))
+            await cache.get_or_set("c", 30, lambda: asyncio.sleep(0, result="c"))
+
+        asyncio.run(run())
+
+        assert list(cache._entries) == ["a", "c"]
+
+    def test_concurrent_misses_build_once(self):
+        """Test that concurrent misses for one key share a single build."""
+        cache = ResponseCache()
+        calls = []
+
+        async def build():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        async def run():
+            return await asyncio.gather(*(cache.get_or_set("k", 30, build) for _ in range(5)))
+
+        results = asyncio.run(run())
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+
+    def test_build_error_is_not_cached(self):
+        """Test that a failing build propagates and leaves no entry."""
+        cache = ResponseCache()
+
+        async def build():
+            raise RuntimeError("upstream down")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(cache.get_or_set("k", 30, build))
+
+        assert "k" not in cache._entries
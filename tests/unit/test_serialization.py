@@ -0,0 +1,63 @@
+"""
+Unit tests for WebSocket frame encoding.
+Tests that numpy values broadcast by the War Room decode as numbers.
+"""
+
+import pytest
+import numpy as np
+import orjson
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+from utils.serialization import wire_default
+
+
+@pytest.fixture
+def numpy_payload():
+    """Crash-simulator style progress update built from DataFrame values."""
+    return {
+        "type": "crash_progress",
+        "apex_value": np.float64(101234.5),
+        "buy_hold_value": np.float32(99000.25),
+        "day": np.int64(42),
+        "rebalanced": np.bool_(True),
+        "allocation": np.array([0.6, 0.4]),
+    }
+
+
+class TestWireDefault:
+    """Test wire_default with both broadcast encoders."""
+
+    def assert_native_types(self, decoded):
+        assert decoded["apex_value"] == 101234.5
+        assert isinstance(decoded["apex_value"], float)
+        assert isinstance(decoded["buy_hold_value"], float)
+        assert decoded["day"] == 42 and isinstance(decoded["day"], int)
+        assert decoded["rebalanced"] is True
+        assert decoded["allocation"] == [0.6, 0.4]
+
+    def test_json_frame_keeps_numbers(self, numpy_payload):
+        """Test that numpy values are JSON numbers, not strings."""
+        text = orjson.dumps(numpy_payload, default=wire_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+        self.assert_native_types(orjson.loads(text))
+
+    def test_msgpack_frame_keeps_numbers(self, numpy_payload):
+        """Test that numpy values are msgpack numbers, not strings."""
+        msgpack = pytest.importorskip("msgpack")
+
+        packed = msgpack.packb(numpy_payload, default=wire_default)
+
+        self.assert_native_types(msgpack.unpackb(packed))
+
+    def test_unknown_types_fall_back_to_str(self):
+        """Test that other values keep the previous str() fallback."""
+        from decimal import Decimal
+
+        assert orjson.loads(orjson.dumps({"amount": Decimal("1.10")}, default=wire_default)) == {"amount": "1.10"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
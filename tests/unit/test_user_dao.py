@@ -0,0 +1,114 @@
+"""
+Unit tests for the User DAO.
+Tests the Redis row cache, secret column loading and invalidation on update.
+"""
+
+import pytest
+import orjson
+from pathlib import Path
+from uuid import uuid4
+from datetime import datetime
+
+import sys
+# The DAO package uses relative imports, so import it through the repository root
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+from src.backend.models.user import User
+from src.backend.services.dao.user_dao import UserDAO, _user_row, _user_from_row
+
+SECRET_COLUMNS = (
+    "hashed_password", "two_factor_secret",
+    "encryption_key", "plaid_access_token", "alpaca_api_key", "alpaca_secret_key",
+)
+
+
+@pytest.fixture
+def user():
+    """User with every secret column populated."""
+    return User(
+        id=uuid4(),
+        username="alice",
+        email="alice@example.com",
+        hashed_password="$2b$12$hash",
+        two_factor_enabled=True,
+        two_factor_secret="JBSWY3DPEHPK3PXP",
+        encryption_key="fernet-key",
+        plaid_access_token=b"plaid",
+        alpaca_api_key=b"key",
+        alpaca_secret_key=b"secret",
+        is_active=True,
+        created_at=datetime(2024, 1, 2, 3, 4, 5),
+    )
+
+
+class TestUserRowCache:
+    """Test _user_row and _user_from_row."""
+
+    def test_cached_row_has_no_secrets(self, user):
+        """Test that no secret column is written to Redis."""
+        row = orjson.loads(orjson.dumps(_user_row(user)))
+
+        assert not set(SECRET_COLUMNS) & set(row)
+        assert row["username"] == "alice"
+        assert row["two_factor_enabled"] is True
+
+    def test_rebuilt_user_leaves_secrets_unloaded(self, user):
+        """Test that users rebuilt from Redis must load secrets from Postgres."""
+        cached = _user_from_row(orjson.loads(orjson.dumps(_user_row(user))))
+
+        assert cached.id == user.id
+        assert cached.created_at == user.created_at
+        assert set(SECRET_COLUMNS) <= inspect(cached).unloaded
+
+
+
+class TestSecretColumns:
+    """Test that secrets behave the same on cached and freshly loaded users."""
+
+    def test_user_select_skips_secrets(self):
+        """Test that loading a User never selects a secret column."""
+        sql = str(select(User).compile(dialect=postgresql.dialect()))
+
+        for column in SECRET_COLUMNS:
+            assert f"users.{column}" not in sql
+
+    def test_cached_user_secret_access_raises(self, user):
+        """Test that a user attached from Redis raises instead of lazy-loading secrets."""
+        cached = Session().merge(_user_from_row(orjson.loads(orjson.dumps(_user_row(user)))), load=False)
+
+        for column in SECRET_COLUMNS:
+            with pytest.raises(InvalidRequestError):
+                getattr(cached, column)
+
+
+class TestUpdateInvalidation:
+    """Test Redis invalidation after UserDAO.update."""
+
+    def test_rename_invalidates_new_lookup_keys(self, monkeypatch):
+        """Test that a renamed user's new username and email pointers are dropped."""
+        calls = []
+
+        async def record(user_id=None, username=None, email=None):
+            calls.append((user_id, username, email))
+
+        monkeypatch.setattr(UserDAO, "_invalidate", staticmethod(record))
+        db = MagicMock(execute=AsyncMock(), commit=AsyncMock(), rollback=AsyncMock())
+        db.execute.return_value.scalar_one_or_none.return_value = None
+        user_id = uuid4()
+
+        asyncio.run(UserDAO.update(db, user_id, username="bob", email="bob@example.com"))
+        asyncio.run(UserDAO.update(db, user_id, first_name="Bob"))
+
+        assert calls == [(user_id, "bob", "bob@example.com"), (user_id, None, None)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,65 @@
+"""
+Unit tests for voice command security.
+Tests command type parsing and per-user rate limiting.
+"""
+
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+from services.voice_security import VoiceCommandTracker, CommandType, parse_command_type
+
+
+class TestParseCommandType:
+    """Test command type lookup."""
+
+    def test_case_insensitive(self):
+        """Test that names resolve regardless of case."""
+        assert parse_command_type("BUY") is CommandType.BUY
+        assert parse_command_type("set_goal") is CommandType.SET_GOAL
+
+    def test_unknown(self):
+        """Test that unknown names return None."""
+        assert parse_command_type("short") is None
+
+
+class TestRateLimit:
+    """Test the token bucket rate limit."""
+
+    def test_allows_burst_up_to_limit(self):
+        """Test that five commands pass and the sixth is refused."""
+        tracker = VoiceCommandTracker()
+
+        with patch("services.voice_security.time.monotonic", return_value=100.0):
+            results = [tracker.check_rate_limit("user_1")[0] for _ in range(6)]
+
+        assert results == [True] * 5 + [False]
+
+    def test_users_are_independent(self):
+        """Test that one user's usage does not limit another."""
+        tracker = VoiceCommandTracker()
+
+        with patch("services.voice_security.time.monotonic", return_value=100.0):
+            for _ in range(5):
+                tracker.check_rate_limit("user_1")
+            allowed, error = tracker.check_rate_limit("user_2")
+
+        assert allowed is True
+        assert error is None
+
+    def test_tokens_refill_over_window(self):
+        """Test that a token is restored after a fifth of the window."""
+        tracker = VoiceCommandTracker()
+
+        with patch("services.voice_security.time.monotonic", return_value=100.0):
+            for _ in range(5):
+                tracker.check_rate_limit("user_1")
+        with patch("services.voice_security.time.monotonic", return_value=112.0):
+            assert tracker.check_rate_limit("user_1") == (True, None)
+            allowed, error = tracker.check_rate_limit("user_1")
+
+        assert allowed is False
+        assert "Rate limit exceeded" in error
@@ -0,0 +1,119 @@
+"""
+Unit tests for the War Room interface.
+Tests message indexing by agent and importance.
+"""
+
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src" / "backend"))
+
+from war_room_interface import WarRoomInterface, AgentMessage
+
+
+def make_message(index: int, agent: str, importance: str = "low") -> AgentMessage:
+    """Build a War Room message for tests."""
+    return AgentMessage(
+        id=f"msg_{index}",
+        from_agent=agent,
+        to_agent="All",
+        message=f"message {index}",
+        timestamp="2024-01-01T00:00:00",
+        message_type="debate",
+        importance=importance
+    )
+
+
+@pytest.fixture
+def war_room():
+    """Create a War Room with a small message window."""
+    return WarRoomInterface(AsyncMock(), max_messages=5)
+
+
+class TestWarRoomIndexes:
+    """Test per-agent and critical message indexes."""
+
+    def test_messages_by_agent(self, war_room):
+        """Test filtering messages by sending agent."""
+        for i, agent in enumerate(["Risk Agent", "Market Agent", "Risk Agent"]):
+            war_room._append_message(make_message(i, agent))
+
+        result = war_room.get_messages_by_agent("Risk Agent")
+
+        assert [m["id"] for m in result] == ["msg_0", "msg_2"]
+        assert war_room.get_messages_by_agent("Unknown Agent") == []
+
+    def test_limit_returns_most_recent(self, war_room):
+        """Test that limits keep the newest messages in order."""
+        for i in range(4):
+            war_room._append_message(make_message(i, "Risk Agent", "critical"))
+
+        assert [m["id"] for m in war_room.get_recent_messages(2)] == ["msg_2", "msg_3"]
+        assert [m["id"] for m in war_room.get_critical_messages(3)] == ["msg_1", "msg_2", "msg_3"]
+
+    def test_critical_includes_high_importance(self, war_room):
+        """Test that critical messages include high importance."""
+        war_room._append_message(make_message(0, "Risk Agent", "high"))
+        war_room._append_message(make_message(1, "Risk Agent", "low"))
+        war_room._append_message(make_message(2, "Market Agent", "critical"))
+
+        assert [m["id"] for m in war_room.get_critical_messages()] == ["msg_0", "msg_2"]
+
+    def test_indexes_follow_eviction(self, war_room):
+        """Test that evicted messages disappear from every index."""
+        war_room._append_message(make_message(0, "Risk Agent", "critical"))
+        for i in range(1, 6):
+            war_room._append_message(make_message(i, "Market Agent"))
+
+        assert len(war_room.messages) == 5
+        assert war_room.get_messages_by_agent("Risk Agent") == []
+        assert war_room.get_critical_messages() == []
+        assert len(war_room.get_messages_by_agent("Market Agent")) == 5
+
+    def test_agent_stats(self, war_room):
+        """Test agent statistics use the indexed messages."""
+        war_room._append_message(make_message(0, "Risk Agent", "critical"))
+        war_room._append_message(make_message(1, "Risk Agent", "low"))
+
+        stats = war_room.get_agent_stats()
+
+        assert stats["Risk Agent"]["total_messages"] == 2
+        assert stats["Risk Agent"]["critical_messages"] == 1
+        assert stats["Market Agent"]["total_messages"] == 0
+        assert stats["Market Agent"]["last_message_time"] is None
+
+
+class TestWarRoomExport:
+    """Test conversation export."""
+
+    def test_export_writes_json_lines(self, war_room, tmp_path):
+        """Test that export writes a header line followed by one line per message."""
+        import json
+
+        war_room._append_message(make_message(0, "Risk Agent", "critical"))
+        war_room._append_message(make_message(1, "Market Agent"))
+
+        filename = war_room.export_conversation(str(tmp_path / "export.jsonl"))
+        lines = Path(filename).read_text().splitlines()
+
+        header = json.loads(lines[0])
+        assert header["total_messages"] == 2
+        assert header["agent_stats"]["Risk Agent"]["critical_messages"] == 1
+        assert [json.loads(line)["id"] for line in lines[1:]] == ["msg_0", "msg_1"]
+
+    def test_write_export_uses_only_the_snapshot(self, war_room, tmp_path):
+        """Test that messages appended after the snapshot do not reach the file."""
+        import json
+
+        war_room._append_message(make_message(0, "Risk Agent"))
+        header, messages = war_room.snapshot_conversation()
+        for i in range(1, 8):
+            war_room._append_message(make_message(i, "Risk Agent", "critical"))
+
+        filename = WarRoomInterface.write_export(header, messages, str(tmp_path / "export.jsonl"))
+        lines = Path(filename).read_text().splitlines()
+
+        assert json.loads(lines[0])["agent_stats"]["Risk Agent"]["total_messages"] == 1
+        assert [json.loads(line)["id"] for line in lines[1:]] == ["msg_0"]